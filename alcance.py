@@ -0,0 +1,128 @@
+import sys
+import heapq
+
+import pandas as pd
+
+from dados import meses_do_ano
+from grafo_csr import GrafoCSR
+from catalogo import abrir_catalogo
+from planejamento import (e_estacao, ajuste_do_mes, _como_numero,
+                          CORPOS_ESTILINGUE, BONUS_ESTILINGUE, RECARGA_ESTACAO)
+
+
+# Busca limitada pelo combustível: cada rótulo é (combustível, vértice, estações usadas, passou pelo estilingue)
+def _buscar(grafo, origem, combustivel, com_estilingue):
+    """
+    Devolve, para cada vértice alcançável, o rótulo com mais combustível restante.
+    A recarga segue planejar_viagem: ao percorrer uma aresta que toca uma estação ainda
+    não usada, a nave recebe RECARGA_ESTACAO antes de descontar a distância. Rótulos
+    com combustível negativo são descartados, então a busca para quando o orçamento acaba.
+    Com com_estilingue, só contam as rotas que passam por Júpiter ou Saturno.
+    """
+    off, viz, pes = grafo._off, grafo._viz, grafo._pes
+    estacao = [e_estacao(nome) for nome in grafo.nomes]
+    estilingues = {grafo.indices[nome] for nome in CORPOS_ESTILINGUE if nome in grafo}
+
+    o = grafo.indices[origem]
+    # rotulos[i] = (combustível, distância, vértice, estações, passou, pai)
+    rotulos = [(combustivel, 0.0, o, frozenset(), o in estilingues, -1)]
+    por_vertice = {o: [0]}
+    heap = [(-combustivel, 0)]
+    melhores = {}
+    while heap:
+        _, i = heapq.heappop(heap)
+        f, d, u, usadas, passou, _ = rotulos[i]
+        if not com_estilingue or passou:
+            if u not in melhores or f > rotulos[melhores[u]][0]:
+                melhores[u] = i
+        for k in range(off[u], off[u + 1]):
+            v = viz[k]
+            nf, nusadas = f, usadas
+            if (estacao[u] and u not in usadas) or (estacao[v] and v not in usadas):
+                nf += RECARGA_ESTACAO
+                nusadas = usadas | {u if estacao[u] else v}
+            nf -= pes[k]
+            if nf < 0:
+                continue
+            npassou = passou or v in estilingues
+            # Descartar se outro rótulo em v tem mais combustível, menos estações gastas e o estilingue
+            existentes = por_vertice.setdefault(v, [])
+            if any(rotulos[j][0] >= nf and rotulos[j][3] <= nusadas and rotulos[j][4] >= npassou for j in existentes):
+                continue
+            existentes.append(len(rotulos))
+            rotulos.append((nf, d + pes[k], v, nusadas, npassou, i))
+            heapq.heappush(heap, (-nf, len(rotulos) - 1))
+
+    resultado = {}
+    for v, i in melhores.items():
+        caminho = []
+        j = i
+        while j != -1:
+            caminho.append(grafo.nomes[rotulos[j][2]])
+            j = rotulos[j][5]
+        resultado[grafo.nomes[v]] = (rotulos[i][0], rotulos[i][1], caminho[::-1])
+    return resultado
+
+
+# Função para listar tudo o que se alcança a partir de uma origem com um orçamento de combustível
+def calcular_alcance(grafo, origem, combustivel, month):
+    """
+    Aplica as regras do mês de cada destino (cancelamentos e ajustes de combustível) e o
+    bônus do estilingue, que vale para rotas com parada em Júpiter ou Saturno. Diferente de
+    show_shortest_path, considera qualquer rota, não só a mais curta, então um desvio por uma
+    estação pode tornar um destino alcançável. Devolve um DataFrame ordenado pelo combustível.
+    """
+    if origem not in grafo:
+        raise ValueError(f"{origem} não está no grafo")
+
+    # Uma busca por ajuste distinto; a maioria dos destinos usa o ajuste zero
+    buscas = {}
+
+    def buscar(ajuste, com_estilingue):
+        chave = (ajuste, com_estilingue)
+        if chave not in buscas:
+            inicio = combustivel + ajuste + (BONUS_ESTILINGUE if com_estilingue else 0)
+            # Como no planejador, um saldo inicial negativo ainda pode ser salvo por uma recarga
+            buscas[chave] = _buscar(grafo, origem, inicio, com_estilingue)
+        return buscas[chave]
+
+    tem_estilingue = any(nome in grafo for nome in CORPOS_ESTILINGUE)
+    linhas = []
+    for destino in grafo.nomes:
+        if destino == origem:
+            continue
+        ajuste = ajuste_do_mes(origem, destino, month)
+        if ajuste is None:
+            continue
+        opcoes = [(buscar(ajuste, False).get(destino), False)]
+        if tem_estilingue:
+            opcoes.append((buscar(ajuste, True).get(destino), True))
+        opcoes = [(r, estilingue) for r, estilingue in opcoes if r is not None]
+        if not opcoes:
+            continue
+        (restante, distancia, caminho), estilingue = max(opcoes, key=lambda o: o[0][0])
+        linhas.append({
+            "destino": destino,
+            "combustivel_restante": _como_numero(restante),
+            "distancia": _como_numero(distancia),
+            "estilingue": estilingue,
+            "rota": " -> ".join(caminho),
+        })
+
+    colunas = ["destino", "combustivel_restante", "distancia", "estilingue", "rota"]
+    tabela = pd.DataFrame(linhas, columns=colunas)
+    return tabela.sort_values("combustivel_restante", ascending=False, ignore_index=True)
+
+
+# Uso: python alcance.py rede.csv origem combustivel [mês]
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Uso: python alcance.py rede.csv origem combustivel [mês]")
+        sys.exit(1)
+
+    catalogo = abrir_catalogo()
+    grafo, erros = GrafoCSR.from_csv(sys.argv[1], catalogo.corpos, catalogo)
+    for erro in erros:
+        print(f"Erro: {erro}")
+    mes = sys.argv[4] if len(sys.argv) > 4 else meses_do_ano[0]
+    print(calcular_alcance(grafo, sys.argv[2], float(sys.argv[3]), mes).to_string(index=False))
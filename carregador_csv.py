@@ -0,0 +1,184 @@
+import pandas as pd
+from collections import Counter
+
+
+# Função para buscar a distância predefinida entre dois corpos (em qualquer ordem)
+def buscar_distancia(distances, planet, connection):
+    if (planet, connection) in distances:
+        return distances[(planet, connection)]
+    if (connection, planet) in distances:
+        return distances[(connection, planet)]
+    return None
+
+
+def _ler_tabela(file_path):
+    df = pd.read_csv(file_path, delimiter=';')
+
+    if 'Planeta' not in df.columns or 'Conexoes' not in df.columns:
+        raise ValueError("O CSV deve conter as colunas: 'Planeta', 'Conexoes'")
+    return df
+
+
+# Função para interpretar uma linha do CSV: vértices na ordem em que aparecem, arestas e erros
+def ler_linha(planet, conexoes, valid_planets, distances):
+    nos = []
+    arestas = []
+    erros = []
+    connections = conexoes.split(',')
+
+    if planet in valid_planets:
+        nos.append(planet)
+        for connection in connections:
+            if connection in valid_planets:
+                distance = buscar_distancia(distances, planet, connection)
+                if distance is not None:
+                    nos.append(connection)
+                    arestas.append((planet, connection, distance))
+                else:
+                    erros.append(f"Distância não definida entre {planet} e {connection}.")
+            else:
+                erros.append(f"Conexão inválida: {connection} não é um planeta válido.")
+    else:
+        erros.append(f"Planeta inválido: {planet}")
+    return nos, arestas, erros
+
+
+# Função para ler o CSV 'Planeta;Conexoes' sem depender da interface
+def ler_conexoes_csv(file_path, valid_planets, distances):
+    """
+    Lê o arquivo e devolve (nos, arestas, erros): os vértices na mesma ordem em que o
+    networkx os criaria, as arestas (planeta, conexão, distância) e as mensagens de erro.
+    """
+    df = _ler_tabela(file_path)
+
+    nos = {}
+    arestas = []
+    erros = []
+    for planet, conexoes in zip(df['Planeta'], df['Conexoes']):
+        nos_linha, arestas_linha, erros_linha = ler_linha(planet, conexoes, valid_planets, distances)
+        for nome in nos_linha:
+            nos.setdefault(nome)
+        arestas.extend(arestas_linha)
+        erros.extend(erros_linha)
+
+    return list(nos), arestas, erros
+
+
+# Par de vértices de uma aresta, na mesma ordem qualquer que seja o sentido da linha
+def _par(u, v):
+    return (u, v) if u <= v else (v, u)
+
+
+class IndiceCSV:
+    """
+    Lembra o último CSV carregado linha a linha, pelo hash de cada linha, e quantas linhas
+    sustentam cada vértice e cada aresta (Terra;Marte e Marte;Terra são a mesma aresta).
+    diferenca() lê o arquivo de novo e só interpreta as linhas que entraram ou saíram:
+    uma aresta só sai quando nenhuma linha a cita mais, e um vértice da mesma forma.
+    """
+
+    def __init__(self, valid_planets, distances):
+        self.valid_planets = valid_planets
+        self.distances = distances
+        self._limpar()
+
+    def _limpar(self):
+        self.linhas = Counter()
+        self.conteudo = {}
+        self.nos = Counter()
+        self.arestas = Counter()
+        self.pesos = {}
+
+    @staticmethod
+    def _hashes(df):
+        return pd.util.hash_pandas_object(df[['Planeta', 'Conexoes']], index=False).tolist()
+
+    # Soma (sinal 1) ou retira (sinal -1) as contribuições de uma linha; antes guarda se cada
+    # vértice ou aresta tocado existia antes da primeira mudança
+    def _aplicar(self, chave, sinal, antes):
+        nos, arestas = self.conteudo[chave]
+        for nome in nos:
+            antes["nos"].setdefault(nome, self.nos[nome] > 0)
+            self.nos[nome] += sinal
+        for u, v, distance in arestas:
+            par = _par(u, v)
+            antes["arestas"].setdefault(par, self.arestas[par] > 0)
+            self.arestas[par] += sinal
+            self.pesos[par] = distance
+
+    # Função para ler o arquivo inteiro (como no upload) guardando o índice; devolve (nos, arestas, erros)
+    def carregar(self, file_path):
+        df = _ler_tabela(file_path)
+        lidas = [(chave, *ler_linha(planet, conexoes, self.valid_planets, self.distances))
+                 for chave, planet, conexoes in zip(self._hashes(df), df['Planeta'], df['Conexoes'])]
+
+        # O índice só é trocado depois que o arquivo inteiro foi lido sem erro
+        self._limpar()
+        nos = {}
+        arestas = []
+        erros = []
+        for chave, nos_linha, arestas_linha, erros_linha in lidas:
+            for nome in nos_linha:
+                nos.setdefault(nome)
+            arestas.extend(arestas_linha)
+            erros.extend(erros_linha)
+            self.linhas[chave] += 1
+            self.conteudo.setdefault(chave, (nos_linha, arestas_linha))
+            self._aplicar(chave, 1, {"nos": {}, "arestas": {}})
+        return list(nos), arestas, erros
+
+    # Função para comparar o arquivo com o último carregado e devolver só o que mudou
+    def diferenca(self, file_path):
+        """
+        Devolve um dicionário com os vértices e arestas que passaram a existir (nos_novos,
+        arestas_novas com a distância) e os que deixaram de existir (nos_removidos,
+        arestas_removidas), os erros das linhas novas e quantas linhas entraram e saíram.
+        O índice passa a representar o arquivo lido.
+        """
+        df = _ler_tabela(file_path)
+        hashes = self._hashes(df)
+        atuais = Counter(hashes)
+        entraram = atuais - self.linhas
+        sairam = self.linhas - atuais
+
+        # As linhas novas são lidas antes de qualquer mudança: um erro deixa o índice como estava
+        posicao = {chave: i for i, chave in enumerate(hashes) if chave in entraram}
+        novas = {}
+        erros = []
+        for chave in entraram:
+            i = posicao[chave]
+            nos_linha, arestas_linha, erros_linha = ler_linha(df['Planeta'].iat[i], df['Conexoes'].iat[i],
+                                                              self.valid_planets, self.distances)
+            novas[chave] = (nos_linha, arestas_linha)
+            erros.extend(erros_linha)
+
+        antes = {"nos": {}, "arestas": {}}
+        for chave, quantidade in sairam.items():
+            for _ in range(quantidade):
+                self._aplicar(chave, -1, antes)
+            if self.linhas[chave] == quantidade:
+                del self.conteudo[chave]
+        for chave, quantidade in entraram.items():
+            self.conteudo.setdefault(chave, novas[chave])
+            for _ in range(quantidade):
+                self._aplicar(chave, 1, antes)
+        self.linhas = atuais
+
+        # Só conta como mudança o que passou a existir ou deixou de existir (uma linha que
+        # apenas trocou de lugar ou de sentido não muda nada)
+        diferenca = {
+            "nos_novos": [nome for nome, existia in antes["nos"].items() if not existia and self.nos[nome] > 0],
+            "nos_removidos": [nome for nome, existia in antes["nos"].items() if existia and self.nos[nome] == 0],
+            "arestas_novas": [(u, v, self.pesos[(u, v)]) for (u, v), existia in antes["arestas"].items()
+                              if not existia and self.arestas[(u, v)] > 0],
+            "arestas_removidas": [par for par, existia in antes["arestas"].items() if existia and self.arestas[par] == 0],
+            "erros": erros,
+            "linhas_novas": sum(entraram.values()),
+            "linhas_removidas": sum(sairam.values()),
+        }
+        for nome in diferenca["nos_removidos"]:
+            del self.nos[nome]
+        for par in diferenca["arestas_removidas"]:
+            del self.arestas[par]
+            del self.pesos[par]
+        return diferenca
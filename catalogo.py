@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import time
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from dados import valid_planets, distances
+
+
+# Pasta padrão do catálogo, ao lado do código (fica fora do controle de versão)
+PASTA_CATALOGO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogo")
+VERSAO_CATALOGO = 1
+ARQUIVOS = ("nomes", "nomes_ordenados", "ids_ordenados", "offsets", "vizinhos", "pesos")
+
+
+# Assinatura das distâncias embutidas em dados.py: muda quando um corpo ou uma distância muda
+def assinatura_dados(valid_planets, distances):
+    h = hashlib.sha256()
+    h.update("\n".join(valid_planets).encode("utf-8"))
+    for (a, b), d in sorted(distances.items()):
+        h.update(f"\n{a};{b};{d}".encode("utf-8"))
+    return h.hexdigest()
+
+
+# Nomes do catálogo com "in" em O(log n) pela cópia ordenada; a iteração segue a ordem original
+class CorposCatalogo:
+    def __init__(self, catalogo):
+        self.catalogo = catalogo
+
+    def __contains__(self, nome):
+        return self.catalogo.indice(nome) is not None
+
+    def __len__(self):
+        return len(self.catalogo.nomes)
+
+    def __iter__(self):
+        for nome in self.catalogo.nomes:
+            yield str(nome)
+
+
+class CatalogoDistancias:
+    """
+    Distâncias entre corpos guardadas em disco e abertas com np.load(mmap_mode='r'): só as
+    páginas tocadas por uma consulta são lidas. Os nomes ficam num vetor de texto de largura
+    fixa, com uma cópia ordenada para a busca binária, e as distâncias numa adjacência CSR
+    simétrica com os vizinhos ordenados. Uma consulta de par custa duas buscas binárias.
+    Funciona no lugar do dicionário distances: (a, b) in catalogo vale em qualquer ordem.
+    """
+
+    def __init__(self, pasta):
+        self.pasta = pasta
+        with open(os.path.join(pasta, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        for nome in ARQUIVOS:
+            setattr(self, nome, np.load(os.path.join(pasta, nome + ".npy"), mmap_mode='r'))
+        self.corpos = CorposCatalogo(self)
+
+    # Função para gravar o catálogo a partir dos nomes (na ordem dos índices) e dos pares por índice
+    @classmethod
+    def construir(cls, pasta, nomes, origens, destinos, pesos, **meta):
+        """
+        Pares repetidos ficam com a primeira distância; pares sem distância são ignorados.
+        As distâncias ficam inteiras quando todas são inteiras, como no dicionário.
+        """
+        n = len(nomes)
+        origens, destinos, pesos = np.asarray(origens, dtype=np.int64), np.asarray(destinos, dtype=np.int64), np.asarray(pesos)
+        validos = ~pd.isna(pesos)
+        origens, destinos, pesos = origens[validos], destinos[validos], pesos[validos]
+        pesos = pesos.astype(np.int64) if np.all(np.mod(pesos, 1) == 0) else pesos.astype(np.float64)
+
+        # Cada par, em qualquer sentido, fica com a sua primeira linha; só depois entram os dois sentidos,
+        # então a adjacência sai simétrica mesmo com (A, B) e (B, A) repetidos com distâncias diferentes
+        menor, maior = np.minimum(origens, destinos), np.maximum(origens, destinos)
+        _, primeira = np.unique(menor * n + maior, return_index=True)
+        origens, destinos, pesos = menor[primeira], maior[primeira], pesos[primeira]
+        pares = len(pesos)
+
+        # Os dois sentidos de cada par, ordenados por (origem, vizinho); o laço (A, A) aparece uma vez só
+        chave = np.concatenate([origens, destinos]) * n + np.concatenate([destinos, origens])
+        chave, primeira = np.unique(chave, return_index=True)
+        vizinhos = (chave % n).astype(np.int32)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(chave // n, minlength=n))]).astype(np.int64)
+        pesos = np.concatenate([pesos, pesos])[primeira]
+
+        nomes = np.array(nomes, dtype=str)
+        ids_ordenados = np.argsort(nomes, kind='stable').astype(np.int32)
+        os.makedirs(pasta, exist_ok=True)
+        for nome, arr in zip(ARQUIVOS, (nomes, nomes[ids_ordenados], ids_ordenados, offsets, vizinhos, pesos)):
+            np.save(os.path.join(pasta, nome + ".npy"), arr)
+        with open(os.path.join(pasta, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(dict(meta, versao=VERSAO_CATALOGO, corpos=n, pares=pares), f, ensure_ascii=False)
+        return cls(pasta)
+
+    # Catálogo com os corpos e distâncias de dados.py (os corpos de valid_planets vêm primeiro)
+    @classmethod
+    def de_dicionario(cls, pasta, valid_planets, distances):
+        ids = {nome: i for i, nome in enumerate(valid_planets)}
+        for a, b in distances:
+            ids.setdefault(a, len(ids))
+            ids.setdefault(b, len(ids))
+        return cls.construir(pasta, list(ids), [ids[a] for a, _ in distances], [ids[b] for _, b in distances],
+                             list(distances.values()), fonte="dados", assinatura=assinatura_dados(valid_planets, distances))
+
+    # Catálogo a partir de um CSV 'Origem;Destino;Distancia' lido em blocos; só os nomes distintos ficam em memória
+    @classmethod
+    def de_csv(cls, pasta, csv_path, bloco=500_000):
+        ids = {}
+        origens, destinos, pesos = [], [], []
+        for parte in pd.read_csv(csv_path, delimiter=';', chunksize=bloco):
+            if not {'Origem', 'Destino', 'Distancia'} <= set(parte.columns):
+                raise ValueError("O CSV deve conter as colunas: 'Origem', 'Destino', 'Distancia'")
+            for coluna, destino in (('Origem', origens), ('Destino', destinos)):
+                codigos, unicos = pd.factorize(parte[coluna].astype(str))
+                for nome in unicos:
+                    ids.setdefault(nome, len(ids))
+                destino.append(np.array([ids[nome] for nome in unicos], dtype=np.int64)[codigos])
+            pesos.append(parte['Distancia'].to_numpy(dtype=np.float64))
+        return cls.construir(pasta, list(ids), np.concatenate(origens), np.concatenate(destinos), np.concatenate(pesos),
+                             fonte=os.path.abspath(csv_path))
+
+    # Índice do corpo pela busca binária nos nomes ordenados (None se não existe)
+    def indice(self, nome):
+        i = int(np.searchsorted(self.nomes_ordenados, nome))
+        if i < len(self.nomes_ordenados) and self.nomes_ordenados[i] == nome:
+            return int(self.ids_ordenados[i])
+        return None
+
+    def distancia(self, a, b):
+        i, j = self.indice(a), self.indice(b)
+        if i is None or j is None:
+            return None
+        inicio, fim = int(self.offsets[i]), int(self.offsets[i + 1])
+        k = inicio + int(np.searchsorted(self.vizinhos[inicio:fim], j))
+        if k < fim and self.vizinhos[k] == j:
+            return self.pesos[k].item()
+        return None
+
+    # Corpos com distância definida até nome, com as distâncias, na ordem do catálogo
+    def vizinhos_de(self, nome):
+        i = self.indice(nome)
+        if i is None:
+            return []
+        inicio, fim = int(self.offsets[i]), int(self.offsets[i + 1])
+        return [(str(self.nomes[j]), peso) for j, peso in zip(self.vizinhos[inicio:fim].tolist(), self.pesos[inicio:fim].tolist())]
+
+    # Corpos fora de nomes com distância definida até algum deles, na ordem do catálogo (vetorizado)
+    def vizinhanca(self, nomes):
+        nomes = np.array(list(nomes), dtype=str)
+        pos = np.searchsorted(self.nomes_ordenados, nomes)
+        achados = pos < len(self.nomes_ordenados)
+        pos, nomes = pos[achados], nomes[achados]
+        ids = self.ids_ordenados[pos[self.nomes_ordenados[pos] == nomes]].astype(np.int64)
+        inicio, tamanhos = self.offsets[ids], self.offsets[ids + 1] - self.offsets[ids]
+        # Posições de todos os vizinhos de todos os ids de uma vez, sem laço em Python
+        posicoes = np.repeat(inicio - np.cumsum(tamanhos) + tamanhos, tamanhos) + np.arange(int(tamanhos.sum()))
+        vizinhos = np.setdiff1d(self.vizinhos[posicoes], ids)
+        return [str(nome) for nome in self.nomes[vizinhos]]
+
+    def __contains__(self, par):
+        return self.distancia(*par) is not None
+
+    def __getitem__(self, par):
+        distancia = self.distancia(*par)
+        if distancia is None:
+            raise KeyError(par)
+        return distancia
+
+    def __len__(self):
+        return int(self.meta["pares"])
+
+
+# Função para abrir o catálogo da pasta; sem catálogo (ou com um feito de dados.py já velho), gera um de dados.py
+def abrir_catalogo(pasta=PASTA_CATALOGO, valid_planets=valid_planets, distances=distances):
+    try:
+        catalogo = CatalogoDistancias(pasta)
+        meta = catalogo.meta
+        if meta.get("versao") == VERSAO_CATALOGO and (
+                meta.get("fonte") != "dados" or meta.get("assinatura") == assinatura_dados(valid_planets, distances)):
+            return catalogo
+    except (OSError, ValueError):
+        pass
+    return CatalogoDistancias.de_dicionario(pasta, valid_planets, distances)
+
+
+# Uso: python catalogo.py distancias.csv [pasta]  |  python catalogo.py consulta corpo [outro]
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python catalogo.py distancias.csv [pasta]  |  python catalogo.py consulta corpo [outro]")
+        sys.exit(1)
+
+    if sys.argv[1] == "consulta":
+        catalogo = abrir_catalogo()
+        if len(sys.argv) > 3:
+            print(catalogo.distancia(sys.argv[2], sys.argv[3]))
+        else:
+            for vizinho, distancia in catalogo.vizinhos_de(sys.argv[2]):
+                print(f"{vizinho}: {distancia}")
+        sys.exit(0)
+
+    pasta = sys.argv[2] if len(sys.argv) > 2 else PASTA_CATALOGO
+    inicio = time.perf_counter()
+    catalogo = CatalogoDistancias.de_csv(pasta, sys.argv[1])
+    print(f"Catálogo com {len(catalogo.corpos)} corpos e {len(catalogo)} pares gravado em {pasta} "
+          f"({time.perf_counter() - inicio:.1f} s)")
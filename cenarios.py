@@ -0,0 +1,396 @@
+import sys
+import time
+import heapq
+
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+from dados import meses_do_ano
+from catalogo import abrir_catalogo
+from grafo_csr import GrafoCSR
+from planejamento import planejar_viagem
+
+
+# Árvores de caminhos mínimos da base guardadas ao mesmo tempo (cada uma é um Dijkstra completo)
+MAX_LINHAS_BASE = 256
+NOME_BASE = "base"
+
+
+class RedeBase:
+    """
+    Rede compartilhada pelos cenários: o GrafoCSR (que não muda depois de montado) e as
+    árvores de caminhos mínimos já calculadas nele, por origem. Os cenários de uma mesma
+    base usam o mesmo cache, então uma origem buscada num cenário serve para os outros.
+    """
+
+    def __init__(self, grafo, max_linhas=MAX_LINHAS_BASE):
+        self.grafo = grafo
+        self.max_linhas = max_linhas
+        self._linhas = {}
+        self.buscas = 0
+
+    # Distâncias e predecessores a partir de s na base; as linhas menos usadas saem primeiro
+    def linha(self, s):
+        linha = self._linhas.pop(s, None)
+        if linha is None:
+            linha = self.grafo.dijkstra(s)
+            self.buscas += 1
+            if len(self._linhas) >= self.max_linhas:
+                del self._linhas[next(iter(self._linhas))]
+        self._linhas[s] = linha
+        return linha
+
+
+class Cenario:
+    """
+    Ramo de "e se" sobre uma rede base: guarda só as diferenças (vértices e arestas
+    removidos ou adicionados) e nunca copia a base. Uma rota da base continua valendo
+    quando não passa por nada removido e não é mais longa que o limite inferior de
+    qualquer caminho que use uma aresta nova; só nos outros casos há busca no cenário.
+    Aresta com peso trocado conta como removida da base e adicionada com o peso novo.
+    """
+
+    def __init__(self, base, nome):
+        self.base = base
+        self.nome = nome
+        self.n = len(base.grafo)
+        self.nos_removidos = set()
+        self.arestas_removidas = set()
+        # Arestas novas nos dois sentidos; vértices novos ganham índices a partir de n
+        self.adicionadas = {}
+        self.novos = {}
+        self._nome_novo = {}
+        self._proximo = self.n
+        # Edições na ordem em que foram feitas (para refazer o cenário sobre outra base)
+        self.operacoes = []
+        self.reaproveitadas = 0
+        self.buscas = 0
+
+    # Cópia das diferenças: o ramo novo continua compartilhando a base e o cache dela
+    def ramificar(self, nome):
+        ramo = Cenario(self.base, nome)
+        ramo.nos_removidos = set(self.nos_removidos)
+        ramo.arestas_removidas = set(self.arestas_removidas)
+        ramo.adicionadas = {x: dict(vizinhos) for x, vizinhos in self.adicionadas.items()}
+        ramo.novos = dict(self.novos)
+        ramo._nome_novo = dict(self._nome_novo)
+        ramo._proximo = self._proximo
+        ramo.operacoes = list(self.operacoes)
+        return ramo
+
+    def __contains__(self, nome):
+        return self._indice(nome) is not None
+
+    def __len__(self):
+        return self.n - len(self.nos_removidos) + len(self.novos)
+
+    @property
+    def nomes(self):
+        grafo = self.base.grafo
+        return [nome for i, nome in enumerate(grafo.nomes) if i not in self.nos_removidos] + list(self.novos)
+
+    def _indice(self, nome):
+        i = self.base.grafo.indices.get(nome)
+        if i is not None and i not in self.nos_removidos:
+            return i
+        return self.novos.get(nome)
+
+    def _exigir(self, nome):
+        i = self._indice(nome)
+        if i is None:
+            raise ValueError(f"{nome} não existe no cenário {self.nome}")
+        return i
+
+    def _nome(self, i):
+        return self.base.grafo.nomes[i] if i < self.n else self._nome_novo[i]
+
+    def _peso_base(self, x, y):
+        if x >= self.n or y >= self.n:
+            return None
+        grafo = self.base.grafo
+        return grafo.peso(grafo.nomes[x], grafo.nomes[y])
+
+    def _ligar(self, x, y, peso):
+        par = (min(x, y), max(x, y))
+        peso_base = self._peso_base(x, y)
+        self._desligar(x, y)
+        if peso_base is not None and float(peso) == peso_base:
+            self.arestas_removidas.discard(par)
+            return
+        self.adicionadas.setdefault(x, {})[y] = peso
+        self.adicionadas.setdefault(y, {})[x] = peso
+
+    def _desligar(self, x, y):
+        if y in self.adicionadas.get(x, {}):
+            del self.adicionadas[x][y]
+            del self.adicionadas[y][x]
+            for z in (x, y):
+                if not self.adicionadas[z]:
+                    del self.adicionadas[z]
+        if self._peso_base(x, y) is not None:
+            self.arestas_removidas.add((min(x, y), max(x, y)))
+
+    # Função para adicionar um vértice com as conexões informadas (como add_planet faz no G)
+    def adicionar_no(self, nome, conexoes):
+        if nome in self:
+            raise ValueError(f"{nome} já existe no cenário {self.nome}")
+        grafo = self.base.grafo
+        x = grafo.indices.get(nome)
+        if x is not None:
+            # Vértice da base removido antes: volta só com as conexões informadas
+            self.nos_removidos.discard(x)
+            for y in grafo.vizinhos[grafo.offsets[x]:grafo.offsets[x + 1]].tolist():
+                self.arestas_removidas.add((min(x, y), max(x, y)))
+        else:
+            x = self._proximo
+            self._proximo += 1
+            self.novos[nome] = x
+            self._nome_novo[x] = nome
+        for vizinho, peso in conexoes:
+            y = self._indice(vizinho)
+            if y is not None:
+                self._ligar(x, y, peso)
+        self.operacoes.append(("adicionar_no", nome, tuple(conexoes)))
+
+    def remover_no(self, nome):
+        x = self._exigir(nome)
+        for y in list(self.adicionadas.get(x, {})):
+            self._desligar(x, y)
+        if x < self.n:
+            self.nos_removidos.add(x)
+            self.arestas_removidas = {par for par in self.arestas_removidas if x not in par}
+        else:
+            del self.novos[nome]
+            del self._nome_novo[x]
+        self.operacoes.append(("remover_no", nome))
+
+    def adicionar_aresta(self, u, v, peso):
+        self._ligar(self._exigir(u), self._exigir(v), peso)
+        self.operacoes.append(("adicionar_aresta", u, v, peso))
+
+    def remover_aresta(self, u, v):
+        if self.peso(u, v) is None:
+            raise ValueError(f"Não há aresta entre {u} e {v} no cenário {self.nome}")
+        self._desligar(self._indice(u), self._indice(v))
+        self.operacoes.append(("remover_aresta", u, v))
+
+    def peso(self, u, v):
+        x, y = self._indice(u), self._indice(v)
+        if x is None or y is None:
+            return None
+        if y in self.adicionadas.get(x, {}):
+            return self.adicionadas[x][y]
+        if (min(x, y), max(x, y)) in self.arestas_removidas:
+            return None
+        return self._peso_base(x, y)
+
+    # Quantos vértices e arestas o cenário muda em relação à base
+    def diferencas(self):
+        return {
+            "vertices_removidos": len(self.nos_removidos),
+            "vertices_novos": len(self.novos),
+            "arestas_removidas": len(self.arestas_removidas),
+            "arestas_novas": sum(len(vizinhos) for vizinhos in self.adicionadas.values()) // 2,
+        }
+
+    # A rota da base não passa por vértice nem aresta removidos?
+    def _intacto(self, caminho):
+        if any(v in self.nos_removidos for v in caminho):
+            return False
+        return not any((min(u, v), max(u, v)) in self.arestas_removidas for u, v in zip(caminho, caminho[1:]))
+
+    # Limite inferior de um caminho de s a t que use alguma aresta nova: até a primeira aresta
+    # nova e depois da última só há arestas da base, que no cenário nunca ficam mais curtas
+    def _limite_inferior(self, s, t):
+        if not self.adicionadas:
+            return np.inf
+        de_s = self.base.linha(s)[0]
+        ate_t = self.base.linha(t)[0]
+        entrada = min((de_s[a] + w for a, vizinhos in self.adicionadas.items() if a < self.n
+                       for w in vizinhos.values()), default=np.inf)
+        saida = min((ate_t[e] for e in self.adicionadas if e < self.n), default=np.inf)
+        return entrada + saida
+
+    # Dijkstra no cenário: arestas da base que sobraram mais as arestas novas
+    def _dijkstra(self, s, t):
+        grafo = self.base.grafo
+        off, viz, pes = grafo._off, grafo._viz, grafo._pes
+        removidos, cortadas, adicionadas = self.nos_removidos, self.arestas_removidas, self.adicionadas
+        dist = {s: 0.0}
+        pred = {s: -1}
+        fixados = set()
+        heap = [(0.0, s)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in fixados:
+                continue
+            fixados.add(u)
+            if u == t:
+                caminho = [t]
+                while pred[caminho[-1]] != -1:
+                    caminho.append(pred[caminho[-1]])
+                return d, caminho[::-1]
+            vizinhos = []
+            if u < self.n:
+                for k in range(off[u], off[u + 1]):
+                    v = viz[k]
+                    if v not in removidos and (min(u, v), max(u, v)) not in cortadas:
+                        vizinhos.append((v, pes[k]))
+            vizinhos.extend(adicionadas.get(u, {}).items())
+            for v, w in vizinhos:
+                nd = d + float(w)
+                if nd < dist.get(v, np.inf):
+                    dist[v] = nd
+                    pred[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return None
+
+    # Menor caminho por índices: a árvore da base quando ela ainda vale, senão uma busca no cenário
+    def _menor_caminho(self, s, t):
+        if s < self.n and t < self.n:
+            dist, pred = self.base.linha(s)
+            if dist[t] == np.inf and not self.adicionadas:
+                self.reaproveitadas += 1
+                return None
+            if dist[t] < np.inf:
+                caminho = [t]
+                while caminho[-1] != s:
+                    caminho.append(pred[caminho[-1]])
+                caminho.reverse()
+                if self._intacto(caminho) and dist[t] <= self._limite_inferior(s, t):
+                    self.reaproveitadas += 1
+                    return dist[t], caminho
+        self.buscas += 1
+        return self._dijkstra(s, t)
+
+    def shortest_path(self, source, target):
+        for nome in (source, target):
+            if nome not in self:
+                raise nx.NodeNotFound(f"Source {nome} is not in G")
+        achado = self._menor_caminho(self._indice(source), self._indice(target))
+        if achado is None:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        return [self._nome(i) for i in achado[1]]
+
+    # Rota completa com parada opcional, como em show_shortest_path
+    def rota(self, origem, destino, parada=None):
+        if parada and parada != "Nenhuma" and parada in self:
+            path1 = self.shortest_path(origem, parada)
+            path2 = self.shortest_path(parada, destino)
+            return path1[:-1] + path2
+        return self.shortest_path(origem, destino)
+
+    # Função para montar o cenário como um GrafoCSR independente (para as análises que pedem um)
+    def materializar(self):
+        grafo = self.base.grafo
+        arestas = []
+        for u in range(self.n):
+            if u in self.nos_removidos:
+                continue
+            for k in range(grafo._off[u], grafo._off[u + 1]):
+                v = grafo._viz[k]
+                if v >= u and v not in self.nos_removidos and (u, v) not in self.arestas_removidas:
+                    arestas.append((grafo.nomes[u], grafo.nomes[v], grafo._pes[k]))
+        for x, vizinhos in self.adicionadas.items():
+            arestas.extend((self._nome(x), self._nome(y), peso) for y, peso in vizinhos.items() if y >= x)
+        return GrafoCSR.de_arestas(self.nomes, arestas)
+
+
+class Cenarios:
+    """
+    Cenários com nome sobre a mesma rede base. O cenário "base" é a própria rede, sem
+    diferenças, e entra nas comparações como referência.
+    """
+
+    def __init__(self, grafo):
+        self.base = RedeBase(grafo)
+        self.ramos = {NOME_BASE: Cenario(self.base, NOME_BASE)}
+
+    def __contains__(self, nome):
+        return nome in self.ramos
+
+    def __getitem__(self, nome):
+        return self.ramos[nome]
+
+    def __iter__(self):
+        return iter(self.ramos)
+
+    # Função para criar um cenário novo a partir da base ou de outro cenário
+    def criar(self, nome, de=NOME_BASE):
+        if not nome or nome in self.ramos:
+            raise ValueError(f"Já existe um cenário chamado {nome!r}" if nome else "Informe um nome para o cenário")
+        self.ramos[nome] = self.ramos[de].ramificar(nome)
+        return self.ramos[nome]
+
+    def remover(self, nome):
+        if nome == NOME_BASE:
+            raise ValueError("O cenário base não pode ser removido")
+        del self.ramos[nome]
+
+    # Função para levar os cenários a uma base nova (a rede principal mudou); devolve as edições que não cabem mais
+    def trocar_base(self, grafo):
+        antigos = self.ramos
+        self.base = RedeBase(grafo)
+        self.ramos = {}
+        ignoradas = []
+        for nome, antigo in antigos.items():
+            ramo = Cenario(self.base, nome)
+            for operacao in antigo.operacoes:
+                try:
+                    getattr(ramo, operacao[0])(*operacao[1:])
+                except ValueError:
+                    ignoradas.append((nome, operacao))
+            self.ramos[nome] = ramo
+        return ignoradas
+
+    # Função para planejar a mesma viagem em cada cenário, lado a lado numa tabela
+    def comparar(self, origin, destination, stopover, fuel_available, month, nomes=None):
+        linhas = []
+        for nome in nomes or list(self.ramos):
+            cenario = self.ramos[nome]
+            if origin not in cenario or destination not in cenario:
+                linhas.append({"cenario": nome, "status": "sem_vertice", "distancia": None, "combustivel": None, "rota": ""})
+                continue
+            resultado = planejar_viagem(cenario, origin, destination, stopover, fuel_available, month)
+            linhas.append({
+                "cenario": nome,
+                "status": resultado["status"],
+                "distancia": resultado["distancia_total"] if resultado["caminho"] else None,
+                "combustivel": resultado["combustivel"],
+                "rota": " -> ".join(resultado["caminho"]),
+            })
+        tabela = pd.DataFrame(linhas, columns=["cenario", "status", "distancia", "combustivel", "rota"])
+        referencia = tabela.loc[tabela["cenario"] == NOME_BASE, "distancia"]
+        if len(referencia) and pd.notna(referencia.iloc[0]):
+            tabela["diferenca"] = tabela["distancia"] - referencia.iloc[0]
+        return tabela
+
+
+# Uso: python cenarios.py rede.csv origem destino [combustível] [mês]
+# (cria um cenário sem cada vértice intermediário da rota da base e compara todos)
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Uso: python cenarios.py rede.csv origem destino [combustível] [mês]")
+        sys.exit(1)
+
+    catalogo = abrir_catalogo()
+    grafo, erros = GrafoCSR.from_csv(sys.argv[1], catalogo.corpos, catalogo)
+    for erro in erros:
+        print(f"Erro: {erro}")
+    origem, destino = sys.argv[2], sys.argv[3]
+    combustivel = float(sys.argv[4]) if len(sys.argv) > 4 else float('inf')
+    mes = sys.argv[5] if len(sys.argv) > 5 else meses_do_ano[0]
+
+    cenarios = Cenarios(grafo)
+    for nome in cenarios[NOME_BASE].rota(origem, destino)[1:-1]:
+        cenarios.criar(f"sem_{nome}").remover_no(nome)
+
+    inicio = time.perf_counter()
+    tabela = cenarios.comparar(origem, destino, None, combustivel, mes)
+    duracao = time.perf_counter() - inicio
+    print(tabela.to_string(index=False))
+    reaproveitadas = sum(cenarios[nome].reaproveitadas for nome in cenarios)
+    buscas = sum(cenarios[nome].buscas for nome in cenarios)
+    print(f"{len(tabela)} cenário(s) em {duracao * 1000:.1f} ms: {reaproveitadas} rota(s) da base reaproveitada(s), "
+          f"{buscas} busca(s) nos cenários, {cenarios.base.buscas} árvore(s) da base calculada(s)")
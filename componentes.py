@@ -0,0 +1,175 @@
+import sys
+import time
+import random
+from collections import deque
+
+import networkx as nx
+
+from grafo_csr import GrafoCSR
+from catalogo import abrir_catalogo
+
+
+class IndiceComponentes:
+    """
+    Componentes conexas mantidas a cada edição do grafo. Cada vértice guarda o rótulo da
+    sua componente, então conectados() e e_conexo() respondem sem busca. Ao ligar duas
+    componentes, a menor recebe o rótulo da maior (um vértice muda de rótulo no máximo
+    log n vezes ao longo das adições). Ao remover uma aresta, duas buscas em largura saem
+    das pontas alternadamente: se elas se encontram, nada muda; se uma acaba primeiro, só
+    o lado dela, o menor, recebe um rótulo novo.
+    """
+
+    def __init__(self):
+        self.adj = {}
+        self.rotulo = {}
+        self.membros = {}
+        self._proximo = 0
+
+    # Função para montar o índice de uma rede inteira (ao carregar um CSV)
+    @classmethod
+    def from_csr(cls, grafo):
+        indice = cls()
+        off, viz = grafo._off, grafo._viz
+        for i, nome in enumerate(grafo.nomes):
+            indice.adj[nome] = {grafo.nomes[viz[k]] for k in range(off[i], off[i + 1])}
+        if len(grafo):
+            for rotulo, nome in zip(grafo.componentes().tolist(), grafo.nomes):
+                indice.rotulo[nome] = rotulo
+                indice.membros.setdefault(rotulo, set()).add(nome)
+            indice._proximo = max(indice.membros) + 1
+        return indice
+
+    @classmethod
+    def from_networkx(cls, G):
+        return cls.from_csr(GrafoCSR.from_networkx(G))
+
+    def __contains__(self, nome):
+        return nome in self.rotulo
+
+    def __len__(self):
+        return len(self.rotulo)
+
+    def _novo_rotulo(self, vertices):
+        rotulo = self._proximo
+        self._proximo += 1
+        for nome in vertices:
+            self.membros[self.rotulo[nome]].discard(nome)
+            self.rotulo[nome] = rotulo
+        self.membros[rotulo] = set(vertices)
+
+    def adicionar_no(self, nome, vizinhos=()):
+        if nome not in self.rotulo:
+            self.adj[nome] = set()
+            self.rotulo[nome] = self._proximo
+            self.membros[self._proximo] = {nome}
+            self._proximo += 1
+        for vizinho in vizinhos:
+            self.adicionar_aresta(nome, vizinho)
+
+    def adicionar_aresta(self, u, v):
+        for nome in (u, v):
+            if nome not in self.rotulo:
+                self.adicionar_no(nome)
+        self.adj[u].add(v)
+        self.adj[v].add(u)
+        a, b = self.rotulo[u], self.rotulo[v]
+        if a == b:
+            return
+        if len(self.membros[a]) < len(self.membros[b]):
+            a, b = b, a
+        for nome in self.membros[b]:
+            self.rotulo[nome] = a
+        self.membros[a] |= self.membros.pop(b)
+
+    def remover_aresta(self, u, v):
+        if u not in self.adj or v not in self.adj[u]:
+            return
+        self.adj[u].discard(v)
+        self.adj[v].discard(u)
+        self._separar(u, v)
+
+    # Busca alternada a partir de u e de v; se uma delas se esgota, o seu lado virou outra componente
+    def _separar(self, u, v):
+        if u == v:
+            return
+        buscas = [(deque([u]), {u}), (deque([v]), {v})]
+        while True:
+            for lado in (0, 1):
+                fila, vistos = buscas[lado]
+                outros = buscas[1 - lado][1]
+                if not fila:
+                    self._novo_rotulo(vistos)
+                    return
+                x = fila.popleft()
+                for y in self.adj[x]:
+                    if y in outros:
+                        return
+                    if y not in vistos:
+                        vistos.add(y)
+                        fila.append(y)
+
+    def remover_no(self, nome):
+        if nome not in self.rotulo:
+            return
+        pendentes = [vizinho for vizinho in self.adj.pop(nome) if vizinho != nome]
+        for vizinho in pendentes:
+            self.adj[vizinho].discard(nome)
+        rotulo = self.rotulo.pop(nome)
+        self.membros[rotulo].discard(nome)
+        if not self.membros[rotulo]:
+            del self.membros[rotulo]
+
+        # Cada pedaço da componente antiga contém algum vizinho do vértice removido: os
+        # vizinhos são comparados com o primeiro até sobrar só quem ficou em outro pedaço
+        while len(pendentes) > 1:
+            primeiro = pendentes[0]
+            for vizinho in pendentes[1:]:
+                if self.rotulo[vizinho] == self.rotulo[primeiro]:
+                    self._separar(primeiro, vizinho)
+            pendentes = [vizinho for vizinho in pendentes[1:] if self.rotulo[vizinho] != self.rotulo[primeiro]]
+
+    # Os vértices informados (ignorando None e "Nenhuma") estão todos na mesma componente?
+    def conectados(self, *nomes):
+        nomes = [nome for nome in nomes if nome and nome != "Nenhuma"]
+        if any(nome not in self.rotulo for nome in nomes):
+            return False
+        return len({self.rotulo[nome] for nome in nomes}) <= 1
+
+    def e_conexo(self):
+        if not self.rotulo:
+            raise nx.NetworkXPointlessConcept("Connectivity is undefined for the null graph.")
+        return len(self.membros) == 1
+
+    def numero_componentes(self):
+        return len(self.membros)
+
+    def componente(self, nome):
+        return set(self.membros[self.rotulo[nome]])
+
+
+# Uso: python componentes.py rede.csv [remocoes] (mede remoções de vértices e consultas)
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python componentes.py rede.csv [remocoes]")
+        sys.exit(1)
+
+    catalogo = abrir_catalogo()
+    grafo, erros = GrafoCSR.from_csv(sys.argv[1], catalogo.corpos, catalogo)
+    for erro in erros:
+        print(f"Erro: {erro}")
+    indice = IndiceComponentes.from_csr(grafo)
+    print(f"{len(indice)} vértices em {indice.numero_componentes()} componente(s)")
+
+    rng = random.Random(0)
+    remocoes = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    inicio = time.perf_counter()
+    for nome in rng.sample(grafo.nomes, min(remocoes, len(grafo.nomes))):
+        indice.remover_no(nome)
+    print(f"{remocoes} remoções em {(time.perf_counter() - inicio) * 1000:.1f} ms, "
+          f"{indice.numero_componentes()} componente(s) agora")
+
+    nomes = list(indice.rotulo)
+    pares = [(rng.choice(nomes), rng.choice(nomes)) for _ in range(100000)]
+    inicio = time.perf_counter()
+    ligados = sum(indice.conectados(u, v) for u, v in pares)
+    print(f"{len(pares)} consultas em {(time.perf_counter() - inicio) * 1000:.1f} ms ({ligados} ligadas)")
@@ -0,0 +1,174 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from grafo_csr import GrafoCSR
+from catalogo import abrir_catalogo
+from rotas_dinamicas import RotasDinamicas, subarvore, reparar_linha
+
+
+# A partir de quantos vértices a análise é dividida entre processos
+LIMIAR_PARALELO = 64
+
+
+# Pré-ordem da árvore de caminhos mínimos da fonte s: a subárvore de x é pre[tin[x]:tin[x] + tam[x]]
+def preordem(pred, s):
+    ordem = np.argsort(pred, kind='stable')
+    ordenados = pred[ordem]
+    limites = np.searchsorted(ordenados, np.arange(len(pred) + 1))
+    pre = []
+    pilha = [s]
+    while pilha:
+        u = pilha.pop()
+        pre.append(u)
+        pilha.extend(ordem[limites[u]:limites[u + 1]].tolist())
+    tin = np.full(len(pred), -1)
+    tin[pre] = np.arange(len(pre))
+    tam = np.ones(len(pred), dtype=np.int64)
+    for u in reversed(pre[1:]):
+        tam[pred[u]] += tam[u]
+    return np.array(pre), tin, tam
+
+
+# Intermediação ponderada (Brandes) de uma fonte, reaproveitando as distâncias de D
+def _intermediacao_fonte(dist, adj, s, total):
+    ordem = [s] + [v for v in np.argsort(dist, kind='stable').tolist() if v != s and dist[v] < np.inf]
+    sigma = {s: 1.0}
+    anteriores = {}
+    for v in ordem[1:]:
+        anteriores[v] = [u for u, w in adj[v].items() if dist[u] + w == dist[v]]
+        sigma[v] = sum(sigma[u] for u in anteriores[v])
+    delta = dict.fromkeys(ordem, 0.0)
+    for v in reversed(ordem[1:]):
+        for u in anteriores[v]:
+            delta[u] += sigma[u] / sigma[v] * (1 + delta[v])
+        total[v] += delta[v]
+
+
+# Efeito, na linha da fonte s, de remover x: repara a subárvore de x no lugar e desfaz depois
+def _impacto_na_linha(dist, pred, adj, x, afetados, combustivel):
+    colunas = list(afetados)
+    antes = dist[colunas]
+    salvos = pred[colunas], dist[x]
+    dist[x] = np.inf
+    reparar_linha(adj, dist, pred, afetados)
+    depois = dist[colunas]
+    pred[colunas], dist[x] = salvos
+    dist[colunas] = antes
+
+    perdidos = depois == np.inf
+    return (int(perdidos.sum()),
+            int(np.sum(~perdidos & (antes <= combustivel) & (depois > combustivel))),
+            float(np.sum(depois[~perdidos] - antes[~perdidos])))
+
+
+# Intermediação e impacto de remoção de todos os vértices, acumulados sobre um grupo de fontes
+def analisar_fontes(D, P, adj, fontes, combustivel=float('inf')):
+    """
+    Para cada fonte s, só os vértices que são internos à árvore de s podem mudar a linha
+    D[s] quando removidos, e só na sua subárvore. As contagens são de pares ordenados;
+    um par cuja distância muda tem as duas pontas como fontes afetadas.
+    """
+    n = D.shape[0]
+    intermediacao = np.zeros(n)
+    desconectados = np.zeros(n, dtype=np.int64)
+    inviaveis = np.zeros(n, dtype=np.int64)
+    aumento = np.zeros(n)
+    for s in fontes:
+        dist, pred = D[s].copy(), P[s].copy()
+        _intermediacao_fonte(dist, adj, s, intermediacao)
+        pre, tin, tam = preordem(pred, s)
+        for x in np.flatnonzero((tam > 1) & (tin > 0)).tolist():
+            afetados = set(pre[tin[x] + 1:tin[x] + tam[x]].tolist())
+            d, i, a = _impacto_na_linha(dist, pred, adj, x, afetados, combustivel)
+            desconectados[x] += d
+            inviaveis[x] += i
+            aumento[x] += a
+    return intermediacao, desconectados, inviaveis, aumento
+
+
+# Estado compartilhado pelos processos trabalhadores
+_contexto = {}
+
+
+def _inicializar_trabalhador(D, P, adj, combustivel):
+    _contexto.update(D=D, P=P, adj=adj, combustivel=combustivel)
+
+
+def _analisar_no_trabalhador(fontes):
+    return analisar_fontes(_contexto["D"], _contexto["P"], _contexto["adj"], fontes, _contexto["combustivel"])
+
+
+# Função para montar o relatório de criticidade de todos os vértices
+def analisar_criticidade(rotas, combustivel=float('inf'), processos=None):
+    """
+    Usa as matrizes D e P mantidas por RotasDinamicas (as mesmas da interface) para calcular
+    a intermediação ponderada e, para cada vértice, o efeito de removê-lo como em
+    delete_planet. Redes grandes são divididas entre processos, que recebem D, P e a
+    adjacência uma única vez. Devolve um DataFrame do vértice mais crítico ao menos crítico.
+    """
+    m = len(rotas.nomes)
+    D, P = rotas.D[:m, :m], rotas.P[:m, :m]
+    vivos = sorted(rotas.indices.values())
+    n = len(vivos)
+
+    if n < LIMIAR_PARALELO or processos == 1:
+        intermediacao, desconectados, inviaveis, aumento = analisar_fontes(D, P, rotas.adj, vivos, combustivel)
+    else:
+        processos = processos or os.cpu_count() or 1
+        grupos = [vivos[i::4 * processos] for i in range(4 * processos)]
+        with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_trabalhador,
+                                 initargs=(D, P, rotas.adj, combustivel)) as pool:
+            parciais = list(pool.map(_analisar_no_trabalhador, grupos))
+        intermediacao, desconectados, inviaveis, aumento = (sum(p[i] for p in parciais) for i in range(4))
+
+    # Mesma normalização do networkx para grafos não direcionados
+    escala = 1 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+    linhas = []
+    for x in vivos:
+        linhas.append({
+            "vertice": rotas.nomes[x],
+            "intermediacao": float(intermediacao[x] * escala),
+            "pares_desconectados": int(desconectados[x]) // 2,
+            "pares_inviaveis": int(inviaveis[x]) // 2,
+            "aumento_distancia": float(aumento[x]) / 2,
+        })
+
+    colunas = ["vertice", "intermediacao", "pares_desconectados", "pares_inviaveis", "aumento_distancia"]
+    tabela = pd.DataFrame(linhas, columns=colunas)
+    ordem = ["pares_desconectados", "pares_inviaveis", "aumento_distancia", "intermediacao"]
+    return tabela.sort_values(ordem, ascending=False, ignore_index=True)
+
+
+# Função para prever o efeito de excluir um único vértice (usada antes de delete_planet)
+def prever_remocao(rotas, nome, combustivel=float('inf')):
+    m = len(rotas.nomes)
+    x = rotas.indices[nome]
+    total = [0, 0, 0.0]
+    for s in np.flatnonzero(np.any(rotas.P[:m, :m] == x, axis=1)).tolist():
+        if s == x:
+            continue
+        dist, pred = rotas.D[s, :m].copy(), rotas.P[s, :m].copy()
+        afetados = subarvore(pred, [x])
+        afetados.discard(x)
+        for i, valor in enumerate(_impacto_na_linha(dist, pred, rotas.adj, x, afetados, combustivel)):
+            total[i] += valor
+    return {"pares_desconectados": total[0] // 2, "pares_inviaveis": total[1] // 2, "aumento_distancia": total[2] / 2}
+
+
+# Uso: python criticidade.py rede.csv [combustivel] [processos]
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python criticidade.py rede.csv [combustivel] [processos]")
+        sys.exit(1)
+
+    catalogo = abrir_catalogo()
+    grafo, erros = GrafoCSR.from_csv(sys.argv[1], catalogo.corpos, catalogo)
+    for erro in erros:
+        print(f"Erro: {erro}")
+    combustivel = float(sys.argv[2]) if len(sys.argv) > 2 else float('inf')
+    processos = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    print(analisar_criticidade(RotasDinamicas.from_csr(grafo), combustivel, processos).to_string(index=False))
@@ -0,0 +1,178 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from grafo_csr import GrafoCSR
+from catalogo import abrir_catalogo
+from planejamento import RECARGA_ESTACAO
+
+
+# A partir de quantos candidatos a avaliação é dividida entre processos
+LIMIAR_PARALELO = 64
+
+
+# Função para listar as estações do catálogo que ainda não estão no grafo, com suas conexões
+def candidatos_padrao(grafo, catalogo):
+    # Nos nomes ordenados as estações formam um só intervalo; de cada uma só os vizinhos do catálogo são lidos
+    prefixo = "Estacao"
+    inicio = int(np.searchsorted(catalogo.nomes_ordenados, prefixo))
+    fim = int(np.searchsorted(catalogo.nomes_ordenados, prefixo[:-1] + chr(ord(prefixo[-1]) + 1)))
+    candidatos = []
+    for i in np.sort(catalogo.ids_ordenados[inicio:fim]):  # Na ordem do catálogo, como antes
+        estacao = str(catalogo.nomes[i])
+        if estacao in grafo:
+            continue
+        conexoes = {nome: distancia for nome, distancia in catalogo.vizinhos_de(estacao) if nome in grafo}
+        if conexoes:
+            candidatos.append((estacao, conexoes))
+    return candidatos
+
+
+# Distância de uma estação candidata a todos os vértices, usando a matriz de todos os pares
+def distancias_candidato(D, indices, conexoes):
+    dist = np.full(D.shape[0], np.inf)
+    for nome, peso in conexoes.items():
+        if nome in indices:
+            np.minimum(dist, D[indices[nome]] + peso, out=dist)
+    return dist
+
+
+# Melhor distância por par passando por uma estação, só quando a recarga torna o trecho possível
+def via_estacao(dist_estacao, combustivel):
+    via = dist_estacao[:, None] + dist_estacao[None, :]
+    alcancavel = (dist_estacao <= combustivel)[:, None]
+    via[~alcancavel | (via > combustivel + RECARGA_ESTACAO)] = np.inf
+    return via
+
+
+# Pares (i < j) viáveis e os que o são sem recarga
+def pares_viaveis(D, via, combustivel):
+    n = D.shape[0]
+    superior = np.triu(np.ones((n, n), dtype=bool), k=1)
+    direto = (D <= combustivel) & superior
+    return direto | ((via < np.inf) & superior), direto
+
+
+# Função para medir quantos pares são viáveis e quanto se desvia para reabastecer
+def avaliar(D, via, combustivel, anteriores=None):
+    """
+    Devolve (pares viáveis, desvio total, desvio dos pares novos). Os pares novos são os
+    que não estavam em `anteriores` (os viáveis antes da estação avaliada): o desvio deles
+    fica à parte para que tornar uma viagem possível não pese contra a estação.
+    """
+    viavel, direto = pares_viaveis(D, via, combustivel)
+    precisa_recarga = viavel & ~direto
+    desvio = float(np.sum(via[precisa_recarga] - D[precisa_recarga]))
+    novos = precisa_recarga & ~anteriores if anteriores is not None else np.zeros_like(precisa_recarga)
+    desvio_novos = float(np.sum(via[novos] - D[novos]))
+    return int(viavel.sum()), desvio, desvio_novos
+
+
+# Métricas da rede com uma estação candidata a mais
+def avaliar_candidato(D, via, conexoes, indices, combustivel, anteriores=None):
+    dist = distancias_candidato(D, indices, conexoes)
+    novo_D = np.minimum(D, dist[:, None] + dist[None, :])
+    nova_via = np.minimum(via, via_estacao(dist, combustivel))
+    return avaliar(novo_D, nova_via, combustivel, anteriores)
+
+
+# Estado compartilhado pelos processos trabalhadores
+_contexto = {}
+
+
+def _inicializar_trabalhador(D, via, indices, combustivel, anteriores):
+    _contexto.update(D=D, via=via, indices=indices, combustivel=combustivel, anteriores=anteriores)
+
+
+def _avaliar_no_trabalhador(candidato):
+    _, conexoes = candidato
+    return avaliar_candidato(_contexto["D"], _contexto["via"], conexoes, _contexto["indices"], _contexto["combustivel"],
+                             _contexto["anteriores"])
+
+
+def _avaliar_todos(D, via, candidatos, indices, combustivel, processos, anteriores=None):
+    if len(candidatos) < LIMIAR_PARALELO or processos == 1:
+        return [avaliar_candidato(D, via, conexoes, indices, combustivel, anteriores) for _, conexoes in candidatos]
+    processos = processos or os.cpu_count() or 1
+    chunksize = max(1, len(candidatos) // (4 * processos))
+    with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_trabalhador,
+                             initargs=(D, via, indices, combustivel, anteriores)) as pool:
+        return list(pool.map(_avaliar_no_trabalhador, candidatos, chunksize=chunksize))
+
+
+# Função para escolher gulosamente onde colocar novas estações
+def analisar_estacoes(grafo, candidatos, combustivel, quantidade=1, objetivo='viaveis', processos=None):
+    """
+    Escolhe até `quantidade` estações entre os candidatos (nome, {conexão: distância}).
+    Uma viagem é viável se a distância mínima cabe no combustível inicial ou se a nave
+    alcança uma estação com o combustível inicial e, com a recarga, chega ao destino.
+    objetivo='viaveis' maximiza os pares viáveis; objetivo='desvio' minimiza o desvio
+    das viagens que já eram viáveis antes de cada escolha e desempata pelos pares viáveis
+    (o desvio das viagens que a estação torna possíveis aparece em desvio_novos).
+    Devolve um DataFrame com cada escolha.
+    """
+    if objetivo not in ('viaveis', 'desvio'):
+        raise ValueError("O objetivo deve ser 'viaveis' ou 'desvio'.")
+
+    D = grafo.distancias_todos_pares()
+    n = len(grafo)
+    via = np.full((n, n), np.inf)
+    for estacao in grafo.nomes:
+        if estacao.startswith("Estacao"):
+            np.minimum(via, via_estacao(D[grafo.indices[estacao]], combustivel), out=via)
+
+    pares, desvio, _ = avaliar(D, via, combustivel)
+    linhas = [{"estacao": "(rede atual)", "pares_viaveis": pares, "desvio_total": desvio, "desvio_novos": 0.0}]
+    restantes = [c for c in candidatos if c[0] not in grafo]
+
+    for _ in range(quantidade):
+        if not restantes:
+            break
+        anteriores, _ = pares_viaveis(D, via, combustivel)
+        resultados = _avaliar_todos(D, via, restantes, grafo.indices, combustivel, processos, anteriores)
+        if objetivo == 'viaveis':
+            melhor = min(range(len(restantes)), key=lambda i: (-resultados[i][0], resultados[i][1]))
+        else:
+            melhor = min(range(len(restantes)), key=lambda i: (resultados[i][1] - resultados[i][2], -resultados[i][0]))
+
+        estacao, conexoes = restantes.pop(melhor)
+        dist = distancias_candidato(D, grafo.indices, conexoes)
+        D = np.minimum(D, dist[:, None] + dist[None, :])
+        via = np.minimum(via, via_estacao(dist, combustivel))
+        pares, desvio, desvio_novos = resultados[melhor]
+        linhas.append({"estacao": estacao, "pares_viaveis": pares, "desvio_total": desvio, "desvio_novos": desvio_novos})
+
+    return pd.DataFrame(linhas)
+
+
+# Função para ler candidatos de um CSV 'Estacao;Conexoes' com conexões no formato Marte:400,Netuno:900
+def ler_candidatos_csv(file_path):
+    df = pd.read_csv(file_path, delimiter=';')
+    if 'Estacao' not in df.columns or 'Conexoes' not in df.columns:
+        raise ValueError("O CSV deve conter as colunas: 'Estacao', 'Conexoes'")
+    candidatos = []
+    for estacao, conexoes in zip(df['Estacao'], df['Conexoes']):
+        pares = (item.split(':') for item in conexoes.split(','))
+        candidatos.append((estacao, {nome: float(distancia) for nome, distancia in pares}))
+    return candidatos
+
+
+# Uso: python estacoes.py rede.csv combustivel [quantidade] [candidatos.csv] [viaveis|desvio]
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python estacoes.py rede.csv combustivel [quantidade] [candidatos.csv] [viaveis|desvio]")
+        sys.exit(1)
+
+    catalogo = abrir_catalogo()
+    grafo, erros = GrafoCSR.from_csv(sys.argv[1], catalogo.corpos, catalogo)
+    for erro in erros:
+        print(f"Erro: {erro}")
+    combustivel = float(sys.argv[2])
+    quantidade = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    candidatos = ler_candidatos_csv(sys.argv[4]) if len(sys.argv) > 4 else candidatos_padrao(grafo, catalogo)
+    objetivo = sys.argv[5] if len(sys.argv) > 5 else 'viaveis'
+
+    print(analisar_estacoes(grafo, candidatos, combustivel, quantidade, objetivo).to_string(index=False))
@@ -0,0 +1,338 @@
+import sys
+import time
+import heapq
+import random
+
+import numpy as np
+import pandas as pd
+
+from dados import meses_do_ano
+from catalogo import abrir_catalogo
+from grafo_csr import GrafoCSR
+from planejamento import e_estacao, ajuste_do_mes, _como_numero, RECARGA_ESTACAO
+
+
+# Recargas que cada estação atende no mês, quando não há capacidade específica
+CAPACIDADE_ESTACAO = 50
+MAX_ITERACOES = 30
+# Rotas diferentes guardadas por grupo de naves iguais (mesma origem, destino e combustível)
+MAX_CANDIDATOS = 8
+# A cada iteração sem solução, o excesso de uso pesa mais
+CRESCIMENTO_PENALIDADE = 1.5
+# Iterações seguidas sem reduzir o excesso total antes de desistir da negociação
+PACIENCIA = 5
+
+
+# Rota possível de um grupo: vértices, recursos usados (estações e arestas), distância e combustível final
+class Candidato:
+    __slots__ = ("caminho", "recursos", "distancia", "combustivel")
+
+    def __init__(self, caminho, recursos, distancia, combustivel):
+        self.caminho = caminho
+        self.recursos = recursos
+        self.distancia = distancia
+        self.combustivel = combustivel
+
+
+class PlanejadorFrota:
+    """
+    Planeja as rotas de uma frota inteira de uma vez. Os recursos disputados são as vagas
+    de recarga de cada estação (cada nave que passa por uma estação recarrega e ocupa uma
+    vaga, como em planejar_viagem) e, opcionalmente, o tráfego de cada aresta. As naves
+    iguais formam um grupo e são distribuídas em bloco pelas rotas candidatas do grupo.
+    A divisão é negociada (como no roteamento PathFinder): recursos acima da capacidade
+    recebem uma penalidade que cresce a cada iteração, e os grupos procuram rotas novas
+    que os evitem. Se ainda sobrar excesso no fim, as naves mais caras nos recursos
+    lotados ficam sem rota, então o plano devolvido sempre respeita as capacidades.
+    """
+
+    def __init__(self, grafo, capacidade_estacoes=CAPACIDADE_ESTACAO, capacidade_arestas=None):
+        self.grafo = grafo
+        n = len(grafo)
+        origem = np.repeat(np.arange(n, dtype=np.int64), np.diff(grafo.offsets))
+        chaves = origem * n + grafo.vizinhos
+        reverso = np.searchsorted(chaves, grafo.vizinhos.astype(np.int64) * n + origem)
+        # Os dois sentidos de uma aresta dividem o mesmo recurso: o da menor posição no CSR
+        self.aresta = np.minimum(np.arange(len(chaves)), reverso).tolist()
+        self.estacao = [e_estacao(nome) for nome in grafo.nomes]
+
+        # Recursos 0..n-1 são as vagas das estações; n + k é a aresta k do CSR
+        self.capacidade = np.full(n + len(chaves), np.inf)
+        for i, nome in enumerate(grafo.nomes):
+            if self.estacao[i]:
+                if isinstance(capacidade_estacoes, dict):
+                    self.capacidade[i] = capacidade_estacoes.get(nome, CAPACIDADE_ESTACAO)
+                else:
+                    self.capacidade[i] = capacidade_estacoes
+        if isinstance(capacidade_arestas, dict):
+            for (a, b), limite in capacidade_arestas.items():
+                u, v = grafo.indices[a], grafo.indices[b]
+                k = int(np.searchsorted(chaves, u * n + v))
+                self.capacidade[n + self.aresta[k]] = limite
+        elif capacidade_arestas is not None:
+            self.capacidade[n + np.unique(self.aresta)] = capacidade_arestas
+        # Escala das penalidades: uma aresta típica
+        self.escala = float(np.median(grafo.pesos)) if len(grafo.pesos) else 1.0
+        self.componentes = grafo.componentes().tolist() if n else []
+
+    # Busca sobre rótulos (custo, combustível, estações usadas): menor distância + penalidades, sem faltar combustível
+    def _buscar(self, o, alvos, combustivel, penalidade):
+        """
+        O primeiro rótulo a sair do heap em cada alvo é a rota mais barata até ele. A busca
+        para quando todos os alvos foram alcançados ou quando o combustível não leva a mais
+        nada. Devolve {alvo: (caminho, distância, combustível final)}.
+        """
+        off, viz, pes = self.grafo._off, self.grafo._viz, self.grafo._pes
+        estacao, aresta, n = self.estacao, self.aresta, len(self.grafo)
+        faltam = set(alvos)
+        achados = {}
+
+        custo0 = penalidade[o] if estacao[o] else 0.0
+        # rotulos[i] = (custo, distância, combustível, vértice, estações usadas, pai)
+        rotulos = [(custo0, 0.0, combustivel, o, frozenset(), -1)]
+        vivo = [True]
+        por_vertice = {o: [0]}
+        heap = [(custo0, 0)]
+        while heap and faltam:
+            _, i = heapq.heappop(heap)
+            if not vivo[i]:
+                continue
+            c, d, f, u, usadas, _ = rotulos[i]
+            if u in faltam:
+                faltam.discard(u)
+                caminho = []
+                j = i
+                while j != -1:
+                    caminho.append(rotulos[j][3])
+                    j = rotulos[j][5]
+                caminho.reverse()
+                achados[u] = (caminho, d, f)
+            for k in range(off[u], off[u + 1]):
+                v = viz[k]
+                nf, nusadas = f, usadas
+                if (estacao[u] and u not in usadas) or (estacao[v] and v not in usadas):
+                    nf += RECARGA_ESTACAO
+                    nusadas = usadas | {u if estacao[u] else v}
+                nf -= pes[k]
+                if nf < 0:
+                    continue
+                nc = c + pes[k] + penalidade[n + aresta[k]] + (penalidade[v] if estacao[v] else 0.0)
+                # Um rótulo domina outro se custa menos e tem combustível para compensar as recargas
+                # que o outro ainda pode fazer nas estações que ele já usou (no máximo duas por estação)
+                existentes = por_vertice.setdefault(v, [])
+                if any(rotulos[j][0] <= nc and rotulos[j][2] >= nf + 2 * RECARGA_ESTACAO * len(rotulos[j][4] - nusadas)
+                       for j in existentes):
+                    continue
+                for j in existentes:
+                    if nc <= rotulos[j][0] and nf >= rotulos[j][2] + 2 * RECARGA_ESTACAO * len(nusadas - rotulos[j][4]):
+                        vivo[j] = False
+                existentes[:] = [j for j in existentes if vivo[j]]
+                existentes.append(len(rotulos))
+                rotulos.append((nc, d + pes[k], nf, v, nusadas, i))
+                vivo.append(True)
+                heapq.heappush(heap, (nc, len(rotulos) - 1))
+        return achados
+
+    def _candidato(self, caminho, distancia, final):
+        n = len(self.grafo)
+        recursos = {u for u in caminho if self.estacao[u]}
+        for u, v in zip(caminho, caminho[1:]):
+            k = self.grafo._off[u] + int(np.searchsorted(self.grafo.vizinhos[self.grafo._off[u]:self.grafo._off[u + 1]], v))
+            recursos.add(n + self.aresta[k])
+        limitados = [r for r in recursos if self.capacidade[r] < np.inf]
+        return Candidato(caminho, limitados, distancia, final)
+
+    # Penalidade de cada recurso para a próxima nave: histórico de excesso + excesso que ela causaria
+    def _penalidades(self, uso, historico, fator):
+        excesso = np.maximum(uso + 1 - self.capacidade, 0)
+        return (self.escala * (historico + fator * excesso)).tolist()
+
+    def _custo(self, candidato, uso, historico, fator):
+        custo = candidato.distancia
+        for r in candidato.recursos:
+            custo += self.escala * (historico[r] + fator * max(uso[r] + 1 - self.capacidade[r], 0))
+        return custo
+
+    # Função para planejar uma lista de naves (origem, destino, combustível) num mês
+    def planejar(self, naves, month, max_iteracoes=MAX_ITERACOES, seed=0):
+        if max_iteracoes < 1:
+            raise ValueError("max_iteracoes deve ser pelo menos 1.")  # Sem uma rodada não há divisão das naves
+        grafo = self.grafo
+        status = ["sem_capacidade"] * len(naves)
+        grupos = {}
+        for i, (origem, destino, combustivel) in enumerate(naves):
+            ajuste = ajuste_do_mes(origem, destino, month)
+            if ajuste is None:
+                status[i] = "cancelada"
+            elif origem not in grafo or destino not in grafo:
+                status[i] = "sem_rota"
+            else:
+                chave = (grafo.indices[origem], grafo.indices[destino], float(combustivel) + ajuste)
+                grupos.setdefault(chave, []).append(i)
+
+        # Primeira rota de cada grupo, sem disputa: uma busca por origem e combustível serve a todos os destinos
+        por_origem = {}
+        for o, t, combustivel in grupos:
+            if self.componentes[o] == self.componentes[t]:
+                por_origem.setdefault((o, combustivel), set()).add(t)
+        zeros = [0.0] * len(self.capacidade)
+        candidatos = {}
+        for (o, combustivel), alvos in por_origem.items():
+            for t, achado in self._buscar(o, alvos, combustivel, zeros).items():
+                candidatos[(o, t, combustivel)] = [self._candidato(*achado)]
+        # Grupos sem rota viável saem do plano
+        for chave in [chave for chave in grupos if chave not in candidatos]:
+            for i in grupos.pop(chave):
+                status[i] = "sem_rota"
+
+        ordem = list(grupos)
+        random.Random(seed).shuffle(ordem)
+        historico = np.zeros(len(self.capacidade))
+        fator = 1.0
+        iteracoes = 0
+        menor_excesso, sem_melhora = np.inf, 0
+        for iteracoes in range(1, max_iteracoes + 1):
+            uso = np.zeros(len(self.capacidade))
+            divisao = {}
+            lotados = set()
+            for chave in ordem:
+                restantes = len(grupos[chave])
+                divisao[chave] = []
+                while restantes:
+                    custos = [self._custo(c, uso, historico, fator) for c in candidatos[chave]]
+                    melhor = int(np.argmin(custos))
+                    escolhido = candidatos[chave][melhor]
+                    folga = min((self.capacidade[r] - uso[r] for r in escolhido.recursos), default=np.inf)
+                    if folga < 1:
+                        lotados.add(chave)
+                    quantidade = restantes if folga < 1 or folga == np.inf else int(min(restantes, folga))
+                    for r in escolhido.recursos:
+                        uso[r] += quantidade
+                    divisao[chave].append((melhor, quantidade))
+                    restantes -= quantidade
+
+            excesso = np.maximum(uso - self.capacidade, 0)
+            if not excesso.any():
+                break
+            if excesso.sum() < menor_excesso:
+                menor_excesso, sem_melhora = excesso.sum(), 0
+            else:
+                sem_melhora += 1
+                if sem_melhora >= PACIENCIA:
+                    break
+            historico += excesso > 0
+            fator *= CRESCIMENTO_PENALIDADE
+
+            # Grupos que acharam a rota lotada ganham uma rota que desvia dos recursos cheios,
+            # com uma busca por origem e combustível para todos os destinos de uma vez
+            penalidade = self._penalidades(uso, historico, fator)
+            buscas = {}
+            for o, t, combustivel in lotados:
+                if len(candidatos[(o, t, combustivel)]) < MAX_CANDIDATOS:
+                    buscas.setdefault((o, combustivel), set()).add(t)
+            for (o, combustivel), alvos in buscas.items():
+                for t, achado in self._buscar(o, alvos, combustivel, penalidade).items():
+                    nova = self._candidato(*achado)
+                    if all(nova.caminho != c.caminho for c in candidatos[(o, t, combustivel)]):
+                        candidatos[(o, t, combustivel)].append(nova)
+
+        # Excesso que sobrou: tira naves das rotas mais longas que passam pelos recursos lotados
+        blocos = sorted(((chave, indice, quantidade) for chave, partes in divisao.items() for indice, quantidade in partes),
+                        key=lambda b: -candidatos[b[0]][b[1]].distancia)
+        atendidas = {}
+        for chave, indice, quantidade in blocos:
+            candidato = candidatos[chave][indice]
+            sobra = max((uso[r] - self.capacidade[r] for r in candidato.recursos), default=0)
+            retirar = int(min(quantidade, max(sobra, 0)))
+            for r in candidato.recursos:
+                uso[r] -= retirar
+            atendidas.setdefault(chave, []).append((candidato, quantidade - retirar))
+
+        # As naves retiradas ainda podem caber em outra rota candidata do grupo, com o que sobrou
+        for chave in ordem:
+            faltam = len(grupos[chave]) - sum(q for _, q in atendidas.get(chave, []))
+            for candidato in sorted(candidatos[chave], key=lambda c: c.distancia):
+                if faltam == 0:
+                    break
+                folga = min((self.capacidade[r] - uso[r] for r in candidato.recursos), default=np.inf)
+                quantidade = int(min(faltam, folga))
+                if quantidade > 0:
+                    for r in candidato.recursos:
+                        uso[r] += quantidade
+                    atendidas.setdefault(chave, []).append((candidato, quantidade))
+                    faltam -= quantidade
+
+        rotas = [None] * len(naves)
+        for chave, partes in atendidas.items():
+            membros = iter(grupos[chave])
+            for candidato, quantidade in partes:
+                for _ in range(quantidade):
+                    i = next(membros)
+                    status[i] = "atendida"
+                    rotas[i] = candidato
+
+        linhas = []
+        for i, (origem, destino, combustivel) in enumerate(naves):
+            candidato = rotas[i]
+            linhas.append({
+                "nave": i,
+                "origem": origem,
+                "destino": destino,
+                "combustivel": combustivel,
+                "status": status[i],
+                "distancia": _como_numero(candidato.distancia) if candidato else None,
+                "combustivel_final": _como_numero(candidato.combustivel) if candidato else None,
+                "rota": " -> ".join(grafo.nomes[u] for u in candidato.caminho) if candidato else "",
+            })
+        tabela = pd.DataFrame(linhas, columns=["nave", "origem", "destino", "combustivel", "status",
+                                               "distancia", "combustivel_final", "rota"])
+        tabela.attrs["iteracoes"] = iteracoes
+
+        estacoes = [i for i, e in enumerate(self.estacao) if e]
+        ocupacao = pd.DataFrame({
+            "estacao": [grafo.nomes[i] for i in estacoes],
+            "recargas": [int(uso[i]) for i in estacoes],
+            "capacidade": [self.capacidade[i] for i in estacoes],
+        }, columns=["estacao", "recargas", "capacidade"])
+        return tabela, ocupacao
+
+
+# Função para planejar uma frota sem montar o planejador à mão
+def planejar_frota(grafo, naves, month, capacidade_estacoes=CAPACIDADE_ESTACAO, capacidade_arestas=None):
+    return PlanejadorFrota(grafo, capacidade_estacoes, capacidade_arestas).planejar(naves, month)
+
+
+# Função para ler a frota de um CSV 'Origem;Destino;Combustivel'
+def ler_frota_csv(file_path):
+    df = pd.read_csv(file_path, delimiter=';')
+    if not {'Origem', 'Destino', 'Combustivel'} <= set(df.columns):
+        raise ValueError("O CSV deve conter as colunas: 'Origem', 'Destino', 'Combustivel'")
+    return list(zip(df['Origem'].astype(str), df['Destino'].astype(str), df['Combustivel'].astype(float)))
+
+
+# Frota aleatória entre os vértices do grafo (para medir o planejador)
+def frota_aleatoria(grafo, quantidade, combustiveis=(500, 1000, 3000), seed=0):
+    rng = random.Random(seed)
+    return [(rng.choice(grafo.nomes), rng.choice(grafo.nomes), float(rng.choice(combustiveis))) for _ in range(quantidade)]
+
+
+# Uso: python frota.py rede.csv (frota.csv | N) [mês] [capacidade_estacao] [capacidade_aresta]
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python frota.py rede.csv (frota.csv | N) [mês] [capacidade_estacao] [capacidade_aresta]")
+        sys.exit(1)
+
+    catalogo = abrir_catalogo()
+    grafo, erros = GrafoCSR.from_csv(sys.argv[1], catalogo.corpos, catalogo)
+    for erro in erros:
+        print(f"Erro: {erro}")
+    naves = frota_aleatoria(grafo, int(sys.argv[2])) if sys.argv[2].isdigit() else ler_frota_csv(sys.argv[2])
+    mes = sys.argv[3] if len(sys.argv) > 3 else meses_do_ano[0]
+    capacidade_estacao = int(sys.argv[4]) if len(sys.argv) > 4 else CAPACIDADE_ESTACAO
+    capacidade_aresta = int(sys.argv[5]) if len(sys.argv) > 5 else None
+
+    inicio = time.perf_counter()
+    tabela, ocupacao = planejar_frota(grafo, naves, mes, capacidade_estacao, capacidade_aresta)
+    print(f"{len(naves)} naves planejadas em {time.perf_counter() - inicio:.2f} s ({tabela.attrs['iteracoes']} iterações)")
+    print(tabela["status"].value_counts().to_string())
+    print(ocupacao.to_string(index=False))
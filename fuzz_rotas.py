@@ -0,0 +1,620 @@
+import sys
+import time
+import random
+import tempfile
+import itertools
+
+import networkx as nx
+
+from dados import valid_planets, meses_do_ano
+from grafo_csr import GrafoCSR
+from planejamento import planejar_viagem, e_estacao, corpos_de_risco
+from rotas_dinamicas import RotasDinamicas
+from hierarquia import HierarquiaContracao
+from componentes import IndiceComponentes
+from cenarios import Cenarios
+from criticidade import analisar_criticidade, prever_remocao
+from catalogo import CatalogoDistancias
+from rotas_pareto import rotas_pareto
+
+
+# Nomes usados nas redes aleatórias: os corpos reais (para disparar as regras do mês) e extras
+NOMES = valid_planets + [f"Corpo_{i}" for i in range(6)] + [f"Estacao_X{i}" for i in range(3)]
+COMBUSTIVEIS = [0, 100, 500, 1000, 2500, 10000]
+
+
+# Implementação de referência: nx.shortest_path sobre o networkx, como era em show_shortest_path
+class MotorReferencia:
+    def __init__(self, G):
+        self.G = G
+
+    def __contains__(self, nome):
+        return nome in self.G
+
+    def rota(self, origem, destino, parada=None):
+        if parada and parada != "Nenhuma" and parada in self.G:
+            path1 = nx.shortest_path(self.G, source=origem, target=parada, weight='weight')
+            path2 = nx.shortest_path(self.G, source=parada, target=destino, weight='weight')
+            return path1[:-1] + path2
+        return nx.shortest_path(self.G, source=origem, target=destino, weight='weight')
+
+    def peso(self, u, v):
+        return self.G[u][v]['weight']
+
+
+# Referência obrigada a seguir um caminho dado (para conferir a simulação em caso de empate)
+class MotorCaminhoFixo(MotorReferencia):
+    def __init__(self, G, caminho):
+        super().__init__(G)
+        self.caminho = caminho
+
+    def rota(self, origem, destino, parada=None):
+        return self.caminho
+
+
+# Motor CSR mantido como na interface: reconstruído a cada edição do grafo
+class MotorCSR:
+    def __init__(self, G):
+        self.G = G
+        self.grafo = GrafoCSR.from_networkx(G)
+
+    def __contains__(self, nome):
+        return nome in self.grafo
+
+    def adicionar_no(self, nome, conexoes):
+        self.G.add_node(nome)
+        for vizinho, peso in conexoes:
+            self.G.add_edge(nome, vizinho, weight=peso)
+        self.grafo = GrafoCSR.from_networkx(self.G)
+
+    def remover_no(self, nome):
+        self.G.remove_node(nome)
+        self.grafo = GrafoCSR.from_networkx(self.G)
+
+    def rota(self, origem, destino, parada=None):
+        return self.grafo.rota(origem, destino, parada)
+
+    def peso(self, u, v):
+        return self.grafo.peso(u, v)
+
+
+# Hierarquia de contração reconstruída a cada edição (o índice é estático)
+class MotorHierarquia(MotorCSR):
+    def __init__(self, G):
+        super().__init__(G)
+        self.hierarquia = HierarquiaContracao.construir(self.grafo)
+
+    def adicionar_no(self, nome, conexoes):
+        super().adicionar_no(nome, conexoes)
+        self.hierarquia = HierarquiaContracao.construir(self.grafo)
+
+    def remover_no(self, nome):
+        super().remover_no(nome)
+        self.hierarquia = HierarquiaContracao.construir(self.grafo)
+
+    def rota(self, origem, destino, parada=None):
+        return self.hierarquia.rota(origem, destino, parada)
+
+
+# Motor CSR que descarta viagens sem caminho pelo índice de componentes mantido a cada edição
+class MotorComponentes(MotorCSR):
+    def __init__(self, G):
+        super().__init__(G)
+        self.componentes = IndiceComponentes.from_csr(self.grafo)
+
+    def adicionar_no(self, nome, conexoes):
+        super().adicionar_no(nome, conexoes)
+        self.componentes.adicionar_no(nome, [vizinho for vizinho, _ in conexoes])
+
+    def remover_no(self, nome):
+        super().remover_no(nome)
+        self.componentes.remover_no(nome)
+
+
+# Sorteio fixo para cada grafo: a redução de um caso com falha refaz as mesmas edições
+def _sorteio(G):
+    arestas = sorted((min(u, v), max(u, v), peso) for u, v, peso in G.edges(data='weight'))
+    return random.Random(repr((sorted(G.nodes), arestas)))
+
+
+# Montagem que só chega ao grafo G por edições: parte das arestas começa com o peso certo, parte
+# com outro peso e parte falta; sobram arestas e uma estação a mais que as edições precisam tirar.
+# As edições vêm embaralhadas no formato de Cenario.operacoes
+def _montagem_parcial(G):
+    rng = _sorteio(G)
+    inicial = nx.Graph()
+    inicial.add_nodes_from(G)
+    edicoes = []
+    for u, v, peso in G.edges(data='weight'):
+        sorteio = rng.random()
+        if sorteio < 0.7:
+            inicial.add_edge(u, v, weight=peso if sorteio < 0.4 else rng.randint(1, 2 * peso))
+        if sorteio >= 0.4:
+            edicoes.append(("adicionar_aresta", u, v, peso))
+    nos = list(G)
+    if len(nos) >= 2:
+        for _ in range(rng.randint(0, 3)):
+            u, v = rng.sample(nos, 2)
+            if not G.has_edge(u, v) and not inicial.has_edge(u, v):
+                inicial.add_edge(u, v, weight=rng.randint(1, 50))
+                edicoes.append(("remover_aresta", u, v))
+    if nos:
+        extra = "Estacao_Extra"
+        for v in rng.sample(nos, min(len(nos), 2)):
+            inicial.add_edge(extra, v, weight=1)
+        edicoes.append(("remover_no", extra))
+    rng.shuffle(edicoes)
+    return inicial, edicoes
+
+
+# Cenário copy-on-write (como em "Cenários"): a base é a montagem parcial e um ramo de um ramo
+# chega ao grafo do caso só por edições; as edições do caso também vão para o ramo
+def motor_cenario(G):
+    inicial, edicoes = _montagem_parcial(G)
+    cenarios = Cenarios(GrafoCSR.from_networkx(inicial))
+    cenario = cenarios.criar("fuzz")
+    for operacao in edicoes[:len(edicoes) // 2]:
+        getattr(cenario, operacao[0])(*operacao[1:])
+    ramo = cenarios.criar("fuzz_ramo", de="fuzz")
+    for operacao in edicoes[len(edicoes) // 2:]:
+        getattr(ramo, operacao[0])(*operacao[1:])
+    return ramo
+
+
+# Rotas dinâmicas levadas ao grafo do caso por arestas editadas uma a uma (como recarregar_csv faz)
+def motor_arestas_dinamicas(G):
+    inicial, edicoes = _montagem_parcial(G)
+    rotas = RotasDinamicas.from_networkx(inicial)
+    for operacao in edicoes:
+        getattr(rotas, operacao[0])(*operacao[1:])
+    return rotas
+
+
+# Motores comparados com a referência; cada um recebe uma cópia do grafo inicial
+MOTORES = {
+    "csr": MotorCSR,
+    "dinamico": RotasDinamicas.from_networkx,
+    "hierarquia": MotorHierarquia,
+    "componentes": MotorComponentes,
+    "cenario": motor_cenario,
+    "arestas_dinamicas": motor_arestas_dinamicas,
+}
+
+
+# Função para gerar uma rede aleatória com uma sequência de edições e viagens
+def gerar_caso(rng, max_nos=10, max_ops=12):
+    nos = rng.sample(NOMES, rng.randint(2, max_nos))
+    # Pesos pequenos forçam empates entre caminhos, pesos grandes testam o combustível
+    peso_maximo = rng.choice([5, 100, 3000])
+    arestas = []
+    for i, u in enumerate(nos):
+        for v in nos[i + 1:]:
+            if rng.random() < 0.35:
+                arestas.append((u, v, rng.randint(1, peso_maximo)))
+
+    presentes = list(nos)
+    ops = []
+    for _ in range(rng.randint(1, max_ops)):
+        sorteio = rng.random()
+        ausentes = [nome for nome in NOMES if nome not in presentes]
+        if sorteio < 0.2 and ausentes:
+            nome = rng.choice(ausentes)
+            vizinhos = rng.sample(presentes, min(len(presentes), rng.randint(1, 3)))
+            ops.append(("add", nome, tuple((v, rng.randint(1, peso_maximo)) for v in vizinhos)))
+            presentes.append(nome)
+        elif sorteio < 0.35 and len(presentes) > 2:
+            nome = rng.choice(presentes)
+            ops.append(("del", nome))
+            presentes.remove(nome)
+        else:
+            origem, destino = rng.choice(presentes), rng.choice(presentes)
+            parada = rng.choice(["Nenhuma", "Nenhuma", rng.choice(presentes)])
+            ops.append(("trip", origem, destino, parada, float(rng.choice(COMBUSTIVEIS)), rng.choice(meses_do_ano)))
+    return {"nos": nos, "arestas": arestas, "ops": ops}
+
+
+def _custo(G, caminho):
+    return sum(G[u][v]['weight'] for u, v in zip(caminho, caminho[1:]))
+
+
+# Caminhos diferentes só são aceitos se forem válidos e tiverem a mesma distância (empate)
+def _validar_empate(G, origem, destino, parada, esperado, obtido):
+    if bool(esperado["caminho"]) != bool(obtido["caminho"]):
+        return f"caminho esperado {esperado['caminho']}, obtido {obtido['caminho']}"
+    caminho = obtido["caminho"]
+    if caminho[0] != origem or caminho[-1] != destino:
+        return f"caminho {caminho} não liga {origem} a {destino}"
+    if any(not G.has_edge(u, v) for u, v in zip(caminho, caminho[1:])):
+        return f"caminho {caminho} usa arestas inexistentes"
+    if parada and parada != "Nenhuma" and parada in G and parada not in caminho:
+        return f"caminho {caminho} não passa pela parada {parada}"
+    if abs(_custo(G, caminho) - _custo(G, esperado["caminho"])) > 1e-6:
+        return f"caminho {caminho} ({_custo(G, caminho)}) é mais longo que {esperado['caminho']} ({_custo(G, esperado['caminho'])})"
+    return None
+
+
+# Função para comparar uma viagem planejada pelo motor com a referência
+def comparar_viagem(G, motor, viagem):
+    _, origem, destino, parada, combustivel, mes = viagem
+    esperado = planejar_viagem(MotorReferencia(G), origem, destino, parada, combustivel, mes)
+    try:
+        obtido = planejar_viagem(motor, origem, destino, parada, combustivel, mes,
+                                 componentes=getattr(motor, "componentes", None))
+    except Exception as e:
+        return f"exceção no motor: {e!r}"
+
+    if obtido["caminho"] != esperado["caminho"]:
+        problema = _validar_empate(G, origem, destino, parada, esperado, obtido)
+        if problema:
+            return problema
+        esperado = planejar_viagem(MotorCaminhoFixo(G, obtido["caminho"]), origem, destino, parada, combustivel, mes)
+
+    for chave in ("status", "distancia_total", "combustivel", "linhas"):
+        if obtido[chave] != esperado[chave]:
+            return f"{chave}: esperado {esperado[chave]!r}, obtido {obtido[chave]!r}"
+    return None
+
+
+def montar_grafo(caso):
+    G = nx.Graph()
+    G.add_nodes_from(caso["nos"])
+    for u, v, peso in caso["arestas"]:
+        if u in G and v in G:
+            G.add_edge(u, v, weight=peso)
+    return G
+
+
+# Função para executar um caso; devolve (índice da operação, problema) na primeira divergência
+def executar_caso(caso, fabrica):
+    G = montar_grafo(caso)
+    try:
+        motor = fabrica(G.copy())
+    except Exception as e:
+        return -1, f"exceção ao montar o motor: {e!r}"
+
+    # Operações que deixaram de fazer sentido (por causa da redução) são ignoradas
+    for i, op in enumerate(caso["ops"]):
+        try:
+            if op[0] == "add":
+                conexoes = tuple((v, peso) for v, peso in op[2] if v in G)
+                if op[1] in G or not conexoes:
+                    continue
+                G.add_node(op[1])
+                for v, peso in conexoes:
+                    G.add_edge(op[1], v, weight=peso)
+                motor.adicionar_no(op[1], conexoes)
+            elif op[0] == "del":
+                if op[1] not in G or len(G) <= 1:
+                    continue
+                G.remove_node(op[1])
+                motor.remover_no(op[1])
+            else:
+                if op[1] not in G or op[2] not in G:
+                    continue
+                problema = comparar_viagem(G, motor, op)
+                if problema:
+                    return i, problema
+        except Exception as e:
+            return i, f"exceção no motor: {e!r}"
+    return None
+
+
+# Edição aleatória de vértice ou aresta feita em H; devolve a operação no formato de Cenario.operacoes
+def _editar(H, rng):
+    nos = list(H)
+    ausentes = [nome for nome in NOMES if nome not in H]
+    peso_maximo = rng.choice([5, 100])
+    sorteio = rng.random()
+    if sorteio < 0.25 and len(nos) > 1:
+        nome = rng.choice(nos)
+        H.remove_node(nome)
+        return ("remover_no", nome)
+    if sorteio < 0.5 and ausentes:
+        nome = rng.choice(ausentes)
+        conexoes = tuple((v, rng.randint(1, peso_maximo)) for v in rng.sample(nos, min(len(nos), rng.randint(0, 3))))
+        H.add_node(nome)
+        for v, peso in conexoes:
+            H.add_edge(nome, v, weight=peso)
+        return ("adicionar_no", nome, conexoes)
+    if sorteio < 0.75 and H.number_of_edges():
+        u, v = rng.choice(list(H.edges))
+        H.remove_edge(u, v)
+        return ("remover_aresta", u, v)
+    if len(nos) >= 2:
+        u, v = rng.sample(nos, 2)
+        peso = rng.randint(1, peso_maximo)
+        H.add_edge(u, v, weight=peso)  # Se a aresta já existe, o peso muda
+        return ("adicionar_aresta", u, v, peso)
+    return None
+
+
+# Distâncias e caminhos de todos os pares de um motor contra o Dijkstra do networkx
+def _comparar_distancias(H, motor):
+    for s, esperadas in nx.all_pairs_dijkstra_path_length(H, weight='weight'):
+        for t in H:
+            esperada, obtida = esperadas.get(t, float('inf')), motor.distancia(s, t)
+            if obtida != esperada:
+                return f"distância de {s} a {t}: esperada {esperada}, obtida {obtida}"
+            if esperada < float('inf'):
+                caminho = motor.shortest_path(s, t)
+                if caminho[0] != s or caminho[-1] != t or any(not H.has_edge(u, v) for u, v in zip(caminho, caminho[1:])):
+                    return f"caminho inválido de {s} a {t}: {caminho}"
+                if _custo(H, caminho) != esperada:
+                    return f"caminho {caminho} custa {_custo(H, caminho)}, a distância é {esperada}"
+    return None
+
+
+# RotasDinamicas: depois de cada edição de vértice ou aresta, D e P batem com o networkx
+def verificar_rotas_dinamicas(G):
+    rng = _sorteio(G)
+    rotas = RotasDinamicas.from_networkx(G)
+    for _ in range(6):
+        problema = _comparar_distancias(G, rotas)
+        if problema:
+            return problema
+        operacao = _editar(G, rng)
+        if operacao is not None:
+            getattr(rotas, operacao[0])(*operacao[1:])
+    return _comparar_distancias(G, rotas)
+
+
+def _comparar_componentes(H, indice):
+    esperadas = {frozenset(c) for c in nx.connected_components(H)}
+    obtidas = {frozenset(membros) for membros in indice.membros.values()}
+    if obtidas != esperadas:
+        return f"componentes esperadas {sorted(map(sorted, esperadas))}, obtidas {sorted(map(sorted, obtidas))}"
+    if set(indice.rotulo) != set(H) or any(nome not in indice.componente(nome) for nome in H):
+        return "rótulos fora de sincronia com as componentes"
+    if indice.numero_componentes() != nx.number_connected_components(H):
+        return f"numero_componentes: esperado {nx.number_connected_components(H)}, obtido {indice.numero_componentes()}"
+    return None
+
+
+# IndiceComponentes: depois de cada edição, as componentes são as do networkx
+def verificar_componentes(G):
+    rng = _sorteio(G)
+    indice = IndiceComponentes.from_networkx(G)
+    for _ in range(8):
+        problema = _comparar_componentes(G, indice)
+        if problema:
+            return problema
+        operacao = _editar(G, rng)
+        if operacao is None:
+            continue
+        if operacao[0] == "adicionar_no":
+            indice.adicionar_no(operacao[1], [vizinho for vizinho, _ in operacao[2]])
+        elif operacao[0] == "adicionar_aresta":
+            indice.adicionar_aresta(operacao[1], operacao[2])
+        else:
+            getattr(indice, operacao[0])(*operacao[1:])
+    return _comparar_componentes(G, indice)
+
+
+# Criticidade: intermediação do networkx e o efeito de cada remoção refeito no networkx
+def verificar_criticidade(G):
+    rng = _sorteio(G)
+    combustivel = float(rng.choice(COMBUSTIVEIS))
+    rotas = RotasDinamicas.from_networkx(G)
+    tabela = analisar_criticidade(rotas, combustivel, processos=1).set_index("vertice")
+    intermediacao = nx.betweenness_centrality(G, weight='weight')
+    antes = dict(nx.all_pairs_dijkstra_path_length(G, weight='weight'))
+    for x in G:
+        H = G.copy()
+        H.remove_node(x)
+        depois = dict(nx.all_pairs_dijkstra_path_length(H, weight='weight'))
+        esperado = {"pares_desconectados": 0, "pares_inviaveis": 0, "aumento_distancia": 0.0}
+        for a, b in itertools.combinations(H, 2):
+            if b not in antes[a]:
+                continue
+            if b not in depois[a]:
+                esperado["pares_desconectados"] += 1
+                continue
+            esperado["aumento_distancia"] += depois[a][b] - antes[a][b]
+            esperado["pares_inviaveis"] += antes[a][b] <= combustivel < depois[a][b]
+        linha = tabela.loc[x]
+        for chave, valor in esperado.items():
+            if linha[chave] != valor:
+                return f"{chave} de {x} (combustível {combustivel}): esperado {valor}, obtido {linha[chave]}"
+        if prever_remocao(rotas, x, combustivel) != esperado:
+            return f"prever_remocao de {x}: esperado {esperado}, obtido {prever_remocao(rotas, x, combustivel)}"
+        if abs(linha["intermediacao"] - intermediacao[x]) > 1e-9:
+            return f"intermediação de {x}: esperada {intermediacao[x]}, obtida {linha['intermediacao']}"
+    return None
+
+
+# Hierarquia de contração com os limites normais, com núcleo parcial e toda no núcleo
+def verificar_hierarquia(G):
+    grafo = GrafoCSR.from_networkx(G)
+    for grau_nucleo, nucleo_minimo in ((None, None), (2, 0), (0, 0)):
+        limites = {} if grau_nucleo is None else {"grau_nucleo": grau_nucleo, "nucleo_minimo": nucleo_minimo}
+        problema = _comparar_distancias(G, HierarquiaContracao.construir(grafo, **limites))
+        if problema:
+            return f"{problema} (limites {limites or 'padrão'})"
+    return None
+
+
+# Catálogo montado com as arestas do caso mais linhas repetidas (nos dois sentidos, com outras
+# distâncias) e laços: cada par fica com a sua primeira linha, igual nos dois sentidos
+def verificar_catalogo(G):
+    rng = _sorteio(G)
+    nomes = list(G)
+    linhas = list(G.edges(data='weight'))
+    for u, v, peso in list(linhas):
+        if rng.random() < 0.5:
+            linhas.append((v, u, peso + rng.randint(1, 10)) if rng.random() < 0.7 else (u, v, peso + 1))
+    for u in rng.sample(nomes, min(len(nomes), 2)):
+        linhas.append((u, u, rng.randint(1, 10)))
+    rng.shuffle(linhas)
+    esperado = {}
+    for u, v, peso in linhas:
+        esperado.setdefault(frozenset((u, v)), peso)
+
+    ids = {nome: i for i, nome in enumerate(nomes)}
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as pasta:
+        catalogo = CatalogoDistancias.construir(pasta, nomes, [ids[u] for u, _, _ in linhas], [ids[v] for _, v, _ in linhas],
+                                                [peso for _, _, peso in linhas])
+        if len(catalogo) != len(esperado):
+            return f"{len(catalogo)} pares no catálogo, esperados {len(esperado)}"
+        for u in nomes:
+            for v in nomes:
+                peso = esperado.get(frozenset((u, v)))
+                if catalogo.distancia(u, v) != peso or catalogo.distancia(v, u) != peso:
+                    return (f"distância {u}-{v}: esperada {peso} nos dois sentidos, obtida {catalogo.distancia(u, v)} "
+                            f"e {catalogo.distancia(v, u)} (linhas {linhas})")
+            vizinhos = {(v, esperado[frozenset((u, v))]) for v in nomes if frozenset((u, v)) in esperado}
+            if set(catalogo.vizinhos_de(u)) != vizinhos:
+                return f"vizinhos de {u}: esperados {sorted(vizinhos)}, obtidos {catalogo.vizinhos_de(u)}"
+    return None
+
+
+# Todas as rotas da origem ao destino que não repetem um vértice com as mesmas estações usadas;
+# qualquer outra rota tem um ciclo sem recarga nova e é dominada pela mesma rota sem ele
+def _rotas_exaustivas(G, origem, destino):
+    rotas = []
+    caminho = [origem]
+    estados = {(origem, frozenset())}
+
+    def visitar(usadas):
+        u = caminho[-1]
+        if u == destino:
+            rotas.append(list(caminho))
+        for v in G[u]:
+            novas = usadas
+            if (e_estacao(u) and u not in usadas) or (e_estacao(v) and v not in usadas):
+                novas = usadas | {u if e_estacao(u) else v}
+            if (v, novas) in estados:
+                continue
+            estados.add((v, novas))
+            caminho.append(v)
+            visitar(novas)
+            caminho.pop()
+            estados.discard((v, novas))
+
+    visitar(frozenset())
+    return rotas
+
+
+# Distância, menor combustível e exposição de uma rota, simulada por planejar_viagem (None se não chega)
+def _medir_rota(G, caminho, combustivel, mes):
+    viagem = planejar_viagem(MotorCaminhoFixo(G, caminho), caminho[0], caminho[-1], "Nenhuma", combustivel, mes)
+    if viagem["status"] != "concluida":
+        return None
+    minimo = min(e["combustivel"] for e in viagem["eventos"] if e["tipo"] in ("inicio", "trecho"))
+    return (_custo(G, caminho), minimo, sum(nome in corpos_de_risco(mes) for nome in caminho[1:]))
+
+
+# rotas_pareto: a fronteira é a das rotas exaustivas, e cada rota mede o que diz. A busca exaustiva
+# cresce rápido com as estações, então só entram até 6 vértices do grafo
+def verificar_pareto(G):
+    rng = _sorteio(G)
+    G = G.subgraph(rng.sample(list(G), min(len(G), 6))).copy()
+    nomes = list(G)
+    for _ in range(3):
+        origem, destino = rng.choice(nomes), rng.choice(nomes)
+        combustivel, mes = float(rng.choice(COMBUSTIVEIS)), rng.choice(meses_do_ano)
+        medidas = [m for m in (_medir_rota(G, c, combustivel, mes) for c in _rotas_exaustivas(G, origem, destino)) if m]
+        esperada = {m for m in medidas if not any(o != m and o[0] <= m[0] and o[1] >= m[1] and o[2] <= m[2] for o in medidas)}
+
+        obtida = set()
+        for rota in rotas_pareto(GrafoCSR.from_networkx(G), origem, destino, combustivel, mes):
+            caminho = rota["caminho"]
+            if caminho[0] != origem or caminho[-1] != destino or any(not G.has_edge(u, v) for u, v in zip(caminho, caminho[1:])):
+                return f"rota inválida de {origem} a {destino}: {caminho}"
+            medida = _medir_rota(G, caminho, combustivel, mes)
+            if medida != (rota["distancia"], rota["combustivel_minimo"], rota["exposicao"]):
+                return f"rota {caminho} ({combustivel}, {mes}): medida {medida}, informada {rota}"
+            obtida.add(medida)
+        if obtida != esperada:
+            return f"fronteira de {origem} a {destino} ({combustivel}, {mes}): esperada {sorted(esperada)}, obtida {sorted(obtida)}"
+    return None
+
+
+# Verificações dos algoritmos contra o networkx, feitas sobre o grafo inicial de cada caso
+VERIFICACOES = {
+    "rotas_dinamicas": verificar_rotas_dinamicas,
+    "indice_componentes": verificar_componentes,
+    "criticidade": verificar_criticidade,
+    "hierarquia_contracao": verificar_hierarquia,
+    "catalogo": verificar_catalogo,
+    "pareto": verificar_pareto,
+}
+
+
+# Função para executar uma verificação no grafo de um caso; devolve (-1, problema) se algo diverge
+def verificar_caso(caso, verificacao):
+    try:
+        problema = verificacao(montar_grafo(caso))
+    except Exception as e:
+        problema = f"exceção: {e!r}"
+    return None if problema is None else (-1, problema)
+
+
+def _executor(nome):
+    if nome in VERIFICACOES:
+        return lambda caso: verificar_caso(caso, VERIFICACOES[nome])
+    return lambda caso: executar_caso(caso, MOTORES[nome])
+
+
+# Função para reduzir um caso com falha ao menor caso que ainda falha
+def reduzir(caso, executar):
+    falha = executar(caso)
+    if falha is None:
+        return caso
+    caso = dict(caso, ops=caso["ops"][:falha[0] + 1])
+
+    def sem_item(caso, campo, i):
+        reduzido = dict(caso, **{campo: caso[campo][:i] + caso[campo][i + 1:]})
+        if campo == "nos":
+            removido = caso["nos"][i]
+            reduzido["arestas"] = [a for a in caso["arestas"] if removido not in a[:2]]
+        return reduzido
+
+    mudou = True
+    while mudou:
+        mudou = False
+        for campo in ("ops", "nos", "arestas"):
+            i = 0
+            while i < len(caso[campo]):
+                candidato = sem_item(caso, campo, i)
+                if executar(candidato) is not None:
+                    caso = candidato
+                    mudou = True
+                else:
+                    i += 1
+    return caso
+
+
+# Função para rodar muitos casos aleatórios contra os motores e verificações escolhidos
+def rodar(casos=2000, seed=0, motores=None):
+    motores = motores or list(MOTORES) + list(VERIFICACOES)
+    rng = random.Random(seed)
+    falhas = []
+    for numero in range(casos):
+        caso = gerar_caso(rng)
+        for nome in motores:
+            executar = _executor(nome)
+            falha = executar(caso)
+            if falha is not None:
+                minimo = reduzir(caso, executar)
+                falhas.append({"motor": nome, "caso": numero, "problema": executar(minimo)[1], "minimo": minimo})
+    return falhas
+
+
+# Uso: python fuzz_rotas.py [casos] [seed] [motor|verificação ...]
+if __name__ == "__main__":
+    casos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    motores = sys.argv[3:] or None
+
+    inicio = time.perf_counter()
+    falhas = rodar(casos, seed, motores)
+    duracao = time.perf_counter() - inicio
+
+    print(f"{casos} casos em {duracao:.1f} s ({casos * 60 / duracao:.0f} casos/min), {len(falhas)} falha(s)")
+    for falha in falhas:
+        print(f"\nMotor {falha['motor']}, caso {falha['caso']}: {falha['problema']}")
+        print(f"  nós: {falha['minimo']['nos']}")
+        print(f"  arestas: {falha['minimo']['arestas']}")
+        for op in falha['minimo']['ops']:
+            print(f"  {op}")
+    sys.exit(1 if falhas else 0)
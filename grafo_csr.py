@@ -0,0 +1,362 @@
+import sys
+import time
+import heapq
+import random
+from collections import deque
+
+import numpy as np
+import networkx as nx
+
+from carregador_csv import ler_conexoes_csv
+
+
+class GrafoCSR:
+    """
+    Grafo não direcionado compacto: os nomes dos vértices são internados em índices
+    inteiros e a adjacência fica em três vetores (offsets, vizinhos e pesos em float32).
+    Os vizinhos do vértice i estão em vizinhos[offsets[i]:offsets[i + 1]], ordenados.
+    """
+
+    def __init__(self, nomes, offsets, vizinhos, pesos):
+        self.nomes = list(nomes)
+        self.indices = {nome: i for i, nome in enumerate(self.nomes)}
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        self.vizinhos = np.ascontiguousarray(vizinhos, dtype=np.int32)
+        self.pesos = np.ascontiguousarray(pesos, dtype=np.float32)
+        # memoryview devolve escalares Python sem o custo de indexar o numpy elemento a elemento
+        self._off = memoryview(self.offsets)
+        self._viz = memoryview(self.vizinhos)
+        self._pes = memoryview(self.pesos)
+
+    # Função para montar o grafo a partir de uma lista de arestas (u, v, peso) com nomes
+    @classmethod
+    def de_arestas(cls, nomes, arestas):
+        nomes = list(nomes)
+        indices = {nome: i for i, nome in enumerate(nomes)}
+        for u, v, _ in arestas:
+            for nome in (u, v):
+                if nome not in indices:
+                    indices[nome] = len(nomes)
+                    nomes.append(nome)
+
+        origens = np.fromiter((indices[u] for u, _, _ in arestas), dtype=np.int64, count=len(arestas))
+        destinos = np.fromiter((indices[v] for _, v, _ in arestas), dtype=np.int64, count=len(arestas))
+        pesos = np.fromiter((w for _, _, w in arestas), dtype=np.float32, count=len(arestas))
+        return cls.de_indices(nomes, origens, destinos, pesos)
+
+    # Função para montar o grafo a partir de vetores de índices (caminho rápido para redes grandes)
+    @classmethod
+    def de_indices(cls, nomes, origens, destinos, pesos):
+        n = len(nomes)
+        origens = np.asarray(origens, dtype=np.int64)
+        destinos = np.asarray(destinos, dtype=np.int64)
+        pesos = np.asarray(pesos, dtype=np.float32)
+
+        # Cada aresta aparece nos dois sentidos; laços aparecem uma vez só, como no networkx
+        sem_laco = origens != destinos
+        u = np.concatenate([origens, destinos[sem_laco]])
+        v = np.concatenate([destinos, origens[sem_laco]])
+        w = np.concatenate([pesos, pesos[sem_laco]])
+
+        # Ordenar por (u, v) e manter a última ocorrência de arestas repetidas
+        chaves = u * max(n, 1) + v
+        ordem = np.argsort(chaves, kind='stable')
+        chaves = chaves[ordem]
+        ultima = np.ones(len(chaves), dtype=bool)
+        ultima[:-1] = chaves[:-1] != chaves[1:]
+        ordem = ordem[ultima]
+
+        u, v, w = u[ordem], v[ordem], w[ordem]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(u, minlength=n), out=offsets[1:])
+        return cls(nomes, offsets, v, w)
+
+    @classmethod
+    def from_networkx(cls, G):
+        arestas = [(u, v, d.get('weight', 1)) for u, v, d in G.edges(data=True)]
+        return cls.de_arestas(G.nodes(), arestas)
+
+    @classmethod
+    def from_csv(cls, file_path, valid_planets, distances):
+        nos, arestas, erros = ler_conexoes_csv(file_path, valid_planets, distances)
+        return cls.de_arestas(nos, arestas), erros
+
+    # Função para converter de volta ao networkx (usado apenas para desenhar)
+    def para_networkx(self):
+        G = nx.Graph()
+        G.add_nodes_from(self.nomes)
+        for u in range(len(self.nomes)):
+            for k in range(self._off[u], self._off[u + 1]):
+                v = self._viz[k]
+                if v >= u:
+                    G.add_edge(self.nomes[u], self.nomes[v], weight=self._pes[k])
+        return G
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def __contains__(self, nome):
+        return nome in self.indices
+
+    def numero_arestas(self):
+        return (len(self.vizinhos) + len(self.lacos())) // 2
+
+    def nbytes(self):
+        return self.offsets.nbytes + self.vizinhos.nbytes + self.pesos.nbytes
+
+    def vizinhos_de(self, nome):
+        i = self.indices[nome]
+        return [self.nomes[v] for v in self.vizinhos[self.offsets[i]:self.offsets[i + 1]]]
+
+    def peso(self, u, v):
+        i, j = self.indices[u], self.indices[v]
+        inicio, fim = self._off[i], self._off[i + 1]
+        k = inicio + int(np.searchsorted(self.vizinhos[inicio:fim], j))
+        if k < fim and self._viz[k] == j:
+            return float(self._pes[k])
+        return None
+
+    def tem_aresta(self, u, v):
+        return u in self.indices and v in self.indices and self.peso(u, v) is not None
+
+    # Grau no mesmo sentido do networkx (um laço conta duas vezes)
+    def graus(self):
+        graus = np.diff(self.offsets)
+        linhas = np.repeat(np.arange(len(self.nomes)), graus)
+        graus = graus.copy()
+        np.add.at(graus, linhas[linhas == self.vizinhos], 1)
+        return graus
+
+    def lacos(self):
+        linhas = np.repeat(np.arange(len(self.nomes)), np.diff(self.offsets))
+        return [(self.nomes[i], self.nomes[i]) for i in linhas[linhas == self.vizinhos]]
+
+    def matriz_adjacencia(self):
+        n = len(self.nomes)
+        matriz = np.zeros((n, n))
+        linhas = np.repeat(np.arange(n), np.diff(self.offsets))
+        matriz[linhas, self.vizinhos] = self.pesos
+        return matriz
+
+    # Função para rotular as componentes conexas com uma busca em largura
+    def componentes(self):
+        n = len(self.nomes)
+        rotulos = [-1] * n
+        atual = 0
+        for inicio in range(n):
+            if rotulos[inicio] != -1:
+                continue
+            rotulos[inicio] = atual
+            fila = deque([inicio])
+            while fila:
+                u = fila.popleft()
+                for k in range(self._off[u], self._off[u + 1]):
+                    v = self._viz[k]
+                    if rotulos[v] == -1:
+                        rotulos[v] = atual
+                        fila.append(v)
+            atual += 1
+        return np.array(rotulos, dtype=np.int32)
+
+    def is_connected(self):
+        if len(self.nomes) == 0:
+            raise nx.NetworkXPointlessConcept("Connectivity is undefined for the null graph.")
+        return int(self.componentes().max()) == 0
+
+    # Existe ciclo se houver laço ou mais arestas do que numa floresta com as mesmas componentes
+    def tem_ciclo(self):
+        if self.lacos():
+            return True
+        if len(self.nomes) == 0:
+            return False
+        return self.numero_arestas() > len(self.nomes) - (int(self.componentes().max()) + 1)
+
+    # Dijkstra sobre índices; para cedo ao fixar o destino, se houver
+    def dijkstra(self, origem, destino=None):
+        n = len(self.nomes)
+        off, viz, pes = self._off, self._viz, self._pes
+        dist = [float('inf')] * n
+        pred = [-1] * n
+        fixado = [False] * n
+        dist[origem] = 0.0
+        heap = [(0.0, origem)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if fixado[u]:
+                continue
+            fixado[u] = True
+            if u == destino:
+                break
+            for k in range(off[u], off[u + 1]):
+                v = viz[k]
+                nd = d + pes[k]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    pred[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return dist, pred
+
+    def shortest_path(self, source, target):
+        for nome in (source, target):
+            if nome not in self.indices:
+                raise nx.NodeNotFound(f"Source {nome} is not in G")
+        origem, destino = self.indices[source], self.indices[target]
+        dist, pred = self.dijkstra(origem, destino)
+        if dist[destino] == float('inf'):
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        caminho = [destino]
+        while caminho[-1] != origem:
+            caminho.append(pred[caminho[-1]])
+        return [self.nomes[i] for i in reversed(caminho)]
+
+    # Rota completa com parada opcional, como em show_shortest_path
+    def rota(self, origem, destino, parada=None):
+        if parada and parada != "Nenhuma" and parada in self.indices:
+            path1 = self.shortest_path(origem, parada)
+            path2 = self.shortest_path(parada, destino)
+            return path1[:-1] + path2
+        return self.shortest_path(origem, destino)
+
+    # Dijkstra que ignora alguns vértices e arestas (usado para gerar rotas alternativas)
+    def _caminho_restrito(self, origem, destino, nos_bloqueados, arestas_bloqueadas):
+        off, viz, pes = self._off, self._viz, self._pes
+        dist = {origem: 0.0}
+        pred = {origem: -1}
+        fixados = set()
+        heap = [(0.0, origem)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in fixados:
+                continue
+            fixados.add(u)
+            if u == destino:
+                caminho = [destino]
+                while pred[caminho[-1]] != -1:
+                    caminho.append(pred[caminho[-1]])
+                return d, caminho[::-1]
+            for k in range(off[u], off[u + 1]):
+                v = viz[k]
+                if v in nos_bloqueados or (u, v) in arestas_bloqueadas:
+                    continue
+                nd = d + pes[k]
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    pred[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return None
+
+    def _custo(self, caminho):
+        total = 0.0
+        for u, v in zip(caminho, caminho[1:]):
+            inicio, fim = self._off[u], self._off[u + 1]
+            total += self._pes[inicio + int(np.searchsorted(self.vizinhos[inicio:fim], v))]
+        return total
+
+    # Até k rotas simples em ordem crescente de distância (algoritmo de Yen)
+    def caminhos_alternativos(self, source, target, k):
+        primeiro = [self.indices[nome] for nome in self.shortest_path(source, target)]
+        escolhidos = [primeiro]
+        candidatos = []
+        vistos = {tuple(primeiro)}
+        while len(escolhidos) < k:
+            anterior = escolhidos[-1]
+            for i in range(len(anterior) - 1):
+                raiz = anterior[:i + 1]
+                arestas_bloqueadas = set()
+                for caminho in escolhidos:
+                    if caminho[:i + 1] == raiz and len(caminho) > i + 1:
+                        arestas_bloqueadas.add((caminho[i], caminho[i + 1]))
+                        arestas_bloqueadas.add((caminho[i + 1], caminho[i]))
+                trecho = self._caminho_restrito(raiz[-1], anterior[-1], set(raiz[:-1]), arestas_bloqueadas)
+                if trecho is None:
+                    continue
+                candidato = raiz[:-1] + trecho[1]
+                if tuple(candidato) not in vistos:
+                    vistos.add(tuple(candidato))
+                    heapq.heappush(candidatos, (self._custo(candidato), candidato))
+            if not candidatos:
+                break
+            escolhidos.append(heapq.heappop(candidatos)[1])
+        return [[self.nomes[i] for i in caminho] for caminho in escolhidos]
+
+    def distancias_de(self, origem):
+        dist, _ = self.dijkstra(self.indices[origem])
+        return np.array(dist)
+
+    # Matriz de distâncias de todos os pares (uma busca por origem)
+    def distancias_todos_pares(self):
+        return np.array([self.dijkstra(i)[0] for i in range(len(self.nomes))])
+
+
+# Função para estimar a memória ocupada pelo dicionário de dicionários do networkx
+def memoria_networkx(G):
+    vistos = set()
+
+    def tamanho(obj):
+        if id(obj) in vistos:
+            return 0
+        vistos.add(id(obj))
+        total = sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            for chave, valor in obj.items():
+                total += tamanho(chave) + tamanho(valor)
+        return total
+
+    return tamanho(G._adj) + tamanho(G._node)
+
+
+# Função para gerar uma rede sintética grande com nomes no estilo do projeto
+def rede_sintetica(n, grau_medio=4, seed=42):
+    rng = random.Random(seed)
+    G = nx.Graph()
+    G.add_nodes_from(f"Corpo_{i}" for i in range(n))
+    for i in range(1, n):
+        G.add_edge(f"Corpo_{i}", f"Corpo_{rng.randrange(i)}", weight=rng.randint(10, 5000))
+    for _ in range(n * (grau_medio - 2) // 2):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v:
+            G.add_edge(f"Corpo_{u}", f"Corpo_{v}", weight=rng.randint(10, 5000))
+    return G
+
+
+# Função para comparar memória e velocidade de busca entre o networkx e o CSR
+def benchmark(G, consultas=20, seed=0):
+    rng = random.Random(seed)
+    nomes = list(G.nodes())
+    pares = [(rng.choice(nomes), rng.choice(nomes)) for _ in range(consultas)]
+
+    inicio = time.perf_counter()
+    grafo = GrafoCSR.from_networkx(G)
+    tempo_construcao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for origem, _ in pares:
+        nx.single_source_dijkstra_path_length(G, origem, weight='weight')
+    tempo_nx = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for origem, _ in pares:
+        grafo.dijkstra(grafo.indices[origem])
+    tempo_csr = time.perf_counter() - inicio
+
+    memoria_nomes = sum(sys.getsizeof(nome) for nome in grafo.nomes) + sys.getsizeof(grafo.indices)
+    return {
+        "nos": len(grafo),
+        "arestas": grafo.numero_arestas(),
+        "memoria_networkx": memoria_networkx(G),
+        "memoria_csr": grafo.nbytes() + memoria_nomes,
+        "tempo_construcao_csr": tempo_construcao,
+        "tempo_busca_networkx": tempo_nx,
+        "tempo_busca_csr": tempo_csr,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    resultado = benchmark(rede_sintetica(n))
+    print(f"Rede sintética: {resultado['nos']} vértices, {resultado['arestas']} arestas")
+    print(f"Memória networkx: {resultado['memoria_networkx'] / 2**20:.1f} MiB")
+    print(f"Memória CSR:      {resultado['memoria_csr'] / 2**20:.1f} MiB")
+    print(f"Construção do CSR: {resultado['tempo_construcao_csr']:.3f} s")
+    print(f"Dijkstra networkx: {resultado['tempo_busca_networkx']:.3f} s")
+    print(f"Dijkstra CSR:      {resultado['tempo_busca_csr']:.3f} s")
@@ -0,0 +1,347 @@
+import os
+import sys
+import time
+import heapq
+import random
+import hashlib
+
+import numpy as np
+import networkx as nx
+
+from grafo_csr import GrafoCSR
+from catalogo import abrir_catalogo
+
+
+# Quantos vértices a busca de testemunha pode fixar antes de desistir (e criar o atalho)
+MAX_TESTEMUNHA = 60
+# Quando o grau médio do que resta passa disso (e ainda resta muito), o resto vira um núcleo sem contração
+GRAU_NUCLEO = 12
+NUCLEO_MINIMO = 1000
+VERSAO_INDICE = 1
+
+
+# Assinatura do grafo: muda sempre que muda um vértice, uma aresta ou um peso
+def assinatura(grafo):
+    h = hashlib.sha256()
+    h.update("\n".join(grafo.nomes).encode("utf-8"))
+    for arr in (grafo.offsets, grafo.vizinhos, grafo.pesos):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()
+
+
+# Arquivo do índice ao lado da rede: rede.csv -> rede.ch.npz
+def caminho_indice(csv_path):
+    return os.path.splitext(csv_path)[0] + ".ch.npz"
+
+
+# Busca de testemunha: distâncias a partir de u sem passar por v, até o limite ou MAX_TESTEMUNHA vértices
+def _testemunha(adj, u, v, limite):
+    dist = {u: 0.0}
+    heap = [(0.0, u)]
+    fixados = 0
+    while heap and fixados < MAX_TESTEMUNHA:
+        d, x = heapq.heappop(heap)
+        if d > dist[x]:
+            continue
+        if d > limite:
+            break
+        fixados += 1
+        for y, (w, _) in adj[x].items():
+            if y != v and d + w < dist.get(y, float('inf')):
+                dist[y] = d + w
+                heapq.heappush(heap, (d + w, y))
+    return dist
+
+
+# Atalhos necessários para contrair v: pares de vizinhos sem caminho tão curto que evite v
+def _atalhos(adj, v):
+    vizinhos = list(adj[v].items())
+    atalhos = []
+    for i, (u, (wu, _)) in enumerate(vizinhos):
+        if i == len(vizinhos) - 1:
+            break
+        limite = wu + max(w for _, (w, _) in vizinhos[i + 1:])
+        dist = _testemunha(adj, u, v, limite)
+        for x, (wx, _) in vizinhos[i + 1:]:
+            if dist.get(x, float('inf')) > wu + wx:
+                atalhos.append((u, x, wu + wx))
+    return atalhos
+
+
+class HierarquiaContracao:
+    """
+    Hierarquia de contração de um GrafoCSR. Cada vértice recebe um nível; o grafo de subida
+    guarda, para cada vértice, as arestas (originais ou atalhos) para vértices de nível maior,
+    com o vértice do meio de cada atalho. Em redes muito densas a contração para num núcleo,
+    cujas arestas ficam nos dois sentidos. Uma consulta é um Dijkstra bidirecional no grafo
+    de subida e o caminho é desempacotado trocando cada atalho pelas duas arestas que ele junta.
+    Compensa em redes espaciais (vizinhos próximos, como um mapa); em redes aleatórias quase
+    tudo acaba no núcleo e o Dijkstra do GrafoCSR é mais rápido.
+    """
+
+    def __init__(self, grafo, nivel, offsets, vizinhos, pesos, meio, nucleo):
+        self.grafo = grafo
+        self.nomes = grafo.nomes
+        self.indices = grafo.indices
+        self.nivel = nivel
+        self.offsets = offsets
+        self.vizinhos = vizinhos
+        self.pesos = pesos
+        self.meio = meio
+        # Primeiro nível do núcleo (igual ao número de vértices quando tudo foi contraído)
+        self.nucleo = int(nucleo)
+        self._off = memoryview(offsets)
+        self._viz = memoryview(vizinhos)
+        self._pes = memoryview(pesos)
+        self._niv = memoryview(nivel)
+        self._meios = None
+
+    @classmethod
+    def construir(cls, grafo, grau_nucleo=GRAU_NUCLEO, nucleo_minimo=NUCLEO_MINIMO):
+        n = len(grafo)
+        adj = [dict() for _ in range(n)]
+        for u in range(n):
+            for k in range(grafo._off[u], grafo._off[u + 1]):
+                v = grafo._viz[k]
+                if v != u:
+                    adj[u][v] = (float(grafo._pes[k]), -1)
+
+        # Prioridade: atalhos criados menos arestas removidas, mais vizinhos já contraídos e profundidade
+        contraidos_vizinhos = [0] * n
+        profundidade = [0] * n
+
+        def prioridade(v):
+            return len(_atalhos(adj, v)) - len(adj[v]) + contraidos_vizinhos[v] + profundidade[v]
+
+        arestas = sum(len(vizinhos) for vizinhos in adj) // 2
+        if n > nucleo_minimo and 2 * arestas > grau_nucleo * n:
+            # Densa demais desde o início: tudo fica no núcleo, sem calcular prioridade nenhuma
+            heap = [(0, v) for v in range(n)]
+        else:
+            heap = [(prioridade(v), v) for v in range(n)]
+            heapq.heapify(heap)
+        nivel = np.zeros(n, dtype=np.int32)
+        subida = [[] for _ in range(n)]
+        proximo = 0
+        while heap:
+            if len(heap) > nucleo_minimo and 2 * arestas > grau_nucleo * len(heap):
+                break
+            _, v = heapq.heappop(heap)
+            # Atualização preguiçosa: se piorou, volta para a fila
+            atual = prioridade(v)
+            if heap and atual > heap[0][0]:
+                heapq.heappush(heap, (atual, v))
+                continue
+
+            nivel[v] = proximo
+            proximo += 1
+            for u, (w, m) in adj[v].items():
+                subida[v].append((u, w, m))
+            for u, x, w in _atalhos(adj, v):
+                arestas += x not in adj[u]
+                for a, b in ((u, x), (x, u)):
+                    if b not in adj[a] or adj[a][b][0] > w:
+                        adj[a][b] = (w, v)
+            for u in adj[v]:
+                del adj[u][v]
+                contraidos_vizinhos[u] += 1
+                profundidade[u] = max(profundidade[u], profundidade[v] + 1)
+            arestas -= len(adj[v])
+            adj[v] = {}
+
+        # Núcleo: os vértices restantes ficam no topo e guardam todas as arestas entre si
+        nucleo = proximo
+        for _, v in sorted(heap):
+            nivel[v] = proximo
+            proximo += 1
+            for u, (w, m) in adj[v].items():
+                subida[v].append((u, w, m))
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(s) for s in subida])
+        vizinhos = np.empty(offsets[-1], dtype=np.int32)
+        pesos = np.empty(offsets[-1], dtype=np.float64)
+        meio = np.empty(offsets[-1], dtype=np.int32)
+        for v, arestas in enumerate(subida):
+            arestas.sort()
+            inicio = offsets[v]
+            for i, (u, w, m) in enumerate(arestas):
+                vizinhos[inicio + i], pesos[inicio + i], meio[inicio + i] = u, w, m
+        return cls(grafo, nivel, offsets, vizinhos, pesos, meio, nucleo)
+
+    # Função para gravar o índice junto com a assinatura do grafo
+    def salvar(self, caminho):
+        with open(caminho, "wb") as arquivo:
+            np.savez(arquivo, versao=VERSAO_INDICE, assinatura=assinatura(self.grafo), nivel=self.nivel,
+                     offsets=self.offsets, vizinhos=self.vizinhos, pesos=self.pesos, meio=self.meio, nucleo=self.nucleo)
+
+    # Função para ler um índice salvo; devolve None se ele não corresponde mais ao grafo
+    @classmethod
+    def carregar(cls, grafo, caminho):
+        if not os.path.exists(caminho):
+            return None
+        with np.load(caminho) as dados:
+            if int(dados["versao"]) != VERSAO_INDICE or str(dados["assinatura"]) != assinatura(grafo):
+                return None
+            return cls(grafo, dados["nivel"], dados["offsets"], dados["vizinhos"], dados["pesos"], dados["meio"], dados["nucleo"])
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def __contains__(self, nome):
+        return nome in self.indices
+
+    def peso(self, u, v):
+        return self.grafo.peso(u, v)
+
+    def numero_atalhos(self):
+        return int(np.sum(self.meio >= 0))
+
+    # Dijkstra bidirecional no grafo de subida; devolve (distância, vértice de encontro, predecessores)
+    def _buscar(self, s, t):
+        off, viz, pes = self._off, self._viz, self._pes
+        nivel, nucleo = self._niv, self.nucleo
+        dist = ({s: 0.0}, {t: 0.0})
+        pred = ({s: -1}, {t: -1})
+        heaps = ([(0.0, s)], [(0.0, t)])
+        melhor, encontro = (0.0, s) if s == t else (float('inf'), -1)
+        lado = 0
+        while heaps[0] or heaps[1]:
+            if not heaps[lado] or (heaps[1 - lado] and heaps[1 - lado][0][0] < heaps[lado][0][0]):
+                lado = 1 - lado
+            d, u = heapq.heappop(heaps[lado])
+            if d > dist[lado][u]:
+                continue
+            if d >= melhor:
+                # Nada que sai deste lado melhora; o outro lado ainda pode
+                heaps[lado].clear()
+                continue
+            # Parada sob demanda: se um vizinho de nível maior já chega a u por menos, u não está no caminho
+            if nivel[u] < nucleo and any(dist[lado].get(viz[k], float('inf')) + pes[k] < d for k in range(off[u], off[u + 1])):
+                continue
+            outro = dist[1 - lado].get(u)
+            if outro is not None and d + outro < melhor:
+                melhor, encontro = d + outro, u
+            for k in range(off[u], off[u + 1]):
+                v = viz[k]
+                nd = d + pes[k]
+                if nd < dist[lado].get(v, float('inf')):
+                    dist[lado][v] = nd
+                    pred[lado][v] = u
+                    heapq.heappush(heaps[lado], (nd, v))
+                    outro = dist[1 - lado].get(v)
+                    if outro is not None and nd + outro < melhor:
+                        melhor, encontro = nd + outro, v
+        return melhor, encontro, pred
+
+    # Vértice do meio de cada atalho, por par (menor, maior); montado na primeira consulta
+    def _mapa_meios(self):
+        if self._meios is None:
+            origem = np.repeat(np.arange(len(self.nomes), dtype=np.int64), np.diff(self.offsets))
+            atalhos = np.flatnonzero(self.meio >= 0)
+            a, b = origem[atalhos], self.vizinhos[atalhos].astype(np.int64)
+            chaves = (np.minimum(a, b) << 32) | np.maximum(a, b)
+            self._meios = dict(zip(chaves.tolist(), self.meio[atalhos].tolist()))
+        return self._meios
+
+    def _desempacotar(self, caminho):
+        meios = self._mapa_meios()
+        completo = [caminho[0]]
+        # A pilha começa com a última aresta no fundo, para desempacotar na ordem do caminho
+        pilha = list(zip(caminho[:-1], caminho[1:]))[::-1]
+        while pilha:
+            a, b = pilha.pop()
+            m = meios.get((min(a, b) << 32) | max(a, b), -1)
+            if m == -1:
+                completo.append(b)
+            else:
+                pilha.append((m, b))
+                pilha.append((a, m))
+        return completo
+
+    def distancia(self, origem, destino):
+        return self._buscar(self.indices[origem], self.indices[destino])[0]
+
+    def shortest_path(self, source, target):
+        for nome in (source, target):
+            if nome not in self.indices:
+                raise nx.NodeNotFound(f"Source {nome} is not in G")
+        s, t = self.indices[source], self.indices[target]
+        melhor, encontro, pred = self._buscar(s, t)
+        if melhor == float('inf'):
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        ida = [encontro]
+        while pred[0][ida[-1]] != -1:
+            ida.append(pred[0][ida[-1]])
+        volta = [encontro]
+        while pred[1][volta[-1]] != -1:
+            volta.append(pred[1][volta[-1]])
+        caminho = self._desempacotar(ida[::-1] + volta[1:])
+        return [self.nomes[i] for i in caminho]
+
+    # Rota completa com parada opcional, como em show_shortest_path
+    def rota(self, origem, destino, parada=None):
+        if parada and parada != "Nenhuma" and parada in self.indices:
+            path1 = self.shortest_path(origem, parada)
+            path2 = self.shortest_path(parada, destino)
+            return path1[:-1] + path2
+        return self.shortest_path(origem, destino)
+
+
+# Função para usar o índice salvo ao lado da rede ou construí-lo (e salvá-lo) se faltar ou estiver velho
+def carregar_ou_construir(grafo, csv_path):
+    caminho = caminho_indice(csv_path)
+    hierarquia = HierarquiaContracao.carregar(grafo, caminho)
+    if hierarquia is not None:
+        return hierarquia, False
+    hierarquia = HierarquiaContracao.construir(grafo)
+    hierarquia.salvar(caminho)
+    return hierarquia, True
+
+
+# Rede espacial sintética: grade lado x lado com distâncias aleatórias entre vizinhos
+def rede_em_grade(lado, seed=42):
+    rng = random.Random(seed)
+    G = nx.Graph()
+    for i in range(lado):
+        for j in range(lado):
+            if i + 1 < lado:
+                G.add_edge(f"Corpo_{i}_{j}", f"Corpo_{i + 1}_{j}", weight=rng.randint(10, 100))
+            if j + 1 < lado:
+                G.add_edge(f"Corpo_{i}_{j}", f"Corpo_{i}_{j + 1}", weight=rng.randint(10, 100))
+    return G
+
+
+# Uso: python hierarquia.py rede.csv [origem destino [parada]]  |  python hierarquia.py LADO (grade LADO x LADO)
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python hierarquia.py rede.csv [origem destino [parada]]  |  python hierarquia.py LADO")
+        sys.exit(1)
+
+    if sys.argv[1].isdigit():
+        grafo = GrafoCSR.from_networkx(rede_em_grade(int(sys.argv[1])))
+        inicio = time.perf_counter()
+        hierarquia = HierarquiaContracao.construir(grafo)
+        print(f"Construção: {time.perf_counter() - inicio:.1f} s, {hierarquia.numero_atalhos()} atalhos")
+        rng = random.Random(0)
+        pares = [(rng.choice(grafo.nomes), rng.choice(grafo.nomes)) for _ in range(200)]
+        for nome, motor in (("dijkstra", grafo), ("hierarquia", hierarquia)):
+            inicio = time.perf_counter()
+            for origem, destino in pares:
+                try:
+                    motor.shortest_path(origem, destino)
+                except nx.NetworkXNoPath:
+                    pass
+            print(f"{nome}: {(time.perf_counter() - inicio) / len(pares) * 1000:.2f} ms por consulta")
+        sys.exit(0)
+
+    catalogo = abrir_catalogo()
+    grafo, erros = GrafoCSR.from_csv(sys.argv[1], catalogo.corpos, catalogo)
+    for erro in erros:
+        print(f"Erro: {erro}")
+    inicio = time.perf_counter()
+    hierarquia, construida = carregar_ou_construir(grafo, sys.argv[1])
+    print(f"Índice {'construído' if construida else 'carregado'} em {time.perf_counter() - inicio:.2f} s: {caminho_indice(sys.argv[1])}")
+    if len(sys.argv) > 3:
+        parada = sys.argv[4] if len(sys.argv) > 4 else None
+        print(" -> ".join(hierarquia.rota(sys.argv[2], sys.argv[3], parada)))
@@ -0,0 +1,230 @@
+import sys
+import time
+
+import numpy as np
+
+from grafo_csr import GrafoCSR
+
+
+# Vértice fixado na origem quando está no grafo
+CENTRO = "Terra"
+# Abaixo desse número de vértices o grafo não é mais engrossado
+MINIMO_NIVEL = 64
+# Células por eixo da grade usada na repulsão (limites)
+MIN_CELULAS, MAX_CELULAS = 32, 256
+GRAVIDADE = 0.02
+# Máximo de vizinhos de célula comparados um a um na repulsão de curto alcance
+MAX_NA_CELULA = 32
+
+
+# Arestas únicas (u < v) e comprimentos desejados: log da distância, com mediana 1
+def _arestas(grafo):
+    n = len(grafo)
+    origem = np.repeat(np.arange(n), np.diff(grafo.offsets))
+    unicas = origem < grafo.vizinhos
+    u, v = origem[unicas], grafo.vizinhos[unicas].astype(np.int64)
+    comprimento = np.log1p(grafo.pesos[unicas].astype(np.float64))
+    if len(comprimento):
+        comprimento /= max(np.median(comprimento), 1e-9)
+    return u, v, comprimento
+
+
+# Engrossa o grafo juntando pares de vizinhos (emparelhamento guloso pelas arestas mais curtas)
+def _engrossar(n, u, v, comprimento, massa, fixos, rng):
+    par = np.full(n, -1)
+    livre = np.ones(n, dtype=bool)
+    livre[fixos] = False
+    # Empates em ordem aleatória, para os níveis não herdarem a ordem das arestas
+    embaralhadas = rng.permutation(len(u))
+    ordem = embaralhadas[np.argsort(comprimento[embaralhadas], kind='stable')]
+    for a, b in zip(u[ordem].tolist(), v[ordem].tolist()):
+        if livre[a] and livre[b]:
+            livre[a] = livre[b] = False
+            par[a], par[b] = b, a
+    # Cada par vira um vértice do nível de cima; os demais sobem sozinhos
+    representante = np.where((par >= 0) & (par < np.arange(n)), par, np.arange(n))
+    _, grosso = np.unique(representante, return_inverse=True)
+    m = int(grosso.max()) + 1
+
+    gu, gv = grosso[u], grosso[v]
+    internas = gu != gv
+    a, b = np.minimum(gu, gv)[internas], np.maximum(gu, gv)[internas]
+    chave, inverso = np.unique(a * m + b, return_inverse=True)
+    novo_comprimento = np.bincount(inverso, weights=comprimento[internas]) / np.bincount(inverso)
+    nova_massa = np.bincount(grosso, weights=massa, minlength=m)
+    return grosso, chave // m, chave % m, novo_comprimento, nova_massa
+
+
+# Núcleo da repulsão na grade (em unidades de célula), já transformado para a convolução
+_nucleos = {}
+
+
+def _nucleo(celulas):
+    if celulas not in _nucleos:
+        tamanho = 2 * celulas  # Basta para o recorte central não sofrer com a convolução circular
+        d = np.arange(-(celulas - 1), celulas, dtype=np.float64)
+        dx, dy = np.meshgrid(d, d, indexing='ij')
+        quadrado = dx ** 2 + dy ** 2
+        quadrado[celulas - 1, celulas - 1] = np.inf
+        _nucleos[celulas] = (np.fft.rfft2(dx / quadrado, s=(tamanho, tamanho)),
+                             np.fft.rfft2(dy / quadrado, s=(tamanho, tamanho)))
+    return _nucleos[celulas]
+
+
+# Repulsão k²/d de todos contra todos, aproximada pela densidade numa grade (convolução por FFT)
+def _repulsao(pos, massa, k, celulas):
+    minimo = pos.min(axis=0)
+    lado = max(float((pos.max(axis=0) - minimo).max()), 1e-9) * 1.0001
+    h = lado / celulas
+    celula = np.minimum(((pos - minimo) / h).astype(np.int64), celulas - 1)
+    indice = celula[:, 0] * celulas + celula[:, 1]
+    densidade = np.bincount(indice, weights=massa, minlength=celulas * celulas).reshape(celulas, celulas)
+
+    tamanho = 2 * celulas
+    espectro = np.fft.rfft2(densidade, s=(tamanho, tamanho))
+    nucleo_x, nucleo_y = _nucleo(celulas)
+    recorte = slice(celulas - 1, 2 * celulas - 1)
+    fx = np.fft.irfft2(espectro * nucleo_x, s=(tamanho, tamanho))[recorte, recorte].ravel()
+    fy = np.fft.irfft2(espectro * nucleo_y, s=(tamanho, tamanho))[recorte, recorte].ravel()
+    escala = k * k / h * massa
+    forca = np.column_stack((fx[indice] * escala, fy[indice] * escala))
+
+    # A grade não separa vértices da mesma célula: esses pares são comparados um a um
+    ordem = np.argsort(indice, kind='stable')
+    celula_ordenada = indice[ordem]
+    for salto in range(1, MAX_NA_CELULA + 1):
+        mesma = celula_ordenada[:-salto] == celula_ordenada[salto:]
+        if not mesma.any():
+            break
+        a, b = ordem[:-salto][mesma], ordem[salto:][mesma]
+        delta = pos[a] - pos[b]
+        quadrado = np.maximum(delta[:, 0] ** 2 + delta[:, 1] ** 2, 1e-4 * k * k)
+        empurrao = (k * k * massa[a] * massa[b] / quadrado)[:, None] * delta
+        for eixo in (0, 1):
+            forca[:, eixo] += np.bincount(a, weights=empurrao[:, eixo], minlength=len(pos))
+            forca[:, eixo] -= np.bincount(b, weights=empurrao[:, eixo], minlength=len(pos))
+    return forca
+
+
+# Simulação de forças num nível, com temperatura que esfria até o fim do orçamento
+def _simular(pos, u, v, comprimento, massa, fixos, alvo, iteracoes, k, temperatura):
+    n = len(pos)
+    celulas = int(np.clip(2 * np.sqrt(n), MIN_CELULAS, MAX_CELULAS))
+    repouso = k * comprimento * np.sqrt((massa[u] + massa[v]) / 2)
+    pos[fixos] = alvo
+    for passo in range(iteracoes):
+        forca = _repulsao(pos, massa, k, celulas)
+
+        delta = pos[v] - pos[u]
+        d = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 1e-9)
+        puxao = (d / repouso)[:, None] * delta  # Atração d²/L: a aresta se equilibra perto de L
+        for eixo in (0, 1):
+            forca[:, eixo] += np.bincount(u, weights=puxao[:, eixo], minlength=n)
+            forca[:, eixo] -= np.bincount(v, weights=puxao[:, eixo], minlength=n)
+        forca -= GRAVIDADE * massa[:, None] * (pos - pos.mean(axis=0)) / k
+
+        # Vértices mais pesados se movem menos; o passo é limitado pela temperatura
+        desloc = forca / massa[:, None]
+        tamanho = np.maximum(np.hypot(desloc[:, 0], desloc[:, 1]), 1e-9)
+        limite = temperatura * (1 - passo / iteracoes)
+        pos += desloc * (np.minimum(tamanho, limite) / tamanho)[:, None]
+        pos[fixos] = alvo
+    return pos
+
+
+# Função para calcular as posições dos vértices com um layout de forças multinível
+def calculate_positions(G, fixos=None, iteracoes=120, seed=42):
+    """
+    Layout de forças vetorizado para G (networkx ou GrafoCSR). O comprimento desejado de
+    cada aresta cresce com o log da distância; a repulsão entre todos os pares é aproximada
+    numa grade. O grafo é engrossado em níveis e cada nível parte das posições do nível de
+    cima. fixos mapeia vértice -> posição e, por padrão, prende a Terra na origem.
+    iteracoes é o orçamento total, dividido entre os níveis (metade para o mais grosso).
+    """
+    grafo = G if isinstance(G, GrafoCSR) else GrafoCSR.from_networkx(G)
+    n = len(grafo)
+    if n == 0:
+        return {}
+    if fixos is None:
+        fixos = {CENTRO: (0.0, 0.0)} if CENTRO in grafo else {}
+    fixos = {grafo.indices[nome]: xy for nome, xy in fixos.items() if nome in grafo}
+    indices_fixos = np.array(sorted(fixos), dtype=np.int64)
+    alvo = np.array([fixos[i] for i in indices_fixos.tolist()], dtype=np.float64).reshape(-1, 2)
+
+    # Níveis do mais fino ao mais grosso; vértices fixos nunca são juntados
+    rng = np.random.default_rng(seed)
+    u, v, comprimento = _arestas(grafo)
+    niveis = [(n, u, v, comprimento, np.ones(n), indices_fixos, None)]
+    while niveis[-1][0] > MINIMO_NIVEL:
+        tamanho, u, v, comprimento, massa, fixos_nivel, _ = niveis[-1]
+        grosso, gu, gv, gcomprimento, gmassa = _engrossar(tamanho, u, v, comprimento, massa, fixos_nivel, rng)
+        if len(gmassa) > 0.9 * tamanho:
+            break
+        niveis.append((len(gmassa), gu, gv, gcomprimento, gmassa, grosso[fixos_nivel], grosso))
+
+    k = 1.0
+    pos = None
+    por_nivel = max(5, iteracoes // (2 * max(1, len(niveis) - 1)))
+    for nivel in range(len(niveis) - 1, -1, -1):
+        tamanho, u, v, comprimento, massa, fixos_nivel, _ = niveis[nivel]
+        if pos is None:
+            pos = rng.uniform(-1, 1, size=(tamanho, 2)) * np.sqrt(massa.sum()) * k
+            passos, temperatura = max(5, iteracoes // 2), 0.5 * np.sqrt(massa.sum()) * k
+        else:
+            # Cada vértice começa perto do vértice do nível de cima que o representava
+            pos = pos[niveis[nivel + 1][6]] + rng.normal(scale=0.1 * k, size=(tamanho, 2))
+            passos, temperatura = por_nivel, 0.1 * np.sqrt(massa.sum()) * k
+        pos = _simular(pos, u, v, comprimento, massa, fixos_nivel, alvo, passos, k, temperatura)
+
+    return dict(zip(grafo.nomes, pos))
+
+
+# Função para reposicionar só os vértices afetados por uma edição, com os vizinhos presos onde estão
+def reposicionar(G, posicoes, afetados, iteracoes=60, seed=42):
+    """
+    Devolve as posições de todos os vértices de G: os não afetados ficam como estavam e
+    os afetados (e os que ainda não têm posição) passam por um layout só do subgrafo das
+    suas arestas, com os vizinhos não afetados fixos. Um pedaço novo sem vizinho fixo vai
+    para a direita do desenho atual. Vértices que saíram de G somem do resultado.
+    """
+    grafo = G if isinstance(G, GrafoCSR) else GrafoCSR.from_networkx(G)
+    afetados = {grafo.indices[nome] for nome in afetados if nome in grafo}
+    afetados |= {i for i, nome in enumerate(grafo.nomes) if nome not in posicoes}
+    novas = {nome: posicoes[nome] for i, nome in enumerate(grafo.nomes) if i not in afetados}
+    if not afetados:
+        return novas
+
+    off, viz, pes = grafo._off, grafo._viz, grafo._pes
+    arestas = [(grafo.nomes[i], grafo.nomes[viz[k]], pes[k]) for i in afetados for k in range(off[i], off[i + 1])
+               if viz[k] not in afetados or viz[k] >= i]
+    nomes = [grafo.nomes[i] for i in sorted(afetados)]
+    sub = GrafoCSR.de_arestas(nomes, arestas)
+    fixos = {nome: novas[nome] for nome in sub.nomes if nome in novas}
+    locais = calculate_positions(sub, fixos=fixos, iteracoes=iteracoes, seed=seed)
+
+    # Pedaços do subgrafo sem nenhum vértice fixo ficam lado a lado à direita do desenho
+    rotulos = sub.componentes()
+    presos = {int(rotulos[sub.indices[nome]]) for nome in fixos}
+    for rotulo in sorted(set(rotulos.tolist()) - presos):
+        pedaco = [nome for nome, r in zip(sub.nomes, rotulos.tolist()) if r == rotulo]
+        proprias = np.array([locais[nome] for nome in pedaco], dtype=np.float64)
+        atuais = np.array(list(novas.values()), dtype=np.float64).reshape(-1, 2)
+        deslocamento = np.zeros(2)
+        if len(atuais):
+            deslocamento = [atuais[:, 0].max() - proprias[:, 0].min() + 1.0, atuais[:, 1].mean() - proprias[:, 1].mean()]
+        for nome, xy in zip(pedaco, proprias + deslocamento):
+            novas[nome] = xy
+    for nome in nomes:
+        novas.setdefault(nome, np.asarray(locais[nome]))
+    return {nome: novas[nome] for nome in grafo.nomes}
+
+
+# Uso: python layout.py N (mede o tempo do layout numa rede sintética com N vértices)
+if __name__ == "__main__":
+    from grafo_csr import rede_sintetica
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    grafo = GrafoCSR.from_networkx(rede_sintetica(n))
+    inicio = time.perf_counter()
+    pos = calculate_positions(grafo)
+    print(f"{n} vértices posicionados em {time.perf_counter() - inicio:.2f} s")
@@ -1,85 +1,188 @@
+import os
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import networkx as nx
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import pandas as pd
-import numpy as np
-
-
-valid_planets = ["Mercúrio", "Vênus", "Terra", "Marte", "Júpiter", "Saturno", "Urano", "Netuno", "Estacao_Esp1", "Estacao_Esp2", "Estacao_Esp3"]
-meses_do_ano = [
-    "janeiro", "fevereiro", "março", "abril", "maio", "junho",
-    "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"
-]
-distances = {
-    ("Mercúrio", "Vênus"): 38,
-    ("Mercúrio", "Terra"): 91,
-    ("Mercúrio", "Marte"): 78,
-    ("Mercúrio", "Júpiter"): 550,
-    ("Mercúrio", "Saturno"): 1220,
-    ("Mercúrio", "Urano"): 2600,
-    ("Vênus", "Terra"): 42,
-    ("Vênus", "Marte"): 61,
-    ("Vênus", "Júpiter"): 520,
-    ("Vênus", "Saturno"): 1130,
-    ("Vênus", "Urano"): 2480,
-    ("Terra", "Marte"): 78,
-    ("Terra", "Júpiter"): 628,
-    ("Terra", "Saturno"): 1270,
-    ("Terra", "Urano"): 2720,
-    ("Terra", "Netuno"): 4340,
-    ("Marte", "Júpiter"): 558,
-    ("Marte", "Saturno"): 1150,
-    ("Marte", "Urano"): 2650,
-    ("Júpiter", "Saturno"): 650,
-    ("Júpiter", "Urano"): 1520,
-    ("Júpiter", "Netuno"): 2380,
-    ("Saturno", "Urano"): 870,
-    ("Saturno", "Netuno"): 1420,
-    ("Urano", "Netuno"): 2850,
-    ("Estacao_Esp1", "Mercúrio"): 500,
-    ("Estacao_Esp1", "Netuno"): 1000,
-    ("Estacao_Esp2", "Marte"): 400,
-    ("Estacao_Esp2", "Netuno"): 900,
-    ("Estacao_Esp3", "Vênus"): 450,
-    ("Estacao_Esp3", "Netuno"): 950,
-}
+
+
+from dados import valid_planets, meses_do_ano
+from carregador_csv import IndiceCSV
+from grafo_csr import GrafoCSR
+from layout import calculate_positions, reposicionar
+from renderizacao import DesenhoRede, desenhar_rota, destacar_nos
+from estacoes import analisar_estacoes, candidatos_padrao
+from planejamento import planejar_viagem
+from servico_rotas import HOST, iniciar_em_thread
+from rotas_dinamicas import RotasDinamicas
+from alcance import calcular_alcance
+from criticidade import analisar_criticidade, prever_remocao
+from rotas_pareto import rotas_pareto
+from hierarquia import HierarquiaContracao, carregar_ou_construir
+from componentes import IndiceComponentes
+from catalogo import abrir_catalogo
+from registro_viagens import RegistroViagens, ARQUIVO_REGISTRO
+from frota import planejar_frota, ler_frota_csv
+from cenarios import Cenarios, NOME_BASE
+
+
+# Catálogo de corpos e distâncias mapeado do disco (gerado de dados.py na primeira execução); aberto
+# no bloco principal, para que os processos trabalhadores que importam este módulo não o abram de novo
+catalogo = None
 
 G = nx.Graph()
+# Representação compacta usada para rotas, matriz e análises; o G fica só para o desenho
+G_csr = GrafoCSR.from_networkx(G)
+
+# Acima desse número de vértices as rotas de todos os pares não são montadas (tempo e memória n²)
+LIMITE_TABELAS_ROTAS = 1000
+# Quantos corpos o menu de planetas ausentes mostra no máximo
+LIMITE_MENU_CORPOS = 500
+
+# Caminhos mínimos de todos os pares, mantidos de forma incremental em add_planet/delete_planet.
+# Só são montados quando alguém precisa deles (rotas_dinamicas) e a rede é pequena; até lá, e
+# sempre que a hierarquia de contração está em uso, ficam em None
+rotas = None
+
+# Componentes conexas, mantidas a cada edição para responder "existe caminho?" sem busca
+componentes = IndiceComponentes.from_csr(G_csr)
+
+# Cenários de "e se" sobre a rede atual, guardando só as diferenças em relação a ela
+cenarios = Cenarios(G_csr)
+
+# Último CSV carregado, lembrado linha a linha para recarregar só o que mudou (criado junto com o catálogo)
+indice_csv = None
+arquivo_csv = None
+assinatura_csv = None
+
+# Observação do arquivo: intervalo entre as verificações (ms) e o agendamento atual
+INTERVALO_OBSERVACAO = 1000
+observacao = None
+
+# Hierarquia de contração opcional da rede carregada do CSV (salva ao lado do arquivo)
+hierarquia = None
+
+# Posições e desenho atuais da rede (preenchidos por update_graph)
+posicoes = {}
+desenho = None
+# Rotas e anéis desenhados por cima do desenho atual pelas consultas
+destaques = []
+
+# Eventos das últimas viagens (gravados também em viagens.jsonl quando a opção está marcada)
+registro = RegistroViagens()
+
+# Serviço local de rotas (iniciado pelo botão "Serviço de Rotas")
+servico = None
+
+# Função para reconstruir o grafo compacto sempre que o G mudar. Numa rede nova (CSV carregado do
+# zero) as rotas, a hierarquia e os cenários não são levados adiante: reconstruir_rotas os recomeça
+def atualizar_csr(rede_nova=False):
+    global G_csr, hierarquia, rotas
+    G_csr = GrafoCSR.from_networkx(G)
+    if servico is not None:
+        servico.trocar_grafo_seguro(G_csr)  # O serviço passa a responder com a nova rede
+    if rede_nova:
+        return
+    if rotas is not None and len(G_csr) > LIMITE_TABELAS_ROTAS:
+        rotas = None  # A rede cresceu demais: as rotas passam a sair do grafo compacto
+        travel_info_text.insert(tk.END, f"Rede com {len(G_csr)} vértices: tabelas de rotas descartadas "
+                                        f"(limite de {LIMITE_TABELAS_ROTAS}).\n")
+    if hierarquia is not None:
+        hierarquia = None  # O índice só vale para a rede exatamente como ela estava
+        travel_info_text.insert(tk.END, "Hierarquia de contração descartada (a rede mudou); ela será refeita na próxima consulta.\n")
+    cenarios.trocar_base(G_csr)  # Os cenários refazem as suas edições sobre a rede nova
+
+# Função para recomeçar as rotas, a hierarquia, as componentes e os cenários (ao carregar um CSV novo);
+# as tabelas ficam para depois
+def reconstruir_rotas():
+    global rotas, hierarquia, componentes, cenarios
+    rotas = None
+    hierarquia = None
+    componentes = IndiceComponentes.from_csr(G_csr)
+    cenarios = Cenarios(G_csr)  # Cenários de outra rede não fazem sentido na nova
+
+# Função para carregar (ou construir e salvar) a hierarquia de contração da rede do CSV
+def carregar_hierarquia(file_path):
+    global hierarquia
+    hierarquia, construida = carregar_ou_construir(G_csr, file_path)
+    acao = "construída e salva" if construida else "carregada"
+    travel_info_text.insert(tk.END, f"Hierarquia de contração {acao} ({hierarquia.numero_atalhos()} atalhos).\n")
+
+# Função para refazer a hierarquia da rede editada (ela não corresponde mais ao CSV, então não é salva)
+def refazer_hierarquia():
+    global hierarquia
+    inicio = time.perf_counter()
+    hierarquia = HierarquiaContracao.construir(G_csr)
+    travel_info_text.insert(tk.END, f"Hierarquia de contração refeita para a rede atual em {time.perf_counter() - inicio:.2f} s "
+                                    f"({hierarquia.numero_atalhos()} atalhos).\n")
+
+# Rotas de todos os pares, montadas na primeira vez que são pedidas; None com a hierarquia ou numa rede grande
+def rotas_dinamicas():
+    global rotas
+    if rotas is None and hierarquia is None and not usar_hierarquia.get() and 0 < len(G_csr) <= LIMITE_TABELAS_ROTAS:
+        inicio = time.perf_counter()
+        rotas = RotasDinamicas.from_csr(G_csr)
+        travel_info_text.insert(tk.END, f"Tabelas de rotas montadas para {len(G_csr)} vértices "
+                                        f"em {time.perf_counter() - inicio:.2f} s.\n")
+    return rotas
+
+# Motor usado nas consultas de rota: a hierarquia, quando existe, as rotas incrementais ou o grafo compacto.
+# Com "Pré-processar rotas" marcado, a hierarquia descartada por uma edição é refeita aqui
+def motor_rotas():
+    if hierarquia is None and usar_hierarquia.get() and len(G_csr):
+        refazer_hierarquia()
+    if hierarquia is not None:
+        return hierarquia
+    tabelas = rotas_dinamicas()
+    return tabelas if tabelas is not None else G_csr
+
+# Função para mostrar quanto custou manter as rotas atualizadas após uma edição (nada sem as tabelas)
+def mostrar_custo_rotas(custo):
+    if custo is None:
+        return
+    travel_info_text.insert(tk.END, f"Rotas atualizadas ({custo['operacao']}): {custo['pares_atualizados']} pares relaxados, "
+                                    f"{custo['fontes_reparadas']} origens reparadas, {custo['vertices_reparados']} vértices "
+                                    f"recalculados em {custo['segundos'] * 1000:.1f} ms\n")
+
+# Data de modificação e tamanho do arquivo (None se ele não pode ser lido)
+def assinatura_arquivo(file_path):
+    try:
+        estado = os.stat(file_path)
+    except OSError:
+        return None
+    return estado.st_mtime_ns, estado.st_size
 
 def upload_csv():
     file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
     
+    if file_path:
+        carregar_csv(file_path)
+
+# Função para carregar um CSV do zero (também usada quando uma recarga parcial falha)
+def carregar_csv(file_path):
+    global arquivo_csv, assinatura_csv
     if file_path:
         try:
-            df = pd.read_csv(file_path, delimiter=';')
-            
-            if 'Planeta' not in df.columns or 'Conexoes' not in df.columns:
-                raise ValueError("O CSV deve conter as colunas: 'Planeta', 'Conexoes'")
-            
+            assinatura_csv = assinatura_arquivo(file_path)
+            nos, arestas, erros = indice_csv.carregar(file_path)
+            arquivo_csv = file_path
+
             G.clear() 
-            
-            for index, row in df.iterrows():
-                planet = row['Planeta']
-                connections = row['Conexoes'].split(',')
-                
-                if planet in valid_planets:
-                    G.add_node(planet)
-                    for connection in connections:
-                        if connection in valid_planets:
-                            if (planet, connection) in distances:
-                                distance = distances[(planet, connection)]
-                                G.add_edge(planet, connection, weight=distance)
-                            elif (connection, planet) in distances:
-                                distance = distances[(connection, planet)]
-                                G.add_edge(planet, connection, weight=distance)
-                            else:
-                                messagebox.showerror("Erro", f"Distância não definida entre {planet} e {connection}.")
-                        else:
-                            messagebox.showerror("Erro", f"Conexão inválida: {connection} não é um planeta válido.")
-                else:
-                    messagebox.showerror("Erro", f"Planeta inválido: {planet}")
+            G.add_nodes_from(nos)
+            for planet, connection, distance in arestas:
+                G.add_edge(planet, connection, weight=distance)
+            for erro in erros:
+                messagebox.showerror("Erro", erro)
+            atualizar_csr(rede_nova=True)
+            reconstruir_rotas()
+            # Com a hierarquia as rotas saem dela; as tabelas de todos os pares nem são montadas
+            if usar_hierarquia.get():
+                carregar_hierarquia(file_path)
+            elif len(G_csr) > LIMITE_TABELAS_ROTAS:
+                travel_info_text.insert(tk.END, f"Rede com {len(G_csr)} vértices (acima de {LIMITE_TABELAS_ROTAS}): rotas "
+                                                f"calculadas no grafo compacto a cada consulta, sem tabelas de todos os pares.\n")
             
             update_graph()
             populate_planet_options()
@@ -90,31 +193,25 @@ def upload_csv():
 
 #Gernado a Matriz
 def generate_adjacency_matrix():
-    nodes = list(G.nodes())
-    n = len(nodes)
-    adj_matrix = np.zeros((n, n))  
-    
-    for i, node1 in enumerate(nodes):
-        for j, node2 in enumerate(nodes):
-            if G.has_edge(node1, node2):
-                adj_matrix[i, j] = G[node1][node2]['weight']  
-            else:
-                adj_matrix[i, j] = 0  
+    nodes = G_csr.nomes
+    adj_matrix = G_csr.matriz_adjacencia()
     
-   
     adj_df = pd.DataFrame(adj_matrix, index=nodes, columns=nodes)
     
     return adj_df
 
 # Função para atualizar a lista de planetas que não estão no grafo
 def update_missing_planets_dropdown():
-    planets_in_graph = set(G.nodes())  
-    missing_planets = [planet for planet in valid_planets if planet not in planets_in_graph]  
+    # Só os corpos com distância até algum vértice podem ser adicionados; o menu mostra no máximo LIMITE_MENU_CORPOS
+    missing_planets = catalogo.vizinhanca(G.nodes())
     
     missing_planet_menu['menu'].delete(0, 'end')  
     if missing_planets:
-        for planet in missing_planets:
+        for planet in missing_planets[:LIMITE_MENU_CORPOS]:
             missing_planet_menu['menu'].add_command(label=planet, command=tk._setit(missing_planet_var, planet))
+        if len(missing_planets) > LIMITE_MENU_CORPOS:
+            missing_planet_menu['menu'].add_command(
+                label=f"... mais {len(missing_planets) - LIMITE_MENU_CORPOS} corpos (adicione-os pelo CSV)", state=tk.DISABLED)
         missing_planet_var.set(missing_planets[0]) 
     else:
         missing_planet_var.set('')  
@@ -131,81 +228,114 @@ def update_delete_planet_dropdown():
     else:
         delete_planet_var.set('')  # Se não houver planetas, deixar vazio
 
-# Função para calcular as posições normalizadas dos planetas
-def calculate_positions():
-    pos = nx.spring_layout(G, seed=42, k=5, iterations=50) 
-    central_planet = "Terra"  # Colocar a Terra no centro
-    pos[central_planet] = np.array([0, 0])
-
-    scale = 1.5  # Aumente o fator de escala para mais espaçamento
-    angle_step = 2 * np.pi / (len(valid_planets))  # Dividir 360 graus entre os planetas
-    angle = 0
-
-    # Definir posições relativas em torno da Terra com base nas distâncias
-    for planet in valid_planets:
-        if planet == central_planet:
-            continue
-
-        # Calcular a distância relativa (log) para evitar distâncias extremas
-        distance = None
-        if (central_planet, planet) in distances:
-            distance = distances[(central_planet, planet)]
-        elif (planet, central_planet) in distances:
-            distance = distances[(planet, central_planet)]
-
-        if distance is not None:
-            # Aplicar logaritmo para suavizar a variação de distâncias
-            normalized_distance = np.log1p(distance)  # log(1 + distância) para evitar log(0)
-            # Calcular posição radial
-            pos[planet] = np.array([np.cos(angle), np.sin(angle)]) * normalized_distance * scale
-            angle += angle_step * 1.5  # Aumente este valor para maior espaçamento angular
-            
-            
-    pos["Estacao_Esp1"] = np.array([1.2, -5])  # Posição manual da Estacao_Esp1
-    pos["Estacao_Esp2"] = np.array([2.5, -2])  # Posição manual da Estacao_Esp2
-    pos["Estacao_Esp3"] = np.array([4.5, -2])  # Posição manual da Estacao_Esp3
-
-    return pos
-
-# Função para colorir os planetas e as estações espaciais
-def get_node_colors():
-    node_colors = []
-    for node in G.nodes:
-        if node in ["Mercúrio", "Vênus", "Terra", "Marte", "Júpiter", "Saturno", "Urano", "Netuno"]:
-            node_colors.append("lightblue")  # Planetas terão a cor azul claro
-        elif node.startswith("Estacao"):
-            node_colors.append("orange")  # Estações espaciais terão a cor laranja
-        else:
-            node_colors.append("gray")  # Outros nós terão a cor cinza
-    return node_colors
-
-# Função para definir o tamanho dos nós (planetas maiores, estações menores)
-def get_node_sizes():
-    node_sizes = []
-    for node in G.nodes:
-        if node in ["Mercúrio", "Vênus", "Terra", "Marte", "Júpiter", "Saturno", "Urano", "Netuno"]:
-            node_sizes.append(2000)  
-        else:
-            node_sizes.append(1000)  # Estações menores
-    return node_sizes
-
-planet_colors = {
-    "Mercúrio": "#E1C699",
-    "Vênus": "#F9E79F",
-    "Terra": "#ADD8E6",
-    "Marte": "#FFB6C1",
-    "Júpiter": "#D2B48C",
-    "Saturno": "#FDEBD0",
-    "Urano": "#AFEEEE",
-    "Netuno": "#87CEEB",
-    "Estacao_Esp1": "#FFFFFF",
-    "Estacao_Esp2": "#FFFFFF",
-    "Estacao_Esp3": "#FFFFFF",
-}
+# Função para recarregar o último CSV aplicando só as linhas que entraram ou saíram
+def recarregar_csv():
+    """
+    As arestas e vértices que mudaram passam pelas mesmas atualizações incrementais de
+    add_planet e delete_planet (rotas e componentes); só os vértices tocados mudam de
+    posição no desenho e as listas de planetas só são refeitas se algum vértice mudou.
+    Edições feitas na tela sobre linhas que o arquivo não mudou são mantidas; um vértice
+    excluído na tela volta se uma aresta nova do arquivo precisa dele. Se a aplicação
+    falhar no meio, o arquivo é carregado do zero para nada ficar fora de sincronia.
+    """
+    global assinatura_csv
+    if arquivo_csv is None:
+        messagebox.showerror("Erro", "Carregue um arquivo CSV antes de recarregar.")
+        return
+
+    inicio = time.perf_counter()
+    assinatura_csv = assinatura_arquivo(arquivo_csv)
+    try:
+        diferenca = indice_csv.diferenca(arquivo_csv)
+    except Exception as e:
+        messagebox.showerror("Erro", f"Erro ao recarregar arquivo CSV: {str(e)}")
+        return
+    for erro in diferenca["erros"]:
+        messagebox.showerror("Erro", erro)
+
+    try:
+        removidos, restaurados = aplicar_diferenca(diferenca)
+    except Exception as e:
+        messagebox.showerror("Erro", f"Erro ao aplicar as mudanças do CSV ({str(e)}); o arquivo será carregado do zero.")
+        carregar_csv(arquivo_csv)
+        return
+    travel_info_text.insert(tk.END, f"CSV recarregado: {diferenca['linhas_novas']} linha(s) nova(s), {diferenca['linhas_removidas']} "
+                                    f"removida(s); {len(diferenca['arestas_novas'])} aresta(s) e {len(diferenca['nos_novos'])} "
+                                    f"vértice(s) novos, {len(diferenca['arestas_removidas'])} aresta(s) e {len(removidos)} vértice(s) "
+                                    f"removidos, {len(restaurados)} vértice(s) excluído(s) na tela de volta "
+                                    f"em {(time.perf_counter() - inicio) * 1000:.1f} ms\n")
+
+# Função para aplicar ao G, às rotas, às componentes e ao desenho as mudanças de uma recarga
+def aplicar_diferenca(diferenca):
+    global posicoes
+    removidos = set(diferenca["nos_removidos"])
+    afetados = set(diferenca["nos_novos"])
+    restaurados = []
+
+    def garantir_no(planet):
+        if planet not in G:
+            G.add_node(planet)
+            if rotas is not None:
+                rotas.adicionar_no(planet, [])
+            componentes.adicionar_no(planet)
+            afetados.add(planet)
+            return True
+        return False
+
+    for u, v in diferenca["arestas_removidas"]:
+        if G.has_edge(u, v):
+            G.remove_edge(u, v)
+            afetados.update((u, v))
+            if u not in removidos and v not in removidos:
+                if rotas is not None:
+                    rotas.remover_aresta(u, v)
+                componentes.remover_aresta(u, v)
+    for planet in removidos:
+        if planet in G:
+            G.remove_node(planet)
+            if rotas is not None:
+                rotas.remover_no(planet)
+            componentes.remover_no(planet)
+    for planet in diferenca["nos_novos"]:
+        garantir_no(planet)
+    for planet, connection, distance in diferenca["arestas_novas"]:
+        # Ponta excluída na tela (ou por uma recarga anterior): volta antes da aresta
+        restaurados.extend(nome for nome in (planet, connection) if garantir_no(nome))
+        if not G.has_edge(planet, connection) or G[planet][connection]['weight'] != distance:
+            G.add_edge(planet, connection, weight=distance)
+            if rotas is not None:
+                rotas.adicionar_aresta(planet, connection, distance)
+            componentes.adicionar_aresta(planet, connection)
+            afetados.update((planet, connection))
+
+    if afetados or removidos:
+        atualizar_csr()
+        posicoes = reposicionar(G_csr, posicoes, afetados - removidos)
+        update_graph(recalcular=False)
+        if diferenca["nos_novos"] or removidos or restaurados:
+            populate_planet_options()
+            update_missing_planets_dropdown()
+            update_delete_planet_dropdown()
+    return removidos, restaurados
+
+# Função para verificar o CSV periodicamente e recarregá-lo quando o arquivo mudar
+def observar_csv():
+    global observacao
+    if observacao is not None:
+        window.after_cancel(observacao)
+        observacao = None
+    if not observar_arquivo.get():
+        return
+    assinatura = assinatura_arquivo(arquivo_csv) if arquivo_csv else None
+    if assinatura is not None and assinatura != assinatura_csv:
+        recarregar_csv()
+    observacao = window.after(INTERVALO_OBSERVACAO, observar_csv)
 
 # Função para atualizar a visualização do grafo com as novas posições e cores
-def update_graph():
+def update_graph(recalcular=True):
+    global posicoes, desenho
     fig.clear()
+    destaques.clear()
     # Remover o 'patch' que pode causar o fundo branco
     fig.patch.set_visible(False)  # Isso garante que o fundo padrão do Matplotlib não seja desenhado
 
@@ -214,24 +344,29 @@ def update_graph():
 
     # Desativar a grade para garantir que não haja interferência
     ax.grid(False)
-    # Calcular posições personalizadas com base nas distâncias fornecidas
-    pos = calculate_positions()
-    
-    # Obter as cores e tamanhos dos nós
-    node_colors = [planet_colors.get(node, "#FFFFFF") for node in G.nodes()]  # Usar o dicionário para definir a cor de cada planeta
-    node_sizes = get_node_sizes()
+    # Calcular posições com o layout de forças (arestas mais longas para distâncias maiores, Terra no centro);
+    # numa recarga parcial as posições já vêm ajustadas
+    if recalcular:
+        posicoes = calculate_positions(G_csr)
 
-    # Desenhar o grafo com cores personalizadas e tamanhos de nós
-    nx.draw(G, pos, with_labels=True, node_color=node_colors, node_size=node_sizes, edge_color='gray', ax=ax, font_size=10, font_color='black')
-    
-    # Obter rótulos das arestas (distâncias)
-    labels = nx.get_edge_attributes(G, 'weight')
-    nx.draw_networkx_edge_labels(G, pos, edge_labels={k: f"{v}" for k, v in labels.items()}, ax=ax, font_color='gray')
+    # Desenhar o grafo em poucas coleções; rótulos dependem do zoom e do mouse (nível de detalhe)
+    if desenho is not None:
+        desenho.desconectar()
+    desenho = DesenhoRede(ax, G, posicoes)
+    desenho.conectar(canvas)
 
     # Atualizar o canvas
     canvas.draw()
     window.update_idletasks()  
 
+# Função para apagar os destaques da consulta anterior sem refazer o layout nem o desenho da rede
+def limpar_destaques():
+    if desenho is None or not fig.axes:
+        update_graph()
+    for artista in destaques:
+        artista.remove()
+    destaques.clear()
+
 # Função para popular as opções de planetas
 def populate_planet_options():
     planet_list = list(G.nodes())
@@ -272,15 +407,10 @@ def add_planet():
         return
 
     # Verificar se o planeta é válido
-    if planet and planet in valid_planets:
-        # Verificar se há conexões válidas para adicionar o planeta
-        connections = []
-        for connection in valid_planets:
-            if connection in G.nodes():
-                if (planet, connection) in distances:
-                    connections.append(connection)
-                elif (connection, planet) in distances:
-                    connections.append(connection)
+    if planet and planet in catalogo.corpos:
+        # Verificar se há conexões válidas para adicionar o planeta (só os vizinhos do catálogo são lidos)
+        conexoes = [(connection, distance) for connection, distance in catalogo.vizinhos_de(planet) if connection in G]
+        connections = [connection for connection, _ in conexoes]
 
         if not connections:
             messagebox.showerror("Erro", "O planeta ou estação não tem conexões válidas com planetas no grafo!")
@@ -291,17 +421,17 @@ def add_planet():
             G.add_node(planet)
 
             
-            for connection in connections:
-                if (planet, connection) in distances:
-                    G.add_edge(planet, connection, weight=distances[(planet, connection)])
-                elif (connection, planet) in distances:
-                    G.add_edge(planet, connection, weight=distances[(connection, planet)])
+            for connection, distance in conexoes:
+                G.add_edge(planet, connection, weight=distance)
 
-          
+            atualizar_csr()
+            custo = rotas.adicionar_no(planet, conexoes) if rotas is not None else None
+            componentes.adicionar_no(planet, connections)
             update_graph()
             populate_planet_options()
             update_missing_planets_dropdown()
             update_delete_planet_dropdown()
+            mostrar_custo_rotas(custo)
 
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao adicionar planeta ou estação: {str(e)}")
@@ -313,18 +443,38 @@ def delete_planet():
     planet = delete_planet_var.get()
     
     if planet in G.nodes():
+        # Mostrar o impacto da exclusão antes de confirmar
+        tabelas = rotas_dinamicas()
+        impacto = prever_remocao(tabelas, planet, combustivel_informado()) if tabelas is not None else None
+        if impacto and (impacto["pares_desconectados"] or impacto["pares_inviaveis"] or impacto["aumento_distancia"]):
+            proceed = messagebox.askyesno("Aviso", f"Excluir {planet} vai desconectar {impacto['pares_desconectados']} par(es), "
+                                          f"tornar {impacto['pares_inviaveis']} par(es) inviáveis com o combustível informado "
+                                          f"e aumentar a distância total em {impacto['aumento_distancia']:g} km.\nDeseja continuar?")
+            if not proceed:
+                return
         try:
             G.remove_node(planet) 
+            atualizar_csr()
+            custo = rotas.remover_no(planet) if rotas is not None else None
+            componentes.remover_no(planet)
             update_graph()
             populate_planet_options()  
             update_missing_planets_dropdown()  
             update_delete_planet_dropdown()   
+            mostrar_custo_rotas(custo)
             messagebox.showinfo("Sucesso", f"O planeta {planet} foi excluído do grafo.")
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao excluir planeta: {str(e)}")
     else:
         messagebox.showerror("Erro", "Selecione um planeta válido para excluir.")
 
+# Combustível digitado na tela, ou infinito quando o campo está vazio ou inválido
+def combustivel_informado():
+    try:
+        return float(fuel_var.get())
+    except ValueError:
+        return float('inf')
+
 # Adicionando um campo de texto para mostrar a viagem e o combustível
 def show_shortest_path():
     origin = origin_var.get()
@@ -342,111 +492,142 @@ def show_shortest_path():
         return
 
    
-    if origin and destination and origin in G and destination in G and month in meses_do_ano:
-        try:
-           
-            update_graph()
+    motor = motor_rotas()
+    if origin and destination and origin in motor and destination in motor and month in meses_do_ano:
+        limpar_destaques()  # Mantém o layout, o zoom e o nível de detalhe do desenho atual
 
-            # Regra para cancelar a viagem se o destino for Vênus em dezembro
-            if destination == "Vênus" and month == "dezembro":
-                travel_info_text.insert(tk.END, "Devido a uma tempestade solar prevista para Dezembro, a viagem para Vênus foi adiada para evitar danos à nave.\n")
-                return  # Interrompe a viagem, não prossegue
-
-         
-           # Regra 1: Viagens para Vênus (Chuvas de meteoros ocorrem fora messes em janeiro, março, junho)
-            if destination == "Saturno" and month not in ["janeiro", "março", "junho"]:
-                
-                proceed = messagebox.askyesno("Aviso", "Viagens para Vênus fora de janeiro, março ou junho podem sofrer chuvas de meteoros.\nDeseja continuar com a viagem?")
-                travel_info_text.insert(tk.END, "Ops parece que você escolheu viajar da mesmo com chuva de meteoros, você perder 150 de combustivel.\n")
-                fuel_available -= 150 
-                if not proceed:
-                    travel_info_text.insert(tk.END, "Viagem cancelada devido às condições meteorológicas em Saturno.\n")
-                    return  
-
-            # Regra 2: Evitar viagens para Marte em dezembro, fevereiro, agosto
-            if destination == "Marte" and month in ["dezembro", "fevereiro", "agosto"]:
-                messagebox.showwarning("Aviso", "Viagens para Marte em dezembro, fevereiro ou agosto podem enfrentar tempestades de areia, podendo reduzir drasticamente a visibilidade e afetar operações de pouso.")
-                travel_info_text.insert(tk.END, "Ops parece que você escolheu viajar da mesmo com a tempestade você vai perder 200 de combustivel, pois a tempestade foi intensa.\n")
-                fuel_available -= 200  
-                if not proceed:
-                   
-                    travel_info_text.insert(tk.END, "Viagem cancelada devido às condições meteorológicas em Marte.\n")
-                    return  
-                                
-            # Regra 3: Alinhamento planetário entre Terra e Júpiter (menor consumo de combustível em maio, junho, outubro)
-            if origin == "Terra" and destination == "Júpiter" and month in ["maio", "junho", "outubro"]:
-                travel_info_text.insert(tk.END, "Viagem facilitada pelo alinhamento planetário! Menor consumo de combustível.\n")
-                fuel_available += 200 
-            
-             # Regra 4: Viagens a Netuno nos messes de janeiro a abril, não podem ocorrer)
-            if destination == "Netuno" and month in ["janeiro", "abril"]:
-                messagebox.showwarning("Aviso", "Viagens para Neturno em jeneiro e Abril podem enfrentar fortes ventos, são os ventos mais rapidos do sistema solar! Por tanto não pode ocorrer.")
-                travel_info_text.insert(tk.END, "Viagem cancelada devido às condições meteorológicas em Neturno.\n")
-                return 
-
-            # Regra 5: Verificar se há parada em Júpiter ou Saturno para aplicar "slingshot"
-            if stopover == "Júpiter" or stopover == "Saturno":
-                travel_info_text.insert(tk.END, "Usar a gravidade de Júpiter ou Saturno para um 'slingshot', diminuindo o consumo de combustível.\n")
-                fuel_available += 300              
-
-           
-            if stopover and stopover != "Nenhuma" and stopover in G:
-                
-                path1 = nx.shortest_path(G, source=origin, target=stopover, weight='weight')
-                path2 = nx.shortest_path(G, source=stopover, target=destination, weight='weight')
-                full_path = path1[:-1] + path2 
-            else:
-              
-                full_path = nx.shortest_path(G, source=origin, target=destination, weight='weight')
+        resultado = planejar_viagem(motor, origin, destination, stopover, fuel_available, month,
+                                    confirmar=messagebox.askyesno, avisar=messagebox.showwarning,
+                                    componentes=componentes)
 
-            full_path_edges = list(zip(full_path, full_path[1:]))
+        travel_info_text.insert(tk.END, "".join(resultado["linhas"]))  # Um único insert por viagem
+        registro.arquivo = ARQUIVO_REGISTRO if registrar_viagens.get() else None
+        registro.registrar(resultado)
 
-            total_distance = 0  
+        if resultado["erro"]:
+            messagebox.showerror("Erro", resultado["erro"])
 
-            
-            travel_info_text.insert(tk.END, f"Viagem de {origin} para {destination}:\n")
-            travel_info_text.insert(tk.END, f"Combustível inicial: {fuel_available} unidades\n")
-            
-            estacoes_espaciais = {"Estacao_Esp1", "Estacao_Esp2", "Estacao_Esp3"}
-            estacoes_visitadas = set() 
-
-            for edge in full_path_edges:
-                # Verificar se o caminho passa por uma estação espacial e se ela já não foi visitada
-                if (edge[0] in estacoes_espaciais and edge[0] not in estacoes_visitadas) or \
-                (edge[1] in estacoes_espaciais and edge[1] not in estacoes_visitadas):
-                    estacao_espacial = edge[0] if edge[0] in estacoes_espaciais else edge[1]
-                    fuel_available += 1000  # Recarregar combustível ao passar pela estação espacial
-                    estacoes_visitadas.add(estacao_espacial)  # Marcar a estação espacial como visitada
-                    travel_info_text.insert(tk.END, f"Reabastecimento em estação espacial: {estacao_espacial}. Novo combustível: {fuel_available}\n")
-
-                # Calcular a distância para a próxima etapa
-                distance = distances.get(edge, distances.get((edge[1], edge[0]), 0))
-                total_distance += distance
-                fuel_available -= distance  # Reduzir o combustível disponível com base na distância percorrida
-
-                # Mostrar a etapa atual no campo de texto
-                travel_info_text.insert(tk.END, f"De {edge[0]} para {edge[1]}: {distance} km. Combustível restante: {fuel_available} unidades\n")
-
-                # Verificar se o combustível é suficiente para a próxima etapa
-                if fuel_available < 0:
-                    messagebox.showerror("Erro", f"Não é possível completar a viagem. Combustível insuficiente após {edge[0]} ou {edge[1]}.")
-                    travel_info_text.insert(tk.END, "Viagem interrompida por falta de combustível.\n")
-                    return
-
-            pos = calculate_positions()  # Posições recalculadas
-            nx.draw_networkx_edges(G, pos, edgelist=full_path_edges, edge_color='red', width=3, ax=fig.axes[0])
-
-            # Exibir a distância total percorrida e combustível final
-            travel_info_text.insert(tk.END, f"Viagem concluída!\nDistância total: {total_distance} km\nCombustível restante: {fuel_available} unidades\n")
-            travel_info_text.insert(tk.END, f"-------------------------------------------------")
-
-            # Atualizar o canvas com o caminho destacado
-            canvas.draw()
-
-        except nx.NetworkXNoPath:
-            messagebox.showerror("Erro", f"Não há caminho entre {origin} e {destination}")
+        if resultado["status"] == "concluida":
+            destaques.append(desenhar_rota(fig.axes[0], posicoes, resultado["caminho"]))  # Reaproveita as posições do último desenho
+
+        # Atualizar o canvas com o caminho destacado (ou sem o destaque da consulta anterior)
+        canvas.draw()
     else:
         messagebox.showerror("Erro", "Por favor, selecione uma origem, destino válidos e insira um mês válido.")
+
+# Função para resumir os eventos das últimas viagens guardados em memória
+def show_trip_history():
+    tipos, regras = registro.resumo()
+    texto = f"Últimas viagens: {registro.viagens} nesta sessão, {len(registro.eventos)} evento(s) em memória\n"
+    texto += "".join(f"- {tipo}: {quantidade}\n" for tipo, quantidade in tipos.most_common())
+    if regras:
+        texto += "Regras acionadas:\n" + "".join(f"- {regra}: {quantidade}\n" for regra, quantidade in regras.most_common())
+    travel_info_text.delete(1.0, tk.END)
+    travel_info_text.insert(tk.END, texto)
+
+# Função para planejar de uma vez uma frota lida de CSV, respeitando a capacidade das estações
+def show_fleet_plan():
+    file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+    if not file_path:
+        return
+    month = month_var.get()
+    if month not in meses_do_ano:
+        messagebox.showerror("Erro", "Por favor, selecione um mês válido.")
+        return
+
+    try:
+        naves = ler_frota_csv(file_path)
+        tabela, ocupacao = planejar_frota(G_csr, naves, month)
+
+        frota_window = tk.Toplevel(window)
+        frota_window.title("Planejamento da Frota")
+
+        text_widget = tk.Text(frota_window, height=20, width=90)
+        text_widget.pack(padx=10, pady=10)
+        texto = f"{len(naves)} nave(s) em {month}, {tabela.attrs['iteracoes']} iteração(ões) de negociação\n\n"
+        texto += tabela["status"].value_counts().to_string() + "\n\n"
+        if len(ocupacao):
+            texto += "Recargas por estação:\n" + ocupacao.to_string(index=False) + "\n\n"
+        texto += tabela.to_string(index=False)
+        text_widget.insert(tk.END, texto)
+        text_widget.config(state=tk.DISABLED)
+
+    except Exception as e:
+        messagebox.showerror("Erro", f"Erro ao planejar a frota: {str(e)}")
+
+# Função para gravar os eventos pendentes antes de fechar a janela
+def on_closing():
+    registro.descarregar()
+    window.destroy()
+
+# Função para mostrar tudo o que a origem alcança com o combustível e o mês escolhidos
+def show_reachability():
+    origin = origin_var.get()
+    month = month_var.get()
+
+    travel_info_text.delete(1.0, tk.END)
+
+    try:
+        fuel_available = float(fuel_var.get())
+    except ValueError:
+        messagebox.showerror("Erro", "Por favor, insira uma quantidade válida de combustível.")
+        return
+
+    if not origin or origin not in G_csr or month not in meses_do_ano:
+        messagebox.showerror("Erro", "Por favor, selecione uma origem válida e insira um mês válido.")
+        return
+
+    tabela = calcular_alcance(G_csr, origin, fuel_available, month)
+    limpar_destaques()
+    aneis = destacar_nos(fig.axes[0], posicoes, [origin] + tabela["destino"].tolist())
+    if aneis is not None:
+        destaques.append(aneis)
+    canvas.draw()
+
+    travel_info_text.insert(tk.END, f"Alcance a partir de {origin} com {fuel_available} unidades em {month}:\n")
+    if tabela.empty:
+        travel_info_text.insert(tk.END, "Nenhum destino alcançável.\n")
+    else:
+        travel_info_text.insert(tk.END, tabela.to_string(index=False) + "\n")
+
+# Cores das rotas da fronteira de Pareto, da mais curta para a mais longa
+cores_pareto = ['red', '#ffd60a', '#2ec4b6', '#ff70a6', '#9b5de5', '#f15bb5']
+
+# Função para mostrar as rotas que equilibram distância, margem de combustível e exposição a riscos
+def show_pareto_routes():
+    origin = origin_var.get()
+    destination = destination_var.get()
+    month = month_var.get()
+
+    travel_info_text.delete(1.0, tk.END)
+
+    try:
+        fuel_available = float(fuel_var.get())
+    except ValueError:
+        messagebox.showerror("Erro", "Por favor, insira uma quantidade válida de combustível.")
+        return
+
+    if not (origin and destination and origin in G_csr and destination in G_csr and month in meses_do_ano):
+        messagebox.showerror("Erro", "Por favor, selecione uma origem, destino válidos e insira um mês válido.")
+        return
+
+    rotas_fronteira = rotas_pareto(G_csr, origin, destination, fuel_available, month)
+    limpar_destaques()
+    if not rotas_fronteira:
+        travel_info_text.insert(tk.END, f"Nenhuma rota viável de {origin} para {destination} em {month}.\n")
+        canvas.draw()
+        return
+
+    travel_info_text.insert(tk.END, f"Rotas de {origin} para {destination} (distância x combustível x riscos):\n")
+    # Desenha da mais longa para a mais curta, para a mais curta ficar por cima
+    for i, rota in reversed(list(enumerate(rotas_fronteira))):
+        destaques.append(desenhar_rota(fig.axes[0], posicoes, rota["caminho"], cor=cores_pareto[i % len(cores_pareto)], largura=3 + 2 * (i == 0)))
+    for i, rota in enumerate(rotas_fronteira):
+        riscos = ", ".join(rota["riscos"]) or "nenhum"
+        travel_info_text.insert(tk.END, f"{i + 1}. {' -> '.join(rota['caminho'])}\n"
+                                        f"   Distância: {rota['distancia']} km | Menor combustível: {rota['combustivel_minimo']} | "
+                                        f"Riscos: {riscos}\n")
+    canvas.draw()
 #Botão para resetar as infor
 def reset_fields():
     fuel_var.set('')  # Limpar o campo de combustível
@@ -480,13 +661,13 @@ def show_complete_graph_info():
         info_text += "O grafo NÃO é direcionado.\n"
 
   
-    if nx.get_edge_attributes(G, 'weight'):
+    if G_csr.numero_arestas() > 0:
         info_text += "O grafo é valorado (contém pesos nas arestas).\n"
     else:
         info_text += "O grafo NÃO é valorado.\n"
 
     
-    self_loops = list(nx.selfloop_edges(G))
+    self_loops = G_csr.lacos()
     if self_loops:
         info_text += f"O grafo contém {len(self_loops)} laço(s): {self_loops}\n"
     else:
@@ -494,17 +675,18 @@ def show_complete_graph_info():
 
    
     info_text += "Graus dos vértices:\n"
-    for node in G.nodes:
-        info_text += f"- {node}: {G.degree(node)} conexões\n"
+    graus = G_csr.graus()
+    for node, grau in zip(G_csr.nomes, graus):
+        info_text += f"- {node}: {grau} conexões\n"
 
     tipo_grafo = []
 
 
-    if not nx.is_connected(G):
+    if not componentes.e_conexo():
         tipo_grafo.append("O grafo não é conexo, portanto, não é Euleriano nem semi-Euleriano.")
     else:
         
-        vertices_grau_impar = [v for v, grau in G.degree() if grau % 2 != 0]
+        vertices_grau_impar = [v for v, grau in zip(G_csr.nomes, graus) if grau % 2 != 0]
 
         if len(vertices_grau_impar) == 0:
             tipo_grafo.append("O grafo é Euleriano (contém um ciclo de Euler).")
@@ -513,25 +695,23 @@ def show_complete_graph_info():
         else:
             tipo_grafo.append("O grafo não é Euleriano nem semi-Euleriano.")
 
-    try:
-        ciclo_hamiltoniano = list(nx.find_cycle(G))
+    if G_csr.tem_ciclo():
         tipo_grafo.append("O grafo é Hamiltoniano (contém um ciclo de Hamilton).")
-    except nx.NetworkXNoCycle:
+    else:
         tipo_grafo.append("O grafo não é Hamiltoniano.")
   
-    if any(G.has_edge(v, v) for v in G.nodes()):
+    if self_loops:
         tipo_grafo.append("O grafo não é simples (contém laços).")
     else:
         tipo_grafo.append("O grafo é simples (não contém laços).")
  
-    if len(G.edges()) == 0:
+    if G_csr.numero_arestas() == 0:
         tipo_grafo.append("O grafo é nulo (não contém arestas).")
   
-    if len(G.nodes()) == 1:
+    if len(G_csr) == 1:
         tipo_grafo.append("O grafo é trivial (apenas um vértice).")
 
-    graus = [grau for _, grau in G.degree()]
-    if len(set(graus)) == 1:
+    if len(set(graus.tolist())) == 1:
         tipo_grafo.append("O grafo é regular (todos os vértices têm o mesmo grau).")
     else:
         tipo_grafo.append("O grafo não é regular (vértices com graus diferentes).")
@@ -558,12 +738,12 @@ def consultar_aresta():
         origem = origem_var.get()
         destino = destino_var.get()
 
-        if origem and destino and origem in G and destino in G:
+        if origem and destino and origem in G_csr and destino in G_csr:
             try:
                 # Verificar se existe uma aresta entre os dois vértices
-                if G.has_edge(origem, destino):
-                    distancia = G[origem][destino]['weight']  # Pegar o peso da aresta
-                    resultado_var.set(f"Distância entre {origem} e {destino}: {distancia} km.")
+                distancia = G_csr.peso(origem, destino)  # Pegar o peso da aresta
+                if distancia is not None:
+                    resultado_var.set(f"Distância entre {origem} e {destino}: {distancia:g} km.")
                 else:
                     resultado_var.set(f"Não existe uma aresta entre {origem} e {destino}.")
             except KeyError:
@@ -574,9 +754,9 @@ def consultar_aresta():
     def consultar_vertice():
         vertice = vertice_var.get()
         
-        if vertice and vertice in G:
-            conexoes = list(G.neighbors(vertice))  # Obter as conexões (vizinhos) do vértice
-            grau = G.degree(vertice)  # Obter o grau do vértice (número de conexões)
+        if vertice and vertice in G_csr:
+            conexoes = G_csr.vizinhos_de(vertice)  # Obter as conexões (vizinhos) do vértice
+            grau = G_csr.graus()[G_csr.indices[vertice]]  # Obter o grau do vértice (número de conexões)
             info_vertice_var.set(f"{vertice} tem {grau} conexão(ões): {', '.join(conexoes)}.")
         else:
             info_vertice_var.set("Selecione um vértice válido.")
@@ -616,6 +796,110 @@ def consultar_aresta():
     info_vertice_var = tk.StringVar(consulta_window)
     info_vertice_label = tk.Label(consulta_window, textvariable=info_vertice_var, wraplength=300, justify="left")
     info_vertice_label.grid(row=6, column=0, columnspan=2, padx=10, pady=10)
+# Janela de cenários: edições de "e se" sem mexer no G e a mesma viagem comparada em todos eles
+def show_scenarios():
+    def atualizar_lista(selecionado):
+        cenario_menu['menu'].delete(0, 'end')
+        for nome in cenarios:
+            cenario_menu['menu'].add_command(label=nome, command=tk._setit(cenario_var, nome, lambda _: mostrar_diferencas()))
+        cenario_var.set(selecionado)
+        mostrar_diferencas()
+
+    # Ao carregar outro CSV os cenários recomeçam; um nome que sumiu volta para a base
+    def cenario_atual():
+        if cenario_var.get() not in cenarios:
+            atualizar_lista(NOME_BASE)
+        return cenarios[cenario_var.get()]
+
+    def mostrar_diferencas():
+        diferencas = cenario_atual().diferencas()
+        diferencas_var.set(f"{diferencas['vertices_removidos']} vértice(s) removido(s), {diferencas['vertices_novos']} novo(s), "
+                           f"{diferencas['arestas_removidas']} aresta(s) removida(s), {diferencas['arestas_novas']} nova(s)")
+
+    def criar_cenario():
+        try:
+            cenarios.criar(nome_var.get().strip(), de=cenario_atual().nome)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        atualizar_lista(nome_var.get().strip())
+
+    def remover_cenario():
+        try:
+            cenarios.remover(cenario_atual().nome)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        atualizar_lista(NOME_BASE)
+
+    def editar_vertice(adicionar):
+        cenario = cenario_atual()
+        vertice = vertice_var.get()
+        if cenario.nome == NOME_BASE:
+            messagebox.showerror("Erro", "Crie um cenário para editar; a base é a rede principal.")
+            return
+        try:
+            if adicionar:
+                conexoes = [(conexao, distancia) for conexao, distancia in catalogo.vizinhos_de(vertice) if conexao in cenario]
+                if not conexoes:
+                    raise ValueError(f"{vertice} não tem conexões válidas com vértices do cenário")
+                cenario.adicionar_no(vertice, conexoes)
+            else:
+                cenario.remover_no(vertice)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        mostrar_diferencas()
+
+    def comparar_rota():
+        try:
+            fuel_available = float(fuel_var.get())
+        except ValueError:
+            messagebox.showerror("Erro", "Por favor, insira uma quantidade válida de combustível.")
+            return
+        tabela = cenarios.comparar(origin_var.get(), destination_var.get(), stopover_var.get(), fuel_available, month_var.get())
+        text_widget.config(state=tk.NORMAL)
+        text_widget.delete(1.0, tk.END)
+        text_widget.insert(tk.END, f"{origin_var.get()} -> {destination_var.get()} em {month_var.get()}\n\n" + tabela.to_string(index=False))
+        text_widget.config(state=tk.DISABLED)
+
+    cenarios_window = tk.Toplevel(window)
+    cenarios_window.title("Cenários")
+
+    cenario_var = tk.StringVar(cenarios_window)
+    tk.Label(cenarios_window, text="Cenário:").grid(row=0, column=0, padx=5, pady=5, sticky='e')
+    cenario_menu = ttk.OptionMenu(cenarios_window, cenario_var, NOME_BASE, *cenarios, command=lambda _: mostrar_diferencas())
+    cenario_menu.grid(row=0, column=1, padx=5, pady=5, sticky='w')
+
+    nome_var = tk.StringVar(cenarios_window)
+    tk.Label(cenarios_window, text="Novo cenário:").grid(row=1, column=0, padx=5, pady=5, sticky='e')
+    tk.Entry(cenarios_window, textvariable=nome_var).grid(row=1, column=1, padx=5, pady=5, sticky='w')
+    tk.Button(cenarios_window, text="Criar a partir do atual", command=criar_cenario).grid(row=1, column=2, padx=5, pady=5, sticky='ew')
+    tk.Button(cenarios_window, text="Remover cenário", command=remover_cenario).grid(row=0, column=2, padx=5, pady=5, sticky='ew')
+
+    # Os vértices carregados (e os novos dos cenários) mais os corpos ligados a eles, os únicos que podem
+    # entrar; como no menu de planetas ausentes, no máximo LIMITE_MENU_CORPOS desses corpos aparecem
+    vertice_var = tk.StringVar(cenarios_window)
+    presentes = list(dict.fromkeys(list(G.nodes()) + [nome for ramo in cenarios for nome in cenarios[ramo].novos]))
+    ausentes = catalogo.vizinhanca(presentes)
+    tk.Label(cenarios_window, text="Vértice:").grid(row=2, column=0, padx=5, pady=5, sticky='e')
+    vertice_menu = ttk.OptionMenu(cenarios_window, vertice_var, "", *presentes, *ausentes[:LIMITE_MENU_CORPOS])
+    vertice_menu.grid(row=2, column=1, padx=5, pady=5, sticky='w')
+    if len(ausentes) > LIMITE_MENU_CORPOS:
+        vertice_menu['menu'].add_command(
+            label=f"... mais {len(ausentes) - LIMITE_MENU_CORPOS} corpos (adicione-os pelo CSV)", state=tk.DISABLED)
+    tk.Button(cenarios_window, text="Adicionar", command=lambda: editar_vertice(True)).grid(row=2, column=2, padx=5, pady=5, sticky='ew')
+    tk.Button(cenarios_window, text="Excluir", command=lambda: editar_vertice(False)).grid(row=2, column=3, padx=5, pady=5, sticky='ew')
+
+    diferencas_var = tk.StringVar(cenarios_window)
+    tk.Label(cenarios_window, textvariable=diferencas_var, wraplength=400, justify="left").grid(row=3, column=0, columnspan=4, padx=10, pady=5)
+
+    # A viagem comparada é a escolhida na janela principal (origem, destino, parada, combustível e mês)
+    tk.Button(cenarios_window, text="Comparar rota nos cenários", command=comparar_rota).grid(row=4, column=0, columnspan=4, padx=10, pady=5)
+    text_widget = tk.Text(cenarios_window, height=12, width=100, state=tk.DISABLED)
+    text_widget.grid(row=5, column=0, columnspan=4, padx=10, pady=10)
+    mostrar_diferencas()
+
 # Mostrar a matriz de adjacencia
 def show_adjacency_matrix():
     try:
@@ -645,119 +929,235 @@ def show_adjacency_matrix():
         messagebox.showerror("Erro", f"Erro ao exibir matriz de adjacência: {str(e)}")
 
 
-# Interface Tkinter
-window = tk.Tk()
-window.title("Planejamento de Rotas Interplanetárias")
+# Mostrar onde novas estações espaciais trariam mais viagens viáveis
+def show_station_analysis():
+    try:
+        fuel_available = float(fuel_var.get())
+    except ValueError:
+        messagebox.showerror("Erro", "Por favor, insira uma quantidade válida de combustível.")
+        return
+
+    candidatos = candidatos_padrao(G_csr, catalogo)
+    if len(G_csr) == 0 or not candidatos:
+        messagebox.showerror("Erro", "Não há estações candidatas com conexões aos planetas do grafo.")
+        return
+
+    try:
+        resultado = analisar_estacoes(G_csr, candidatos, fuel_available, quantidade=len(candidatos))
+
+        analise_window = tk.Toplevel(window)
+        analise_window.title("Análise de Estações Espaciais")
+
+        text_widget = tk.Text(analise_window, height=15, width=60)
+        text_widget.pack(padx=10, pady=10)
+        text_widget.insert(tk.END, f"Combustível inicial: {fuel_available} unidades\n")
+        text_widget.insert(tk.END, "Estações na ordem sugerida de instalação:\n\n")
+        text_widget.insert(tk.END, resultado.to_string(index=False))
+        text_widget.config(state=tk.DISABLED)
+
+    except Exception as e:
+        messagebox.showerror("Erro", f"Erro ao analisar estações: {str(e)}")
+
+
+# Relatório de criticidade: intermediação e impacto de excluir cada vértice
+def show_criticality_report():
+    if len(G_csr) < 2:
+        messagebox.showerror("Erro", "O grafo precisa ter ao menos dois vértices.")
+        return
+    tabelas = rotas_dinamicas()
+    if tabelas is None:
+        messagebox.showerror("Erro", f"A criticidade usa as rotas de todos os pares, que não são montadas com a hierarquia "
+                                     f"de contração nem em redes com mais de {LIMITE_TABELAS_ROTAS} vértices.")
+        return
+
+    try:
+        resultado = analisar_criticidade(tabelas, combustivel_informado())
+
+        criticidade_window = tk.Toplevel(window)
+        criticidade_window.title("Criticidade dos Vértices")
+
+        text_widget = tk.Text(criticidade_window, height=20, width=100)
+        text_widget.pack(padx=10, pady=10)
+        text_widget.insert(tk.END, "Vértices do mais crítico ao menos crítico (impacto de excluir cada um):\n\n")
+        text_widget.insert(tk.END, resultado.to_string(index=False))
+        text_widget.config(state=tk.DISABLED)
+
+    except Exception as e:
+        messagebox.showerror("Erro", f"Erro ao analisar criticidade: {str(e)}")
+
+
+# Iniciar o serviço HTTP/JSON local que responde rotas para outras ferramentas
+def iniciar_servico():
+    global servico
+    if servico is None:
+        try:
+            servico = iniciar_em_thread(G_csr)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao iniciar o serviço de rotas: {str(e)}")
+            return
+    messagebox.showinfo("Serviço de Rotas", f"Serviço de rotas disponível em http://{HOST}:{servico.porta}")
+
+
+# Interface Tkinter (protegida para que processos trabalhadores possam importar este módulo)
+if __name__ == "__main__":
+    catalogo = abrir_catalogo()
+    indice_csv = IndiceCSV(catalogo.corpos, catalogo)
+
+    window = tk.Tk()
+    window.title("Planejamento de Rotas Interplanetárias")
+
+    window.grid_columnconfigure(0, weight=1)
+    window.grid_columnconfigure(1, weight=1)
+    window.grid_columnconfigure(2, weight=1)
+    window.grid_columnconfigure(3, weight=1)
+    window.grid_columnconfigure(4, weight=1)
+
+    fuel_var = tk.StringVar(window)
+    origin_var = tk.StringVar(window)
+    destination_var = tk.StringVar(window)
+    stopover_var = tk.StringVar(window)
+    month_var = tk.StringVar(window)
+    missing_planet_var = tk.StringVar(window)
+    delete_planet_var = tk.StringVar(window)
+    usar_hierarquia = tk.BooleanVar(window, value=False)
+    registrar_viagens = tk.BooleanVar(window, value=False)
+    observar_arquivo = tk.BooleanVar(window, value=False)
+
+    month_var.set(meses_do_ano[0])
+
+    frame_top_controls = tk.Frame(window)
+    frame_top_controls.grid(row=0, column=0, columnspan=10, padx=10, pady=5, sticky='ew')
+
+    btn_upload = tk.Button(frame_top_controls, text="Carregar CSV", command=upload_csv)
+    btn_upload.grid(row=0, column=0, padx=5, pady=5, sticky='ew')
+
+    fuel_label = tk.Label(frame_top_controls, text="Combustível disponível:")
+    fuel_label.grid(row=0, column=1, padx=5, pady=5, sticky='w')
+
+    fuel_entry = tk.Entry(frame_top_controls, textvariable=fuel_var)
+    fuel_entry.grid(row=0, column=2, padx=5, pady=5, sticky='w')
+
+    origin_label = tk.Label(frame_top_controls, text="Origem:")
+    origin_label.grid(row=0, column=3, padx=5, pady=5, sticky='w')
+
+    origin_menu = ttk.OptionMenu(frame_top_controls, origin_var, "", *valid_planets)
+    origin_menu.grid(row=0, column=4, padx=5, pady=5, sticky='w')
+
+    destination_label = tk.Label(frame_top_controls, text="Destino:")
+    destination_label.grid(row=0, column=5, padx=5, pady=5, sticky='w')
+
+    destination_menu = ttk.OptionMenu(frame_top_controls, destination_var, "", *valid_planets)
+    destination_menu.grid(row=0, column=6, padx=5, pady=5, sticky='w')
+
+    stopover_label = tk.Label(frame_top_controls, text="Parada (Opcional):")
+    stopover_label.grid(row=0, column=7, padx=5, pady=5, sticky='w')
 
-window.grid_columnconfigure(0, weight=1)
-window.grid_columnconfigure(1, weight=1)
-window.grid_columnconfigure(2, weight=1)
-window.grid_columnconfigure(3, weight=1)
-window.grid_columnconfigure(4, weight=1)
+    stopover_menu = ttk.OptionMenu(frame_top_controls, stopover_var, "", "", *valid_planets)
+    stopover_menu.grid(row=0, column=8, padx=5, pady=5, sticky='w')
 
-fuel_var = tk.StringVar(window)
-origin_var = tk.StringVar(window)
-destination_var = tk.StringVar(window)
-stopover_var = tk.StringVar(window)
-month_var = tk.StringVar(window)
-missing_planet_var = tk.StringVar(window)
-delete_planet_var = tk.StringVar(window)
+    # Botão para calcular caminho
+    btn_shortest_path = tk.Button(frame_top_controls, text="Caminho Mais Curto", command=show_shortest_path)
+    btn_shortest_path.grid(row=0, column=9, padx=5, pady=5, sticky='ew')
 
-month_var.set(meses_do_ano[0])
+    btn_reachability = tk.Button(frame_top_controls, text="Alcance", command=show_reachability)
+    btn_reachability.grid(row=0, column=10, padx=5, pady=5, sticky='ew')
 
-frame_top_controls = tk.Frame(window)
-frame_top_controls.grid(row=0, column=0, columnspan=10, padx=10, pady=5, sticky='ew')
+    btn_pareto = tk.Button(frame_top_controls, text="Rotas Pareto", command=show_pareto_routes)
+    btn_pareto.grid(row=0, column=11, padx=5, pady=5, sticky='ew')
 
-btn_upload = tk.Button(frame_top_controls, text="Carregar CSV", command=upload_csv)
-btn_upload.grid(row=0, column=0, padx=5, pady=5, sticky='ew')
+    btn_reload = tk.Button(frame_top_controls, text="Recarregar CSV", command=recarregar_csv)
+    btn_reload.grid(row=0, column=12, padx=5, pady=5, sticky='ew')
 
-fuel_label = tk.Label(frame_top_controls, text="Combustível disponível:")
-fuel_label.grid(row=0, column=1, padx=5, pady=5, sticky='w')
 
-fuel_entry = tk.Entry(frame_top_controls, textvariable=fuel_var)
-fuel_entry.grid(row=0, column=2, padx=5, pady=5, sticky='w')
+    # Frame para gerenciamento de planetas (linha do meio)
+    frame_planet_controls = tk.Frame(window)
+    frame_planet_controls.grid(row=1, column=0, columnspan=10, padx=10, pady=5, sticky='ew')
 
-origin_label = tk.Label(frame_top_controls, text="Origem:")
-origin_label.grid(row=0, column=3, padx=5, pady=5, sticky='w')
+    missing_planet_label = tk.Label(frame_planet_controls, text="Adicionar Planeta:")
+    missing_planet_label.grid(row=1, column=0, padx=5, pady=5, sticky='e')
 
-origin_menu = ttk.OptionMenu(frame_top_controls, origin_var, "", *valid_planets)
-origin_menu.grid(row=0, column=4, padx=5, pady=5, sticky='w')
+    missing_planet_menu = ttk.OptionMenu(frame_planet_controls, missing_planet_var, "")
+    missing_planet_menu.grid(row=1, column=1, padx=5, pady=5, sticky='w')
 
-destination_label = tk.Label(frame_top_controls, text="Destino:")
-destination_label.grid(row=0, column=5, padx=5, pady=5, sticky='w')
+    btn_add_planet = tk.Button(frame_planet_controls, text="Adicionar", command=add_planet)
+    btn_add_planet.grid(row=1, column=2, padx=5, pady=5, sticky='ew')
 
-destination_menu = ttk.OptionMenu(frame_top_controls, destination_var, "", *valid_planets)
-destination_menu.grid(row=0, column=6, padx=5, pady=5, sticky='w')
+    delete_planet_label = tk.Label(frame_planet_controls, text="Excluir Planeta:")
+    delete_planet_label.grid(row=1, column=3, padx=5, pady=5, sticky='e')
 
-stopover_label = tk.Label(frame_top_controls, text="Parada (Opcional):")
-stopover_label.grid(row=0, column=7, padx=5, pady=5, sticky='w')
+    delete_planet_menu = ttk.OptionMenu(frame_planet_controls, delete_planet_var, "")
+    delete_planet_menu.grid(row=1, column=4, padx=5, pady=5, sticky='w')
 
-stopover_menu = ttk.OptionMenu(frame_top_controls, stopover_var, "", "", *valid_planets)
-stopover_menu.grid(row=0, column=8, padx=5, pady=5, sticky='w')
+    btn_delete_planet = tk.Button(frame_planet_controls, text="Excluir", command=delete_planet)
+    btn_delete_planet.grid(row=1, column=5, padx=5, pady=5, sticky='ew')
 
-# Botão para calcular caminho
-btn_shortest_path = tk.Button(frame_top_controls, text="Caminho Mais Curto", command=show_shortest_path)
-btn_shortest_path.grid(row=0, column=9, padx=5, pady=5, sticky='ew')
+    month_label = tk.Label(frame_planet_controls, text="Mês da viagem:")
+    month_label.grid(row=1, column=6, padx=5, pady=5, sticky='e')
 
+    month_menu = ttk.OptionMenu(frame_planet_controls, month_var, *meses_do_ano)
+    month_menu.grid(row=1, column=7, padx=5, pady=5, sticky='w')
 
-# Frame para gerenciamento de planetas (linha do meio)
-frame_planet_controls = tk.Frame(window)
-frame_planet_controls.grid(row=1, column=0, columnspan=10, padx=10, pady=5, sticky='ew')
+    # Pré-processamento opcional ao carregar o CSV, para redes grandes
+    check_hierarquia = tk.Checkbutton(frame_planet_controls, text="Pré-processar rotas", variable=usar_hierarquia)
+    check_hierarquia.grid(row=1, column=8, padx=5, pady=5, sticky='w')
 
-missing_planet_label = tk.Label(frame_planet_controls, text="Adicionar Planeta:")
-missing_planet_label.grid(row=1, column=0, padx=5, pady=5, sticky='e')
+    # Gravação opcional dos eventos das viagens em viagens.jsonl
+    check_registro = tk.Checkbutton(frame_planet_controls, text="Registrar viagens", variable=registrar_viagens)
+    check_registro.grid(row=1, column=9, padx=5, pady=5, sticky='w')
 
-missing_planet_menu = ttk.OptionMenu(frame_planet_controls, missing_planet_var, "")
-missing_planet_menu.grid(row=1, column=1, padx=5, pady=5, sticky='w')
+    # Recarga automática do último CSV quando o arquivo muda (só as linhas alteradas)
+    check_observar = tk.Checkbutton(frame_planet_controls, text="Observar CSV", variable=observar_arquivo, command=observar_csv)
+    check_observar.grid(row=1, column=10, padx=5, pady=5, sticky='w')
 
-btn_add_planet = tk.Button(frame_planet_controls, text="Adicionar", command=add_planet)
-btn_add_planet.grid(row=1, column=2, padx=5, pady=5, sticky='ew')
+    # Frame para ações diversas (linha inferior)
+    frame_actions = tk.Frame(window)
+    frame_actions.grid(row=2, column=0, columnspan=10, padx=10, pady=5, sticky='ew')
 
-delete_planet_label = tk.Label(frame_planet_controls, text="Excluir Planeta:")
-delete_planet_label.grid(row=1, column=3, padx=5, pady=5, sticky='e')
+    btn_reset = tk.Button(frame_actions, text="Resetar", command=reset_fields)
+    btn_reset.grid(row=2, column=1, padx=5, pady=5, sticky='ew')
 
-delete_planet_menu = ttk.OptionMenu(frame_planet_controls, delete_planet_var, "")
-delete_planet_menu.grid(row=1, column=4, padx=5, pady=5, sticky='w')
+    btn_show_graph_info = tk.Button(frame_actions, text="Info do Grafo", command=show_complete_graph_info)
+    btn_show_graph_info.grid(row=2, column=2, padx=5, pady=5, sticky='ew')
 
-btn_delete_planet = tk.Button(frame_planet_controls, text="Excluir", command=delete_planet)
-btn_delete_planet.grid(row=1, column=5, padx=5, pady=5, sticky='ew')
+    btn_consultar_aresta = tk.Button(frame_actions, text="Dados do Grafo", command=consultar_aresta)
+    btn_consultar_aresta.grid(row=2, column=3, padx=5, pady=5, sticky='ew')
 
-month_label = tk.Label(frame_planet_controls, text="Mês da viagem:")
-month_label.grid(row=1, column=6, padx=5, pady=5, sticky='e')
+    btn_station_analysis = tk.Button(frame_actions, text="Analisar Estações", command=show_station_analysis)
+    btn_station_analysis.grid(row=2, column=4, padx=5, pady=5, sticky='ew')
 
-month_menu = ttk.OptionMenu(frame_planet_controls, month_var, *meses_do_ano)
-month_menu.grid(row=1, column=7, padx=5, pady=5, sticky='w')
+    btn_route_service = tk.Button(frame_actions, text="Serviço de Rotas", command=iniciar_servico)
+    btn_route_service.grid(row=2, column=6, padx=5, pady=5, sticky='ew')
 
-# Frame para ações diversas (linha inferior)
-frame_actions = tk.Frame(window)
-frame_actions.grid(row=2, column=0, columnspan=10, padx=10, pady=5, sticky='ew')
+    btn_criticality = tk.Button(frame_actions, text="Criticidade", command=show_criticality_report)
+    btn_criticality.grid(row=2, column=7, padx=5, pady=5, sticky='ew')
 
-btn_reset = tk.Button(frame_actions, text="Resetar", command=reset_fields)
-btn_reset.grid(row=2, column=1, padx=5, pady=5, sticky='ew')
+    btn_trip_history = tk.Button(frame_actions, text="Histórico", command=show_trip_history)
+    btn_trip_history.grid(row=2, column=8, padx=5, pady=5, sticky='ew')
 
-btn_show_graph_info = tk.Button(frame_actions, text="Info do Grafo", command=show_complete_graph_info)
-btn_show_graph_info.grid(row=2, column=2, padx=5, pady=5, sticky='ew')
+    btn_fleet_plan = tk.Button(frame_actions, text="Frota", command=show_fleet_plan)
+    btn_fleet_plan.grid(row=2, column=9, padx=5, pady=5, sticky='ew')
 
-btn_consultar_aresta = tk.Button(frame_actions, text="Dados do Grafo", command=consultar_aresta)
-btn_consultar_aresta.grid(row=2, column=3, padx=5, pady=5, sticky='ew')
+    btn_scenarios = tk.Button(frame_actions, text="Cenários", command=show_scenarios)
+    btn_scenarios.grid(row=2, column=10, padx=5, pady=5, sticky='ew')
 
 
-btn_show_adj_matrix = tk.Button(frame_actions, text="Matriz_Adj", command=show_adjacency_matrix)
-btn_show_adj_matrix.grid(row=2, column=5, padx=5, pady=5, sticky='ew')
+    btn_show_adj_matrix = tk.Button(frame_actions, text="Matriz_Adj", command=show_adjacency_matrix)
+    btn_show_adj_matrix.grid(row=2, column=5, padx=5, pady=5, sticky='ew')
 
-# Campo de texto para exibir a viagem e o combustível
-travel_info_text = tk.Text(window, height=5, width=50)
-travel_info_text.grid(row=2, column=6, columnspan=10, padx=10, pady=5, sticky='w')
+    # Campo de texto para exibir a viagem e o combustível
+    travel_info_text = tk.Text(window, height=5, width=50)
+    travel_info_text.grid(row=2, column=6, columnspan=10, padx=10, pady=5, sticky='w')
 
 
-# Frame para a visualização do grafo (parte inferior)
-frame_graph = tk.Frame(window)
-frame_graph.grid(row=3, column=0, columnspan=10, padx=10, pady=5, sticky='nsew')
+    # Frame para a visualização do grafo (parte inferior)
+    frame_graph = tk.Frame(window)
+    frame_graph.grid(row=3, column=0, columnspan=10, padx=10, pady=5, sticky='nsew')
 
-fig = plt.Figure(figsize=(6, 6))
-canvas = FigureCanvasTkAgg(fig, master=frame_graph)
-canvas.get_tk_widget().config(bg='#0d1b2a')  # Fundo azul claro para o widget Tkinter
-canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    fig = plt.Figure(figsize=(6, 6))
+    canvas = FigureCanvasTkAgg(fig, master=frame_graph)
+    canvas.get_tk_widget().config(bg='#0d1b2a')  # Fundo azul claro para o widget Tkinter
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
 
-window.mainloop()
+    window.protocol("WM_DELETE_WINDOW", on_closing)
+    window.mainloop()
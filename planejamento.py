@@ -0,0 +1,187 @@
+import networkx as nx
+
+
+# Meses das regras de viagem (ver Funcionalidades.tx)
+MESES_SEM_METEOROS_SATURNO = ["janeiro", "março", "junho"]
+MESES_TEMPESTADE_MARTE = ["dezembro", "fevereiro", "agosto"]
+MESES_ALINHAMENTO_JUPITER = ["maio", "junho", "outubro"]
+MESES_VENTOS_NETUNO = ["janeiro", "abril"]
+CORPOS_ESTILINGUE = ["Júpiter", "Saturno"]
+BONUS_ESTILINGUE = 300
+RECARGA_ESTACAO = 1000
+
+# Função para saber se um vértice é uma estação espacial de reabastecimento
+def e_estacao(nome):
+    return nome.startswith("Estacao")
+
+
+# Mantém as distâncias inteiras com a mesma aparência do dicionário de distâncias
+def _como_numero(valor):
+    valor = float(valor)
+    return int(valor) if valor.is_integer() else valor
+
+
+def _confirmar_sempre(titulo, mensagem):
+    return True
+
+
+def _ignorar_aviso(titulo, mensagem):
+    pass
+
+
+# Ajuste de combustível das regras do mês para um destino (None quando a viagem é cancelada)
+def ajuste_do_mes(origin, destination, month):
+    if destination == "Vênus" and month == "dezembro":
+        return None
+    if destination == "Netuno" and month in MESES_VENTOS_NETUNO:
+        return None
+    ajuste = 0
+    if destination == "Saturno" and month not in MESES_SEM_METEOROS_SATURNO:
+        ajuste -= 150
+    if destination == "Marte" and month in MESES_TEMPESTADE_MARTE:
+        ajuste -= 200
+    if origin == "Terra" and destination == "Júpiter" and month in MESES_ALINHAMENTO_JUPITER:
+        ajuste += 200
+    return ajuste
+
+
+# Corpos com perigo no mês (tempestade solar, chuva de meteoros, tempestade de areia e ventos)
+def corpos_de_risco(month):
+    riscos = set()
+    if month == "dezembro":
+        riscos.add("Vênus")
+    if month not in MESES_SEM_METEOROS_SATURNO:
+        riscos.add("Saturno")
+    if month in MESES_TEMPESTADE_MARTE:
+        riscos.add("Marte")
+    if month in MESES_VENTOS_NETUNO:
+        riscos.add("Netuno")
+    return riscos
+
+
+# Função para simular uma viagem com as regras do mês, recargas e consumo de combustível
+def planejar_viagem(grafo, origin, destination, stopover, fuel_available, month, confirmar=None, avisar=None,
+                    componentes=None):
+    """
+    Aplica as regras da viagem e percorre a rota mais curta do grafo (GrafoCSR ou outro
+    objeto com rota() e peso()). confirmar(titulo, mensagem) decide se a viagem segue
+    quando há risco e avisar(titulo, mensagem) mostra alertas; sem interface, a viagem
+    sempre segue. Com um IndiceComponentes, viagens entre componentes diferentes terminam
+    sem busca. Devolve um dicionário com status, linhas de texto, eventos, caminho e
+    combustível. Cada evento é um dicionário com tipo (regra, cancelamento, inicio, recarga,
+    trecho, sem_combustivel, sem_caminho ou conclusao), texto e combustível depois dele.
+    """
+    confirmar = confirmar or _confirmar_sempre
+    avisar = avisar or _ignorar_aviso
+    resultado = {
+        "status": "concluida",
+        "linhas": [],
+        "eventos": [],
+        "caminho": [],
+        "distancia_total": 0,
+        "combustivel": fuel_available,
+        "erro": None,
+    }
+    linhas = resultado["linhas"]
+    eventos = resultado["eventos"]
+
+    # Registra um evento da viagem; o texto, quando há, também vai para as linhas exibidas
+    def emitir(tipo, texto="", **dados):
+        eventos.append({"tipo": tipo, "texto": texto, "combustivel": fuel_available, **dados})
+        if texto:
+            linhas.append(texto)
+
+    def encerrar(status, erro=None):
+        resultado["status"] = status
+        resultado["erro"] = erro
+        resultado["combustivel"] = fuel_available
+        return resultado
+
+    # Regra para cancelar a viagem se o destino for Vênus em dezembro
+    if destination == "Vênus" and month == "dezembro":
+        emitir("cancelamento", "Devido a uma tempestade solar prevista para Dezembro, a viagem para Vênus foi adiada para evitar danos à nave.\n",
+               regra="tempestade_solar_venus")
+        return encerrar("cancelada")
+
+    # Regra 1: Viagens para Vênus (Chuvas de meteoros ocorrem fora messes em janeiro, março, junho)
+    if destination == "Saturno" and month not in MESES_SEM_METEOROS_SATURNO:
+        proceed = confirmar("Aviso", "Viagens para Vênus fora de janeiro, março ou junho podem sofrer chuvas de meteoros.\nDeseja continuar com a viagem?")
+        fuel_available -= 150
+        emitir("regra", "Ops parece que você escolheu viajar da mesmo com chuva de meteoros, você perder 150 de combustivel.\n",
+               regra="meteoros_saturno", ajuste=-150)
+        if not proceed:
+            emitir("cancelamento", "Viagem cancelada devido às condições meteorológicas em Saturno.\n", regra="meteoros_saturno")
+            return encerrar("cancelada")
+
+    # Regra 2: Evitar viagens para Marte em dezembro, fevereiro, agosto
+    if destination == "Marte" and month in MESES_TEMPESTADE_MARTE:
+        avisar("Aviso", "Viagens para Marte em dezembro, fevereiro ou agosto podem enfrentar tempestades de areia, podendo reduzir drasticamente a visibilidade e afetar operações de pouso.")
+        fuel_available -= 200
+        emitir("regra", "Ops parece que você escolheu viajar da mesmo com a tempestade você vai perder 200 de combustivel, pois a tempestade foi intensa.\n",
+               regra="tempestade_marte", ajuste=-200)
+
+    # Regra 3: Alinhamento planetário entre Terra e Júpiter (menor consumo de combustível em maio, junho, outubro)
+    if origin == "Terra" and destination == "Júpiter" and month in MESES_ALINHAMENTO_JUPITER:
+        fuel_available += 200
+        emitir("regra", "Viagem facilitada pelo alinhamento planetário! Menor consumo de combustível.\n",
+               regra="alinhamento_jupiter", ajuste=200)
+
+    # Regra 4: Viagens a Netuno nos messes de janeiro a abril, não podem ocorrer)
+    if destination == "Netuno" and month in MESES_VENTOS_NETUNO:
+        avisar("Aviso", "Viagens para Neturno em jeneiro e Abril podem enfrentar fortes ventos, são os ventos mais rapidos do sistema solar! Por tanto não pode ocorrer.")
+        emitir("cancelamento", "Viagem cancelada devido às condições meteorológicas em Neturno.\n", regra="ventos_netuno")
+        return encerrar("cancelada")
+
+    # Regra 5: Verificar se há parada em Júpiter ou Saturno para aplicar "slingshot"
+    if stopover in CORPOS_ESTILINGUE:
+        fuel_available += BONUS_ESTILINGUE
+        emitir("regra", "Usar a gravidade de Júpiter ou Saturno para um 'slingshot', diminuindo o consumo de combustível.\n",
+               regra="estilingue", ajuste=BONUS_ESTILINGUE)
+
+    # Origem, destino e parada em componentes diferentes: não há caminho, sem precisar buscar
+    paradas = [stopover] if stopover in grafo else []
+    if componentes is not None and not componentes.conectados(origin, destination, *paradas):
+        emitir("sem_caminho")
+        return encerrar("sem_caminho", f"Não há caminho entre {origin} e {destination}")
+
+    try:
+        full_path = grafo.rota(origin, destination, stopover)
+    except nx.NetworkXNoPath:
+        emitir("sem_caminho")
+        return encerrar("sem_caminho", f"Não há caminho entre {origin} e {destination}")
+
+    resultado["caminho"] = full_path
+    full_path_edges = list(zip(full_path, full_path[1:]))
+    total_distance = 0
+
+    emitir("inicio", f"Viagem de {origin} para {destination}:\nCombustível inicial: {fuel_available} unidades\n",
+           origem=origin, destino=destination, parada=stopover, mes=month)
+
+    estacoes_visitadas = set()
+    for edge in full_path_edges:
+        # Verificar se o caminho passa por uma estação espacial e se ela já não foi visitada
+        if (e_estacao(edge[0]) and edge[0] not in estacoes_visitadas) or \
+        (e_estacao(edge[1]) and edge[1] not in estacoes_visitadas):
+            estacao_espacial = edge[0] if e_estacao(edge[0]) else edge[1]
+            fuel_available += RECARGA_ESTACAO  # Recarregar combustível ao passar pela estação espacial
+            estacoes_visitadas.add(estacao_espacial)
+            emitir("recarga", f"Reabastecimento em estação espacial: {estacao_espacial}. Novo combustível: {fuel_available}\n",
+                   estacao=estacao_espacial)
+
+        # Calcular a distância para a próxima etapa
+        distance = _como_numero(grafo.peso(edge[0], edge[1]))
+        total_distance += distance
+        fuel_available -= distance
+        resultado["distancia_total"] = total_distance
+
+        emitir("trecho", f"De {edge[0]} para {edge[1]}: {distance} km. Combustível restante: {fuel_available} unidades\n",
+               de=edge[0], para=edge[1], distancia=distance)
+
+        # Verificar se o combustível é suficiente para a próxima etapa
+        if fuel_available < 0:
+            emitir("sem_combustivel", "Viagem interrompida por falta de combustível.\n", de=edge[0], para=edge[1])
+            return encerrar("sem_combustivel", f"Não é possível completar a viagem. Combustível insuficiente após {edge[0]} ou {edge[1]}.")
+
+    emitir("conclusao", f"Viagem concluída!\nDistância total: {total_distance} km\nCombustível restante: {fuel_available} unidades\n"
+           f"-------------------------------------------------", distancia_total=total_distance)
+    return encerrar("concluida")
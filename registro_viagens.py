@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import time
+from collections import deque, Counter
+
+import pandas as pd
+
+
+# Quantos eventos das últimas viagens ficam em memória
+CAPACIDADE_REGISTRO = 5000
+# Quantos eventos se juntam antes de uma gravação no arquivo
+LOTE_GRAVACAO = 200
+ARQUIVO_REGISTRO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "viagens.jsonl")
+
+
+class RegistroViagens:
+    """
+    Guarda os eventos das viagens (os de planejar_viagem) num buffer circular: passada a
+    capacidade, os mais antigos saem sozinhos. Com um arquivo definido, os eventos também
+    são gravados em JSONL, uma linha por evento, mas só em lotes: ficam pendentes até
+    somarem LOTE_GRAVACAO ou até descarregar(), que deve ser chamado ao encerrar.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_REGISTRO, arquivo=None, lote=LOTE_GRAVACAO):
+        self.eventos = deque(maxlen=capacidade)
+        self.arquivo = arquivo
+        self.lote = lote
+        self.pendentes = []
+        self.viagens = 0
+        # Identifica a sessão no arquivo, onde as viagens de várias execuções se misturam
+        self.sessao = time.strftime("%Y%m%d-%H%M%S")
+
+    def registrar(self, resultado):
+        self.viagens += 1
+        momento = time.time()
+        for ordem, evento in enumerate(resultado["eventos"]):
+            registro = {"sessao": self.sessao, "viagem": self.viagens, "ordem": ordem, "momento": momento,
+                        "status": resultado["status"], **evento}
+            self.eventos.append(registro)
+            if self.arquivo:
+                self.pendentes.append(json.dumps(registro, ensure_ascii=False))
+        if len(self.pendentes) >= self.lote:
+            self.descarregar()
+
+    def descarregar(self):
+        if self.pendentes and self.arquivo:
+            with open(self.arquivo, "a", encoding="utf-8") as f:
+                f.write("\n".join(self.pendentes) + "\n")
+        self.pendentes.clear()
+
+    # Eventos em memória, do mais antigo ao mais recente, opcionalmente de um só tipo
+    def ultimos(self, quantidade=None, tipo=None):
+        eventos = [e for e in self.eventos if tipo is None or e["tipo"] == tipo]
+        return eventos if quantidade is None else eventos[-quantidade:]
+
+    # Contagem dos eventos em memória por tipo e, para as regras, por regra
+    def resumo(self):
+        tipos = Counter(e["tipo"] for e in self.eventos)
+        regras = Counter(e["regra"] for e in self.eventos if "regra" in e)
+        return tipos, regras
+
+
+# Função para ler um arquivo de registro inteiro numa tabela (para análise depois)
+def ler_registro(arquivo=ARQUIVO_REGISTRO):
+    return pd.read_json(arquivo, lines=True)
+
+
+# Uso: python registro_viagens.py [viagens.jsonl]
+if __name__ == "__main__":
+    arquivo = sys.argv[1] if len(sys.argv) > 1 else ARQUIVO_REGISTRO
+    tabela = ler_registro(arquivo)
+    viagens = tabela.drop_duplicates(["sessao", "viagem"])
+    print(f"{len(viagens)} viagem(ns), {len(tabela)} evento(s)")
+    print(viagens["status"].value_counts().to_string())
+    if "regra" in tabela:
+        print(tabela["regra"].dropna().value_counts().to_string())
+    trechos = tabela[tabela["tipo"] == "trecho"]
+    if len(trechos):
+        print(f"Distância média por trecho: {trechos['distancia'].mean():.1f} km")
@@ -0,0 +1,347 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import networkx as nx
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgb
+
+from grafo_csr import GrafoCSR
+from catalogo import abrir_catalogo
+from layout import calculate_positions
+
+
+planet_colors = {
+    "Mercúrio": "#E1C699",
+    "Vênus": "#F9E79F",
+    "Terra": "#ADD8E6",
+    "Marte": "#FFB6C1",
+    "Júpiter": "#D2B48C",
+    "Saturno": "#FDEBD0",
+    "Urano": "#AFEEEE",
+    "Netuno": "#87CEEB",
+    "Estacao_Esp1": "#FFFFFF",
+    "Estacao_Esp2": "#FFFFFF",
+    "Estacao_Esp3": "#FFFFFF",
+}
+
+planetas = ["Mercúrio", "Vênus", "Terra", "Marte", "Júpiter", "Saturno", "Urano", "Netuno"]
+cor_fundo = '#0d1b2a'
+
+
+# Função para definir o tamanho dos nós (planetas maiores, estações menores)
+def tamanhos_nos(nodes):
+    return [2000 if node in planetas else 1000 for node in nodes]
+
+
+# Limites do modo de nível de detalhe: acima deles os rótulos só aparecem com zoom ou ao passar o mouse
+LIMIAR_ROTULOS_NOS = 60
+LIMIAR_ROTULOS_ARESTAS = 120
+# Acima desse número de elementos visíveis, a camada vira uma imagem de densidade (custo fixo)
+LIMIAR_RASTER = 2000
+RESOLUCAO_RASTER = 400
+AMOSTRAS_POR_ARESTA = 16
+# Distância máxima (em pixels) entre o mouse e um vértice para mostrar o rótulo
+RAIO_HOVER = 12
+FATOR_ZOOM = 1.25
+
+
+class DesenhoRede:
+    """
+    Desenha a rede com poucos artistas: uma coleção de linhas para as arestas e um scatter
+    para os vértices visíveis. Quando há elementos demais na área visível, a camada é
+    trocada por uma imagem de densidade de resolução fixa, de modo que o tempo de desenho
+    quase não cresce com a rede. Os rótulos só aparecem abaixo dos limites, com zoom (roda
+    do mouse) ou ao passar o mouse sobre um vértice.
+    """
+
+    def __init__(self, ax, G, pos):
+        self.ax = ax
+        self.nos = list(G.nodes())
+        indices = {node: i for i, node in enumerate(self.nos)}
+        self.xy = np.array([pos[node] for node in self.nos], dtype=float).reshape(-1, 2)
+        arestas = list(G.edges(data='weight'))
+        self.arestas = np.array([(indices[u], indices[v]) for u, v, _ in arestas], dtype=np.int64).reshape(-1, 2)
+        self.pesos = [peso for _, _, peso in arestas]
+        self.inicio = self.xy[self.arestas[:, 0]]
+        self.fim = self.xy[self.arestas[:, 1]]
+        self.meios = (self.inicio + self.fim) / 2
+        self.cores = np.array([planet_colors.get(node, "#FFFFFF") for node in self.nos], dtype=object)
+        self.tamanhos = np.array(tamanhos_nos(self.nos))
+        self.camadas = []
+        self.rotulos = []
+        self.rotulos_hover = []
+        self.conexoes = []
+        self._tela = None
+
+        ax.set_axis_off()
+        self._enquadrar()
+        self.atualizar()
+
+    # Limites iniciais com folga para os círculos grandes dos planetas não serem cortados
+    def _enquadrar(self):
+        if len(self.xy) == 0:
+            return
+        minimo, maximo = self.xy.min(axis=0), self.xy.max(axis=0)
+        folga = np.maximum((maximo - minimo) * 0.1, 0.5)
+        self.ax.set_xlim(minimo[0] - folga[0], maximo[0] + folga[0])
+        self.ax.set_ylim(minimo[1] - folga[1], maximo[1] + folga[1])
+
+    def atualizar(self):
+        self._tela = None
+        self.atualizar_camadas()
+        self.atualizar_rotulos()
+
+    def _visiveis(self, pontos):
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        return np.flatnonzero((pontos[:, 0] >= x0) & (pontos[:, 0] <= x1) & (pontos[:, 1] >= y0) & (pontos[:, 1] <= y1))
+
+    def _arestas_visiveis(self):
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        menor = np.minimum(self.inicio, self.fim)
+        maior = np.maximum(self.inicio, self.fim)
+        return np.flatnonzero((menor[:, 0] <= x1) & (maior[:, 0] >= x0) & (menor[:, 1] <= y1) & (maior[:, 1] >= y0))
+
+    # Imagem de densidade dos pontos na área visível, com a cor dada e transparência pela contagem
+    def _densidade(self, pontos, cor, zorder):
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        contagem, _, _ = np.histogram2d(pontos[:, 1], pontos[:, 0], bins=RESOLUCAO_RASTER, range=[[y0, y1], [x0, x1]])
+        intensidade = np.log1p(contagem)
+        if intensidade.max() > 0:
+            intensidade /= intensidade.max()
+        imagem = np.zeros(contagem.shape + (4,))
+        imagem[..., :3] = to_rgb(cor)
+        imagem[..., 3] = intensidade
+        return self.ax.imshow(imagem, extent=(x0, x1, y0, y1), origin='lower', interpolation='nearest',
+                              aspect='auto', zorder=zorder)
+
+    # Recria as camadas de arestas e vértices para a área visível
+    def atualizar_camadas(self):
+        for camada in self.camadas:
+            camada.remove()
+        self.camadas = []
+
+        arestas = self._arestas_visiveis()
+        if len(arestas) <= LIMIAR_RASTER:
+            segmentos = np.stack([self.inicio[arestas], self.fim[arestas]], axis=1)
+            self.camadas.append(self.ax.add_collection(LineCollection(segmentos, colors='gray', linewidths=1, zorder=1), autolim=False))
+        else:
+            t = np.linspace(0, 1, AMOSTRAS_POR_ARESTA)[None, :, None]
+            amostras = self.inicio[arestas][:, None, :] + t * (self.fim[arestas] - self.inicio[arestas])[:, None, :]
+            self.camadas.append(self._densidade(amostras.reshape(-1, 2), 'gray', zorder=1))
+
+        nos = self._visiveis(self.xy)
+        if len(nos) <= LIMIAR_RASTER:
+            self.camadas.append(self.ax.scatter(self.xy[nos, 0], self.xy[nos, 1], s=self.tamanhos[nos],
+                                                c=list(self.cores[nos]), zorder=2))
+        else:
+            self.camadas.append(self._densidade(self.xy[nos], 'white', zorder=2))
+        # As camadas não devem mudar os limites escolhidos pelo zoom
+        self.ax.set_autoscale_on(False)
+
+    # Recria os rótulos de acordo com o que está visível na área atual
+    def atualizar_rotulos(self):
+        for texto in self.rotulos:
+            texto.remove()
+        self.rotulos = []
+
+        nos_visiveis = self._visiveis(self.xy)
+        if len(nos_visiveis) <= LIMIAR_ROTULOS_NOS:
+            for i in nos_visiveis:
+                self.rotulos.append(self._rotulo_no(i))
+
+        arestas_visiveis = self._visiveis(self.meios)
+        if len(arestas_visiveis) <= LIMIAR_ROTULOS_ARESTAS:
+            for k in arestas_visiveis:
+                self.rotulos.append(self._rotulo_aresta(k))
+
+    def _rotulo_no(self, i):
+        x, y = self.xy[i]
+        return self.ax.text(x, y, self.nos[i], fontsize=10, color='black', ha='center', va='center', zorder=3)
+
+    def _rotulo_aresta(self, k):
+        x, y = self.meios[k]
+        return self.ax.text(x, y, f"{self.pesos[k]:g}", fontsize=10, color='gray', ha='center', va='center', zorder=1.5,
+                            bbox=dict(boxstyle='round', ec=(1.0, 1.0, 1.0), fc=(1.0, 1.0, 1.0)))
+
+    # Liga o zoom pela roda do mouse e os rótulos ao passar o mouse
+    def conectar(self, canvas):
+        self.canvas = canvas
+        self.conexoes = [
+            canvas.mpl_connect('scroll_event', self._ao_rolar),
+            canvas.mpl_connect('motion_notify_event', self._ao_mover),
+            canvas.mpl_connect('resize_event', self._invalidar_tela),
+            canvas.mpl_connect('draw_event', self._invalidar_tela),
+        ]
+
+    def desconectar(self):
+        for conexao in self.conexoes:
+            self.canvas.mpl_disconnect(conexao)
+        self.conexoes = []
+
+    def _ao_rolar(self, evento):
+        if evento.inaxes is not self.ax or evento.xdata is None:
+            return
+        fator = 1 / FATOR_ZOOM if evento.button == 'up' else FATOR_ZOOM
+        for obter, definir, centro in ((self.ax.get_xlim, self.ax.set_xlim, evento.xdata),
+                                       (self.ax.get_ylim, self.ax.set_ylim, evento.ydata)):
+            inicio, fim = obter()
+            definir(centro - (centro - inicio) * fator, centro + (fim - centro) * fator)
+        self.atualizar()
+        self.canvas.draw_idle()
+
+    # As posições em pixels dos vértices mudam quando a janela muda de tamanho ou a figura é redesenhada
+    def _invalidar_tela(self, evento):
+        self._tela = None
+
+    def _ao_mover(self, evento):
+        if evento.inaxes is not self.ax or len(self.nos) == 0:
+            return
+        if self._tela is None:
+            self._tela = self.ax.transData.transform(self.xy)
+        distancias = np.hypot(self._tela[:, 0] - evento.x, self._tela[:, 1] - evento.y)
+        i = int(np.argmin(distancias))
+        proximo = i if distancias[i] <= RAIO_HOVER else None
+        if proximo is None and not self.rotulos_hover:
+            return
+
+        for texto in self.rotulos_hover:
+            texto.remove()
+        self.rotulos_hover = []
+        if proximo is not None:
+            self.rotulos_hover.append(self._rotulo_no(proximo))
+            incidentes = np.flatnonzero((self.arestas[:, 0] == proximo) | (self.arestas[:, 1] == proximo))
+            for k in incidentes[:LIMIAR_ROTULOS_ARESTAS]:
+                self.rotulos_hover.append(self._rotulo_aresta(k))
+        self.canvas.draw_idle()
+
+
+# Função para destacar uma rota com uma única coleção de linhas
+def desenhar_rota(ax, pos, caminho, cor='red', largura=3):
+    segmentos = [(pos[u], pos[v]) for u, v in zip(caminho, caminho[1:])]
+    colecao = LineCollection(segmentos, colors=cor, linewidths=largura, zorder=2.5)
+    ax.add_collection(colecao)
+    return colecao
+
+
+# Função para destacar um conjunto de vértices (por exemplo, a região alcançável) com anéis
+def destacar_nos(ax, pos, nos, cor='#ffd60a', tamanho=220):
+    nos = [no for no in nos if no in pos]
+    if not nos:
+        return None
+    xy = np.array([pos[no] for no in nos])
+    return ax.scatter(xy[:, 0], xy[:, 1], s=tamanho, facecolors='none', edgecolors=cor, linewidths=2, zorder=2.6)
+
+
+# Função para desenhar a rede completa uma única vez, sem janela (backend Agg)
+def renderizar_base(G, pos, figsize=(6, 6), dpi=100):
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    fig.patch.set_facecolor(cor_fundo)
+    ax = fig.add_subplot(111, facecolor=cor_fundo)
+    DesenhoRede(ax, G, pos)
+
+    fig.canvas.draw()
+    return {
+        "imagem": np.asarray(fig.canvas.buffer_rgba()).copy(),
+        "limites": (ax.get_xlim(), ax.get_ylim()),
+        "posicao_eixos": ax.get_position().bounds,
+        "figsize": figsize,
+        "dpi": dpi,
+    }
+
+
+# Função para desenhar só a rota por cima da imagem base e salvar em PNG/SVG
+def renderizar_rota(base, pos, caminho, arquivo, titulo=None):
+    fig = Figure(figsize=base["figsize"], dpi=base["dpi"])
+    FigureCanvasAgg(fig)
+    fig.figimage(base["imagem"], origin='upper')
+
+    ax = fig.add_axes(base["posicao_eixos"], zorder=1)
+    ax.set_xlim(base["limites"][0])
+    ax.set_ylim(base["limites"][1])
+    ax.set_axis_off()
+    ax.patch.set_visible(False)
+
+    desenhar_rota(ax, pos, caminho)
+    if titulo:
+        ax.set_title(titulo, color='white')
+
+    fig.savefig(arquivo, dpi=base["dpi"])
+    return arquivo
+
+
+# Estado de cada processo trabalhador: imagem base, posições e grafo compacto
+_contexto = {}
+
+
+def _inicializar_trabalhador(base, pos, nomes, offsets, vizinhos, pesos):
+    _contexto["base"] = base
+    _contexto["pos"] = pos
+    _contexto["grafo"] = GrafoCSR(nomes, offsets, vizinhos, pesos)
+
+
+def _renderizar_viagem(tarefa):
+    origem, destino, parada, arquivo = tarefa
+    try:
+        caminho = _contexto["grafo"].rota(origem, destino, parada)
+    except (nx.NetworkXNoPath, nx.NodeNotFound):
+        return arquivo, f"Não há caminho entre {origem} e {destino}"
+    renderizar_rota(_contexto["base"], _contexto["pos"], caminho, arquivo, titulo=f"{origem} → {destino}")
+    return arquivo, None
+
+
+def _normalizar_viagem(viagem):
+    origem, destino = viagem[0], viagem[1]
+    parada = viagem[2] if len(viagem) > 2 else None
+    return origem, destino, parada
+
+
+# Função para gerar os mapas de várias viagens em paralelo
+def renderizar_rotas(G, viagens, pasta, formato='png', processos=None):
+    """
+    Desenha a rede uma vez e, para cada viagem (origem, destino[, parada]), apenas a
+    sobreposição da rota. Devolve uma lista de (arquivo, erro) na ordem das viagens.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    pos = {node: np.asarray(p, dtype=float) for node, p in calculate_positions(G).items()}
+    base = renderizar_base(G, pos)
+    grafo = GrafoCSR.from_networkx(G)
+
+    tarefas = []
+    for i, viagem in enumerate(viagens):
+        origem, destino, parada = _normalizar_viagem(viagem)
+        arquivo = os.path.join(pasta, f"{i:04d}_{origem}_{destino}.{formato}")
+        tarefas.append((origem, destino, parada, arquivo))
+
+    processos = processos or os.cpu_count() or 1
+    chunksize = max(1, len(tarefas) // (4 * processos))
+    initargs = (base, pos, grafo.nomes, grafo.offsets, grafo.vizinhos, grafo.pesos)
+    with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_trabalhador, initargs=initargs) as pool:
+        return list(pool.map(_renderizar_viagem, tarefas, chunksize=chunksize))
+
+
+# Uso: python renderizacao.py rede.csv viagens.csv pasta_saida [png|svg]
+# O CSV de viagens usa ';' e as colunas Origem, Destino e (opcional) Parada.
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Uso: python renderizacao.py rede.csv viagens.csv pasta_saida [png|svg]")
+        sys.exit(1)
+
+    catalogo = abrir_catalogo()
+    grafo, erros = GrafoCSR.from_csv(sys.argv[1], catalogo.corpos, catalogo)
+    for erro in erros:
+        print(f"Erro: {erro}")
+
+    df = pd.read_csv(sys.argv[2], delimiter=';')
+    if 'Parada' not in df.columns:
+        df['Parada'] = None
+    viagens = list(zip(df['Origem'], df['Destino'], df['Parada'].where(df['Parada'].notna(), None)))
+
+    formato = sys.argv[4] if len(sys.argv) > 4 else 'png'
+    for arquivo, erro in renderizar_rotas(grafo.para_networkx(), viagens, sys.argv[3], formato):
+        print(f"{arquivo}: {erro}" if erro else arquivo)
@@ -0,0 +1,251 @@
+import time
+import heapq
+
+import numpy as np
+import networkx as nx
+
+from grafo_csr import GrafoCSR
+
+
+# Vértices da subárvore (a partir das raízes) numa árvore dada pela linha de predecessores
+def subarvore(pred, raizes):
+    ordem = np.argsort(pred, kind='stable')
+    ordenados = pred[ordem]
+    marcados = list(raizes)
+    vistos = set(marcados)
+    i = 0
+    while i < len(marcados):
+        u = marcados[i]
+        inicio = np.searchsorted(ordenados, u, side='left')
+        fim = np.searchsorted(ordenados, u, side='right')
+        for v in ordem[inicio:fim].tolist():
+            if v not in vistos:
+                vistos.add(v)
+                marcados.append(v)
+        i += 1
+    return vistos
+
+
+# Recalcular, numa linha de distâncias e predecessores, só os vértices afetados
+def reparar_linha(adj, dist, pred, afetados):
+    for v in afetados:
+        dist[v] = np.inf
+        pred[v] = -1
+    heap = []
+    for v in afetados:
+        melhor, anterior = np.inf, -1
+        for u, w in adj[v].items():
+            if u not in afetados and dist[u] + w < melhor:
+                melhor, anterior = dist[u] + w, u
+        if anterior != -1:
+            dist[v] = melhor
+            pred[v] = anterior
+            heap.append((melhor, v))
+    heapq.heapify(heap)
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in adj[u].items():
+            if v in afetados and d + w < dist[v]:
+                dist[v] = d + w
+                pred[v] = u
+                heapq.heappush(heap, (d + w, v))
+
+
+class RotasDinamicas:
+    """
+    Distâncias e árvores de caminhos mínimos de todos os pares, mantidas entre edições.
+    D[s, v] é a distância de s a v e P[s, v] o predecessor de v na árvore com raiz s.
+    Inserções relaxam os pares só através das arestas novas; remoções reparam apenas as
+    subárvores que passavam pelo vértice ou aresta removido. Cada edição devolve o custo.
+    """
+
+    def __init__(self, capacidade=16):
+        self.nomes = []
+        self.indices = {}
+        self.livres = []
+        self.adj = []
+        self.D = np.full((capacidade, capacidade), np.inf)
+        self.P = np.full((capacidade, capacidade), -1, dtype=np.int32)
+        self.ultimo_custo = None
+
+    @classmethod
+    def from_csr(cls, grafo):
+        rotas = cls(capacidade=max(16, len(grafo)))
+        n = len(grafo)
+        for nome in grafo.nomes:
+            rotas._novo_indice(nome)
+        for u in range(n):
+            for k in range(grafo.offsets[u], grafo.offsets[u + 1]):
+                rotas.adj[u][int(grafo.vizinhos[k])] = float(grafo.pesos[k])
+        for s in range(n):
+            dist, pred = grafo.dijkstra(s)
+            rotas.D[s, :n] = dist
+            rotas.P[s, :n] = pred
+        return rotas
+
+    @classmethod
+    def from_networkx(cls, G):
+        return cls.from_csr(GrafoCSR.from_networkx(G))
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __contains__(self, nome):
+        return nome in self.indices
+
+    def _novo_indice(self, nome):
+        if self.livres:
+            x = self.livres.pop()
+            self.nomes[x] = nome
+            self.adj[x] = {}
+        else:
+            x = len(self.nomes)
+            if x >= self.D.shape[0]:
+                self._crescer(2 * self.D.shape[0])
+            self.nomes.append(nome)
+            self.adj.append({})
+        self.indices[nome] = x
+        self.D[x, :] = np.inf
+        self.D[:, x] = np.inf
+        self.D[x, x] = 0.0
+        self.P[x, :] = -1
+        self.P[:, x] = -1
+        return x
+
+    def _crescer(self, capacidade):
+        n = self.D.shape[0]
+        D = np.full((capacidade, capacidade), np.inf)
+        P = np.full((capacidade, capacidade), -1, dtype=np.int32)
+        D[:n, :n] = self.D
+        P[:n, :n] = self.P
+        self.D, self.P = D, P
+
+    def _registrar(self, operacao, inicio, pares=0, fontes=0, vertices=0):
+        self.ultimo_custo = {
+            "operacao": operacao,
+            "pares_atualizados": int(pares),
+            "fontes_reparadas": int(fontes),
+            "vertices_reparados": int(vertices),
+            "segundos": time.perf_counter() - inicio,
+        }
+        return self.ultimo_custo
+
+    # Relaxa todos os pares pelo caminho u -> v com o novo peso w (nos dois sentidos)
+    def _relaxar_aresta(self, u, v, w):
+        n = len(self.nomes)
+        D, P = self.D[:n, :n], self.P[:n, :n]
+        total = 0
+        for a, b in ((u, v), (v, u)):
+            novo = D[:, a][:, None] + w + D[b, :][None, :]
+            melhora = novo < D
+            if not melhora.any():
+                continue
+            # O predecessor de t no caminho s -> a -> b -> t é o da árvore de b (ou a, se t == b)
+            pred_b = P[b, :].copy()
+            pred_b[b] = a
+            D[melhora] = novo[melhora]
+            linhas, colunas = np.nonzero(melhora)
+            P[linhas, colunas] = pred_b[colunas]
+            total += int(melhora.sum())
+        return total
+
+    # Inserir um vértice (como em add_planet) relaxando só através das arestas novas
+    def adicionar_no(self, nome, conexoes):
+        inicio = time.perf_counter()
+        x = self._novo_indice(nome)
+        pares = 0
+        for vizinho, peso in conexoes:
+            y = self.indices[vizinho]
+            peso = float(peso)
+            self.adj[x][y] = peso
+            self.adj[y][x] = peso
+            pares += self._relaxar_aresta(x, y, peso)
+        return self._registrar("adicionar_no", inicio, pares=pares)
+
+    def adicionar_aresta(self, u, v, peso):
+        inicio = time.perf_counter()
+        x, y = self.indices[u], self.indices[v]
+        peso = float(peso)
+        if y in self.adj[x] and self.adj[x][y] < peso:
+            self.remover_aresta(u, v)
+        self.adj[x][y] = peso
+        self.adj[y][x] = peso
+        return self._registrar("adicionar_aresta", inicio, pares=self._relaxar_aresta(x, y, peso))
+
+    def _subarvore(self, s, raizes):
+        return subarvore(self.P[s, :len(self.nomes)], raizes)
+
+    # Reparar a árvore da fonte s: só os vértices da subárvore afetada são recalculados
+    def _reparar(self, s, afetados):
+        reparar_linha(self.adj, self.D[s], self.P[s], afetados)
+        afetados = list(afetados)
+        self.D[afetados, s] = self.D[s, afetados]
+
+    # Remover um vértice (como em delete_planet) reparando só as árvores que passavam por ele
+    def remover_no(self, nome):
+        inicio = time.perf_counter()
+        x = self.indices.pop(nome)
+        n = len(self.nomes)
+        for y in self.adj[x]:
+            del self.adj[y][x]
+        self.adj[x] = {}
+
+        fontes = [s for s in np.flatnonzero(np.any(self.P[:n, :n] == x, axis=1)).tolist() if s != x]
+        vertices = 0
+        for s in fontes:
+            afetados = self._subarvore(s, [x])
+            afetados.discard(x)
+            vertices += len(afetados)
+            self._reparar(s, afetados)
+
+        self.nomes[x] = None
+        self.livres.append(x)
+        self.D[x, :] = np.inf
+        self.D[:, x] = np.inf
+        self.P[x, :] = -1
+        self.P[:, x] = -1
+        return self._registrar("remover_no", inicio, fontes=len(fontes), vertices=vertices)
+
+    def remover_aresta(self, u, v):
+        inicio = time.perf_counter()
+        x, y = self.indices[u], self.indices[v]
+        del self.adj[x][y]
+        del self.adj[y][x]
+        n = len(self.nomes)
+        vertices = 0
+        fontes = 0
+        for pai, filho in ((x, y), (y, x)):
+            for s in np.flatnonzero(self.P[:n, filho] == pai).tolist():
+                afetados = self._subarvore(s, [filho])
+                vertices += len(afetados)
+                fontes += 1
+                self._reparar(s, afetados)
+        return self._registrar("remover_aresta", inicio, fontes=fontes, vertices=vertices)
+
+    def distancia(self, origem, destino):
+        return float(self.D[self.indices[origem], self.indices[destino]])
+
+    def peso(self, u, v):
+        return self.adj[self.indices[u]].get(self.indices[v])
+
+    def shortest_path(self, source, target):
+        for nome in (source, target):
+            if nome not in self.indices:
+                raise nx.NodeNotFound(f"Source {nome} is not in G")
+        s, t = self.indices[source], self.indices[target]
+        if self.D[s, t] == np.inf:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        caminho = [t]
+        while caminho[-1] != s:
+            caminho.append(int(self.P[s, caminho[-1]]))
+        return [self.nomes[i] for i in reversed(caminho)]
+
+    # Rota completa com parada opcional, como em show_shortest_path
+    def rota(self, origem, destino, parada=None):
+        if parada and parada != "Nenhuma" and parada in self.indices:
+            path1 = self.shortest_path(origem, parada)
+            path2 = self.shortest_path(parada, destino)
+            return path1[:-1] + path2
+        return self.shortest_path(origem, destino)
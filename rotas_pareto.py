@@ -0,0 +1,154 @@
+import sys
+import heapq
+
+import pandas as pd
+
+from dados import meses_do_ano
+from grafo_csr import GrafoCSR
+from catalogo import abrir_catalogo
+from planejamento import e_estacao, ajuste_do_mes, corpos_de_risco, _como_numero, RECARGA_ESTACAO
+
+
+# Rótulo de uma rota parcial; os campos que entram na dominância vêm primeiro
+class Rotulo:
+    __slots__ = ("distancia", "combustivel_minimo", "combustivel", "exposicao", "usadas", "vertice", "pai", "vivo")
+
+    def __init__(self, distancia, combustivel_minimo, combustivel, exposicao, usadas, vertice, pai):
+        self.distancia = distancia
+        self.combustivel_minimo = combustivel_minimo
+        self.combustivel = combustivel
+        self.exposicao = exposicao
+        self.usadas = usadas
+        self.vertice = vertice
+        self.pai = pai
+        self.vivo = True
+
+    # Domina quando não é pior em nada: nem no que já aconteceu, nem no que ainda pode acontecer
+    def domina(self, outro):
+        return (self.distancia <= outro.distancia and self.combustivel_minimo >= outro.combustivel_minimo
+                and self.exposicao <= outro.exposicao and self.combustivel >= outro.combustivel
+                and self.usadas <= outro.usadas)
+
+    def __lt__(self, outro):
+        return (self.distancia, self.exposicao, -self.combustivel_minimo) < (outro.distancia, outro.exposicao, -outro.combustivel_minimo)
+
+
+# Uma rota parcial não pode mais entrar na fronteira se alguma rota completa já é melhor que o seu melhor caso
+def _sem_futuro(fronteira, rotulo, restante):
+    for final in fronteira:
+        if (final.distancia <= rotulo.distancia + restante and final.combustivel_minimo >= rotulo.combustivel_minimo
+                and final.exposicao <= rotulo.exposicao):
+            return True
+    return False
+
+
+# Função para buscar a fronteira de Pareto entre distância, margem de combustível e exposição a riscos
+def rotas_pareto(grafo, origem, destino, combustivel, month):
+    """
+    Cada rota é medida pela distância total, pelo menor combustível restante ao longo do
+    caminho (com as recargas e o ajuste do mês, como em planejar_viagem) e pela exposição,
+    o número de passagens por corpos com perigo no mês. Rotas que ficam sem combustível são
+    descartadas. Um rótulo só é descartado se outro no mesmo vértice não for pior em nenhum
+    critério, tiver ao menos o mesmo combustível atual e não tiver gasto mais estações; a
+    distância restante até o destino corta rótulos que não podem mais melhorar a fronteira.
+    As rotas não são sempre simples: uma rota pode voltar por um vértice quando o desvio
+    passa por uma estação ainda não usada (ir reabastecer num ramo e voltar); qualquer outro
+    ciclo é dominado pela mesma rota sem ele. Devolve as rotas da fronteira em ordem de distância.
+    """
+    for nome in (origem, destino):
+        if nome not in grafo:
+            raise ValueError(f"{nome} não está no grafo")
+    ajuste = ajuste_do_mes(origem, destino, month)
+    if ajuste is None:
+        return []
+
+    off, viz, pes = grafo._off, grafo._viz, grafo._pes
+    estacao = [e_estacao(nome) for nome in grafo.nomes]
+    risco = [nome in corpos_de_risco(month) for nome in grafo.nomes]
+    # Distância mínima de cada vértice ao destino: limite inferior para o corte
+    restante, _ = grafo.dijkstra(grafo.indices[destino])
+
+    o, t = grafo.indices[origem], grafo.indices[destino]
+    inicial = combustivel + ajuste
+    primeiro = Rotulo(0.0, inicial, inicial, 0, frozenset(), o, None)
+    por_vertice = {o: [primeiro]}
+    heap = [primeiro]
+    fronteira = []
+    while heap:
+        rotulo = heapq.heappop(heap)
+        if not rotulo.vivo:
+            continue
+        u = rotulo.vertice
+        if u == t:
+            if not any(f.distancia <= rotulo.distancia and f.combustivel_minimo >= rotulo.combustivel_minimo
+                       and f.exposicao <= rotulo.exposicao for f in fronteira):
+                fronteira.append(rotulo)
+            # Seguir adiante só pioraria a distância, a margem e a exposição desta rota
+            continue
+        if _sem_futuro(fronteira, rotulo, restante[u]):
+            continue
+        for k in range(off[u], off[u + 1]):
+            v = viz[k]
+            if restante[v] == float('inf'):
+                continue
+            combustivel_atual, usadas = rotulo.combustivel, rotulo.usadas
+            if (estacao[u] and u not in usadas) or (estacao[v] and v not in usadas):
+                combustivel_atual += RECARGA_ESTACAO
+                usadas = usadas | {u if estacao[u] else v}
+            combustivel_atual -= pes[k]
+            if combustivel_atual < 0:
+                continue
+            novo = Rotulo(rotulo.distancia + pes[k], min(rotulo.combustivel_minimo, combustivel_atual),
+                          combustivel_atual, rotulo.exposicao + risco[v], usadas, v, rotulo)
+            if _sem_futuro(fronteira, novo, restante[v]):
+                continue
+
+            existentes = por_vertice.setdefault(v, [])
+            if any(r.domina(novo) for r in existentes):
+                continue
+            for r in existentes:
+                if novo.domina(r):
+                    r.vivo = False
+            existentes[:] = [r for r in existentes if r.vivo]
+            existentes.append(novo)
+            heapq.heappush(heap, novo)
+
+    rotas = []
+    for final in fronteira:
+        caminho = []
+        r = final
+        while r is not None:
+            caminho.append(grafo.nomes[r.vertice])
+            r = r.pai
+        caminho.reverse()
+        rotas.append({
+            "caminho": caminho,
+            "distancia": _como_numero(final.distancia),
+            "combustivel_minimo": _como_numero(final.combustivel_minimo),
+            "combustivel_final": _como_numero(final.combustivel),
+            "exposicao": final.exposicao,
+            "riscos": [nome for nome in caminho[1:] if nome in corpos_de_risco(month)],
+        })
+    return rotas
+
+
+# Versão em tabela para uso sem interface
+def tabela_pareto(grafo, origem, destino, combustivel, month):
+    rotas = rotas_pareto(grafo, origem, destino, combustivel, month)
+    linhas = [dict(rota, caminho=" -> ".join(rota["caminho"]), riscos=", ".join(rota["riscos"])) for rota in rotas]
+    colunas = ["distancia", "combustivel_minimo", "combustivel_final", "exposicao", "riscos", "caminho"]
+    return pd.DataFrame(linhas, columns=colunas)
+
+
+# Uso: python rotas_pareto.py rede.csv origem destino combustivel [mês]
+if __name__ == "__main__":
+    if len(sys.argv) < 5:
+        print("Uso: python rotas_pareto.py rede.csv origem destino combustivel [mês]")
+        sys.exit(1)
+
+    catalogo = abrir_catalogo()
+    grafo, erros = GrafoCSR.from_csv(sys.argv[1], catalogo.corpos, catalogo)
+    for erro in erros:
+        print(f"Erro: {erro}")
+    mes = sys.argv[5] if len(sys.argv) > 5 else meses_do_ano[0]
+    print(tabela_pareto(grafo, sys.argv[2], sys.argv[3], float(sys.argv[4]), mes).to_string(index=False))
@@ -0,0 +1,430 @@
+import os
+import sys
+import json
+import math
+import time
+import pickle
+import shutil
+import tempfile
+import random
+import asyncio
+import threading
+import multiprocessing
+from urllib.parse import urlsplit, parse_qs, urlencode
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import networkx as nx
+
+from dados import meses_do_ano
+from grafo_csr import GrafoCSR
+from planejamento import planejar_viagem
+from alcance import calcular_alcance
+from componentes import IndiceComponentes
+from catalogo import abrir_catalogo
+
+
+# O serviço só escuta na própria máquina
+HOST = "127.0.0.1"
+PORTA_PADRAO = 8765
+MAX_ALTERNATIVAS = 20
+
+RAZOES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def _exigir_vertice(grafo, params, nome):
+    vertice = params.get(nome)
+    if not vertice:
+        raise ValueError(f"Parâmetro obrigatório ausente: {nome}")
+    if vertice not in grafo:
+        raise nx.NodeNotFound(f"{vertice} não está no grafo")
+    return vertice
+
+
+def _ler_numero(params, nome, padrao=None):
+    if nome not in params:
+        if padrao is None:
+            raise ValueError(f"Parâmetro obrigatório ausente: {nome}")
+        return padrao
+    try:
+        valor = float(params[nome])
+    except ValueError:
+        raise ValueError(f"Valor inválido para {nome}: {params[nome]}")
+    if math.isnan(valor):
+        raise ValueError(f"Valor inválido para {nome}: {params[nome]}")
+    return valor
+
+
+def _ler_mes(params):
+    mes = params.get("mes", meses_do_ano[0])
+    if mes not in meses_do_ano:
+        raise ValueError(f"Mês inválido: {mes}")
+    return mes
+
+
+# Rota completa com as mesmas regras de show_shortest_path
+def consultar_rota(grafo, params, componentes=None):
+    origem = _exigir_vertice(grafo, params, "origem")
+    destino = _exigir_vertice(grafo, params, "destino")
+    parada = params.get("parada", "Nenhuma")
+    return planejar_viagem(grafo, origem, destino, parada, _ler_numero(params, "combustivel"), _ler_mes(params),
+                           componentes=componentes)
+
+
+def consultar_alternativas(grafo, params, componentes=None):
+    origem = _exigir_vertice(grafo, params, "origem")
+    destino = _exigir_vertice(grafo, params, "destino")
+    k = _ler_numero(params, "k", 3)
+    if not (math.isfinite(k) and k >= 1):
+        raise ValueError(f"k deve ser um número de 1 em diante: {params['k']}")
+    k = int(min(k, MAX_ALTERNATIVAS))
+    if componentes is not None and not componentes.conectados(origem, destino):
+        return {"rotas": []}
+    try:
+        caminhos = grafo.caminhos_alternativos(origem, destino, k)
+    except nx.NetworkXNoPath:
+        caminhos = []
+    rotas = []
+    for caminho in caminhos:
+        distancia = sum(grafo.peso(u, v) for u, v in zip(caminho, caminho[1:]))
+        rotas.append({"caminho": caminho, "distancia": distancia})
+    return {"rotas": rotas}
+
+
+# Sem combustível, devolve as distâncias; com combustível, o alcance com recargas e regras do mês
+def consultar_alcance(grafo, params):
+    origem = _exigir_vertice(grafo, params, "origem")
+    if "combustivel" not in params:
+        dist = grafo.distancias_de(origem)
+        alcancaveis = {grafo.nomes[i]: float(dist[i]) for i in np.flatnonzero(dist < float('inf'))}
+        return {"origem": origem, "alcancaveis": alcancaveis}
+    mes = _ler_mes(params)
+    tabela = calcular_alcance(grafo, origem, _ler_numero(params, "combustivel"), mes)
+    return {"origem": origem, "mes": mes, "alcancaveis": tabela.to_dict(orient="records")}
+
+
+def info_grafo(grafo, componentes):
+    return {
+        "vertices": grafo.nomes,
+        "arestas": grafo.numero_arestas(),
+        "graus": dict(zip(grafo.nomes, grafo.graus().tolist())),
+        "conexo": bool(len(grafo) and componentes.e_conexo()),
+        "componentes": componentes.numero_componentes(),
+    }
+
+
+# JSON padrão não tem Infinity nem NaN: valores não finitos (combustível infinito, por exemplo) viram null
+def _json_padrao(valor):
+    if isinstance(valor, dict):
+        return {chave: _json_padrao(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_json_padrao(v) for v in valor]
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+
+# Consultas pesadas que rodam nos processos trabalhadores
+OPERACOES = {
+    "/rota": consultar_rota,
+    "/alternativas": consultar_alternativas,
+    "/alcance": consultar_alcance,
+}
+
+# Consultas que descartam pares sem caminho pelo índice de componentes do trabalhador
+COM_COMPONENTES = {"/rota", "/alternativas"}
+
+_grafo = None
+_componentes = None
+_versao = None
+
+
+# Cada trabalhador lê a rede do arquivo da versão pedida só na primeira consulta dessa versão
+def _carregar_versao(versao, arquivo):
+    global _grafo, _componentes, _versao
+    if versao != _versao:
+        with open(arquivo, 'rb') as f:
+            nomes, offsets, vizinhos, pesos = pickle.load(f)
+        _grafo = GrafoCSR(nomes, offsets, vizinhos, pesos)
+        _componentes = IndiceComponentes.from_csr(_grafo)
+        _versao = versao
+
+
+def _executar(versao, arquivo, caminho, params):
+    _carregar_versao(versao, arquivo)
+    if caminho in COM_COMPONENTES:
+        return OPERACOES[caminho](_grafo, params, componentes=_componentes)
+    return OPERACOES[caminho](_grafo, params)
+
+
+class ServicoRotas:
+    """
+    Serviço HTTP/JSON local sobre asyncio. Consultas idênticas em andamento são
+    agrupadas numa só execução, as buscas rodam num pool de processos e a rede pode
+    ser trocada a qualquer momento sem derrubar as conexões abertas. O pool é o mesmo
+    durante toda a vida do serviço: cada rede ganha uma versão gravada em arquivo, e
+    os trabalhadores a carregam quando recebem a primeira consulta dessa versão.
+    """
+
+    def __init__(self, grafo, porta=PORTA_PADRAO, processos=None):
+        self.porta = porta
+        self.processos = processos or os.cpu_count() or 1
+        self.grafo = None
+        self.componentes = None
+        self.catalogo = abrir_catalogo()  # Resolve as distâncias das redes enviadas em /rede
+        self.pool = ProcessPoolExecutor(max_workers=self.processos, mp_context=multiprocessing.get_context('spawn'))
+        self.pasta = tempfile.mkdtemp(prefix="servico_rotas_")
+        self.versao = 0
+        self.em_andamento = {}
+        self.estatisticas = {"requisicoes": 0, "agrupadas": 0, "executadas": 0}
+        self.servidor = None
+        self.loop = None
+        self.trocar_grafo(grafo)
+
+    def _arquivo_versao(self, versao):
+        return os.path.join(self.pasta, f"rede_{versao}.pkl")
+
+    # Troca a rede atendida; consultas já enviadas com a versão anterior terminam normalmente
+    def trocar_grafo(self, grafo):
+        versao = self.versao + 1
+        with open(self._arquivo_versao(versao), 'wb') as f:
+            pickle.dump((grafo.nomes, grafo.offsets, grafo.vizinhos, grafo.pesos), f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.grafo = grafo
+        self.componentes = IndiceComponentes.from_csr(grafo)
+        self.versao = versao
+        self._limpar_versoes()
+
+    # Apaga os arquivos de versões antigas que nenhuma consulta em andamento ainda usa
+    def _limpar_versoes(self):
+        em_uso = {chave[0] for chave in self.em_andamento} | {self.versao}
+        for nome in os.listdir(self.pasta):
+            versao = int(nome[len("rede_"):-len(".pkl")])
+            if versao not in em_uso:
+                os.remove(os.path.join(self.pasta, nome))
+
+    # Versão segura para chamar de outra thread (por exemplo, da interface Tkinter)
+    def trocar_grafo_seguro(self, grafo):
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.trocar_grafo, grafo)
+        else:
+            self.trocar_grafo(grafo)
+
+    async def consultar(self, caminho, params):
+        self.estatisticas["requisicoes"] += 1
+        if caminho == "/info":
+            return {"versao": self.versao, **info_grafo(self.grafo, self.componentes)}
+
+        chave = (self.versao, caminho, tuple(sorted(params.items())))
+        futuro = self.em_andamento.get(chave)
+        if futuro is None:
+            self.estatisticas["executadas"] += 1
+            futuro = asyncio.get_running_loop().run_in_executor(
+                self.pool, _executar, self.versao, self._arquivo_versao(self.versao), caminho, params)
+            self.em_andamento[chave] = futuro
+            futuro.add_done_callback(lambda _: self._concluir(chave))
+        else:
+            self.estatisticas["agrupadas"] += 1
+        # shield: se um cliente desistir, os outros que esperam a mesma consulta não são afetados
+        return await asyncio.shield(futuro)
+
+    def _concluir(self, chave):
+        self.em_andamento.pop(chave, None)
+        if chave[0] != self.versao:
+            self._limpar_versoes()
+
+    async def _responder(self, metodo, alvo, corpo):
+        url = urlsplit(alvo)
+        try:
+            if url.path == "/rede":
+                if metodo != "POST":
+                    return 405, {"erro": "Use POST para trocar a rede."}
+                pedido = json.loads(corpo or b"{}")
+                grafo, erros = await asyncio.to_thread(GrafoCSR.from_csv, pedido["csv"], self.catalogo.corpos, self.catalogo)
+                self.trocar_grafo(grafo)
+                return 200, {"versao": self.versao, "erros": erros}
+            if url.path == "/estatisticas":
+                return 200, {"versao": self.versao, "em_andamento": len(self.em_andamento), **self.estatisticas}
+            if url.path != "/info" and url.path not in OPERACOES:
+                return 404, {"erro": f"Caminho desconhecido: {url.path}"}
+            if metodo != "GET":
+                return 405, {"erro": "Use GET para consultas."}
+            params = {nome: valores[0] for nome, valores in parse_qs(url.query).items()}
+            return 200, await self.consultar(url.path, params)
+        except nx.NodeNotFound as e:
+            return 404, {"erro": str(e)}
+        except (ValueError, KeyError) as e:
+            return 400, {"erro": str(e)}
+        except Exception as e:
+            return 500, {"erro": str(e)}
+
+    async def _atender(self, reader, writer):
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                metodo, alvo, _ = linha.decode('latin-1').split(' ', 2)
+                cabecalhos = {}
+                while True:
+                    linha = await reader.readline()
+                    if linha in (b'\r\n', b'\n', b''):
+                        break
+                    nome, _, valor = linha.decode('latin-1').partition(':')
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                corpo = await reader.readexactly(int(cabecalhos.get('content-length') or 0))
+
+                status, resposta = await self._responder(metodo, alvo, corpo)
+                fechar = cabecalhos.get('connection', '').lower() == 'close'
+                dados = json.dumps(_json_padrao(resposta), ensure_ascii=False, allow_nan=False).encode('utf-8')
+                cabecalho = (
+                    f"HTTP/1.1 {status} {RAZOES[status]}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(dados)}\r\n"
+                )
+                if fechar:
+                    cabecalho += "Connection: close\r\n"
+                writer.write((cabecalho + "\r\n").encode('latin-1') + dados)
+                await writer.drain()
+                if fechar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def iniciar(self):
+        self.loop = asyncio.get_running_loop()
+        self.servidor = await asyncio.start_server(self._atender, HOST, self.porta)
+        return self.servidor
+
+    async def servir(self):
+        await self.iniciar()
+        async with self.servidor:
+            await self.servidor.serve_forever()
+
+    def encerrar(self):
+        if self.servidor is not None:
+            self.servidor.close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+
+# Função para rodar o serviço numa thread separada (usada pela interface); falhas ao abrir a porta
+# sobem para quem chamou em vez de ficarem presas na thread
+def iniciar_em_thread(grafo, porta=PORTA_PADRAO, processos=None, espera=10):
+    servico = ServicoRotas(grafo, porta, processos)
+    pronto = threading.Event()
+    falha = []
+
+    async def rodar():
+        try:
+            await servico.iniciar()
+        except Exception as e:
+            falha.append(e)
+            return
+        finally:
+            pronto.set()
+        async with servico.servidor:
+            await servico.servidor.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(rodar(),), daemon=True).start()
+    if not pronto.wait(timeout=espera):
+        servico.encerrar()
+        raise TimeoutError(f"O serviço de rotas não respondeu em {espera} s")
+    if falha:
+        servico.encerrar()
+        raise falha[0]
+    return servico
+
+
+# Gerador de carga: vários clientes com conexões persistentes medindo a latência de cada consulta
+async def _cliente(porta, alvos, latencias, erros):
+    reader, writer = await asyncio.open_connection(HOST, porta)
+    try:
+        for alvo in alvos:
+            inicio = time.perf_counter()
+            writer.write(f"GET {alvo} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode('latin-1'))
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            tamanho = 0
+            while True:
+                linha = await reader.readline()
+                if linha in (b'\r\n', b''):
+                    break
+                if linha.lower().startswith(b'content-length:'):
+                    tamanho = int(linha.split(b':')[1])
+            await reader.readexactly(tamanho)
+            latencias.append(time.perf_counter() - inicio)
+            if status != 200:
+                erros.append(status)
+    finally:
+        writer.close()
+
+
+async def gerar_carga(alvos, porta=PORTA_PADRAO, concorrencia=32):
+    latencias = []
+    erros = []
+    iterador = iter(alvos)
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente(porta, iterador, latencias, erros) for _ in range(concorrencia)))
+    duracao = time.perf_counter() - inicio
+    ms = np.array(latencias) * 1000
+    return {
+        "requisicoes": len(latencias),
+        "erros": len(erros),
+        "segundos": duracao,
+        "requisicoes_por_segundo": len(latencias) / duracao if duracao else 0.0,
+        "latencia_p50_ms": float(np.percentile(ms, 50)) if len(ms) else 0.0,
+        "latencia_p95_ms": float(np.percentile(ms, 95)) if len(ms) else 0.0,
+        "latencia_p99_ms": float(np.percentile(ms, 99)) if len(ms) else 0.0,
+    }
+
+
+# Monta consultas aleatórias de rota, alternativas e alcance sobre os vértices da rede
+def alvos_aleatorios(vertices, total, seed=0):
+    rng = random.Random(seed)
+    alvos = []
+    for _ in range(total):
+        origem, destino = rng.choice(vertices), rng.choice(vertices)
+        tipo = rng.random()
+        if tipo < 0.6:
+            params = {"origem": origem, "destino": destino, "combustivel": rng.choice([500, 1000, 3000]), "mes": rng.choice(meses_do_ano)}
+            alvos.append("/rota?" + urlencode(params))
+        elif tipo < 0.9:
+            alvos.append("/alternativas?" + urlencode({"origem": origem, "destino": destino, "k": 3}))
+        else:
+            alvos.append("/alcance?" + urlencode({"origem": origem, "combustivel": 1000}))
+    return alvos
+
+
+async def _carga_padrao(porta, total, concorrencia):
+    reader, writer = await asyncio.open_connection(HOST, porta)
+    writer.write(f"GET /info HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    resposta = await reader.read()
+    writer.close()
+    vertices = json.loads(resposta.split(b'\r\n\r\n', 1)[1])["vertices"]
+    return await gerar_carga(alvos_aleatorios(vertices, total), porta, concorrencia)
+
+
+# Uso:
+#   python servico_rotas.py servir rede.csv [porta]
+#   python servico_rotas.py carga [porta] [total] [concorrencia]
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "servir":
+        catalogo = abrir_catalogo()
+        grafo, erros = GrafoCSR.from_csv(sys.argv[2], catalogo.corpos, catalogo)
+        for erro in erros:
+            print(f"Erro: {erro}")
+        porta = int(sys.argv[3]) if len(sys.argv) > 3 else PORTA_PADRAO
+        print(f"Servindo rotas em http://{HOST}:{porta}")
+        asyncio.run(ServicoRotas(grafo, porta).servir())
+    elif len(sys.argv) >= 2 and sys.argv[1] == "carga":
+        porta = int(sys.argv[2]) if len(sys.argv) > 2 else PORTA_PADRAO
+        total = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+        concorrencia = int(sys.argv[4]) if len(sys.argv) > 4 else 32
+        for nome, valor in asyncio.run(_carga_padrao(porta, total, concorrencia)).items():
+            print(f"{nome}: {valor:.2f}" if isinstance(valor, float) else f"{nome}: {valor}")
+    else:
+        print("Uso: python servico_rotas.py servir rede.csv [porta] | carga [porta] [total] [concorrencia]")
+        sys.exit(1)